@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+AI Generator Module
+
+Generation queue for AI-made images (logos, banners, promo graphics) in the
+Casino Website Generator.
+
+- Prompts and sizes are normalised and hashed, so "Casino  banner" and
+  "casino banner" are one request
+- Results live in a persistent cache (.build-cache/ai-images/), shared by
+  every site, so repeats never reach the API
+- Identical requests in flight share one future
+- A bounded thread pool limits concurrent calls; backends are pluggable
+  (OpenAI, or a local mock for tests and offline runs)
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import base64
+import struct
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Optional, Any
+
+import requests
+
+from file_utils import write_atomic
+
+
+AI_CACHE_DIR = os.path.join(".build-cache", "ai-images")
+OPENAI_API_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "dall-e-3"
+DEFAULT_GENERATION_WORKERS = 2
+GENERATION_TIMEOUT = 120
+
+
+class OpenAIBackend:
+    """Image generation through the OpenAI Images API."""
+
+    def __init__(self, api_key: str, model: Optional[str] = None, api_url: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
+        self.api_key = api_key
+        self.model = model or os.environ.get("OPENAI_IMAGE_MODEL") or DEFAULT_MODEL
+        self.api_url = (api_url or os.environ.get("OPENAI_API_URL") or OPENAI_API_URL).rstrip('/')
+        self.session = session or requests.Session()
+        self.name = f"openai:{self.model}"
+
+    def generate(self, prompt: str, size: str) -> bytes:
+        """
+        Generate one image.
+
+        Args:
+            prompt (str): Normalised prompt
+            size (str): "<width>x<height>"
+
+        Returns:
+            bytes: PNG image data
+        """
+        payload = {"model": self.model, "prompt": prompt, "size": size, "n": 1}
+        if self.model.startswith("dall-e"):
+            payload["response_format"] = "b64_json"
+        response = self.session.post(f"{self.api_url}/images/generations", json=payload,
+                                     headers={"Authorization": f"Bearer {self.api_key}"},
+                                     timeout=GENERATION_TIMEOUT)
+        response.raise_for_status()
+        return base64.b64decode(response.json()["data"][0]["b64_json"])
+
+
+class MockBackend:
+    """Offline backend returning a solid-colour PNG derived from the prompt."""
+
+    name = "mock"
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, size: str) -> bytes:
+        """Generate a deterministic placeholder PNG."""
+        with self._lock:
+            self.calls += 1
+        width, height = _parse_size(size)
+        colour = hashlib.sha256(prompt.encode('utf-8')).digest()[:3]
+        return _solid_png(width, height, colour)
+
+
+class GenerationQueue:
+    """Deduplicating, cached, bounded-concurrency image generation queue."""
+
+    def __init__(self, backend: Any, cache_dir: Optional[str] = None,
+                 workers: int = DEFAULT_GENERATION_WORKERS):
+        if cache_dir is None:
+            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            cache_dir = os.path.join(current_dir, AI_CACHE_DIR)
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.stats = {'generated': 0, 'cache_hits': 0, 'deduplicated': 0}
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.RLock()
+        self._in_flight: Dict[str, Future] = {}
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        self._index = self._load_index()
+
+    def submit(self, prompt: str, size: str = "1024x1024") -> Future:
+        """
+        Queue a generation, reusing cached or in-flight results.
+
+        Args:
+            prompt (str): Image prompt
+            size (str): "<width>x<height>"
+
+        Returns:
+            Future: Resolves to the path of the cached PNG
+        """
+        prompt, size = normalise_prompt(prompt), normalise_size(size)
+        key = generation_key(prompt, size, self.backend.name)
+
+        with self._lock:
+            if key in self._in_flight:
+                self.stats['deduplicated'] += 1
+                return self._in_flight[key]
+
+            path = self._object_path(key)
+            if key in self._index and os.path.exists(path):
+                self.stats['cache_hits'] += 1
+                future = Future()
+                future.set_result(path)
+                return future
+
+            future = self._pool.submit(self._generate, key, prompt, size)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._finish(key))
+            return future
+
+    def generate(self, prompt: str, size: str = "1024x1024") -> str:
+        """Generate (or fetch from cache) one image and wait for it."""
+        return self.submit(prompt, size).result()
+
+    def close(self) -> None:
+        """Wait for queued jobs and save the index."""
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            self._save_index()
+
+    def _generate(self, key: str, prompt: str, size: str) -> str:
+        """Worker: call the backend and store the result."""
+        data = self.backend.generate(prompt, size)
+        path = self._object_path(key)
+        write_atomic(path, data)
+        with self._lock:
+            self.stats['generated'] += 1
+            self._index[key] = {
+                'prompt': prompt,
+                'size': size,
+                'backend': self.backend.name,
+                'sha256': hashlib.sha256(data).hexdigest(),
+                'created_at': time.time()
+            }
+            self._save_index()
+        return path
+
+    def _finish(self, key: str) -> None:
+        """Drop a completed job from the in-flight table."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def _object_path(self, key: str) -> str:
+        """Get the cached file path for a key."""
+        return os.path.join(self.cache_dir, "objects", f"{key}.png")
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the result index."""
+        index_file = os.path.join(self.cache_dir, "index.json")
+        if not os.path.exists(index_file):
+            return {}
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self) -> None:
+        """Save the result index atomically; caller holds the lock."""
+        write_atomic(os.path.join(self.cache_dir, "index.json"),
+                     json.dumps(self._index, indent=2, sort_keys=True).encode('utf-8'))
+
+
+def normalise_prompt(prompt: str) -> str:
+    """
+    Normalise a prompt so trivially different spellings share a cache entry.
+
+    Collapses whitespace, lowercases and drops trailing punctuation.
+
+    Args:
+        prompt (str): Image prompt
+
+    Returns:
+        str: Normalised prompt
+    """
+    return re.sub(r'\s+', ' ', prompt).strip().lower().rstrip('.!')
+
+
+def normalise_size(size: str) -> str:
+    """Normalise "1024 X 1024" style sizes to "1024x1024"."""
+    width, height = _parse_size(size)
+    return f"{width}x{height}"
+
+
+def generation_key(prompt: str, size: str, backend_name: str) -> str:
+    """Get the cache key for a normalised prompt, size and backend."""
+    return hashlib.sha256(f"{backend_name}\n{size}\n{prompt}".encode('utf-8')).hexdigest()
+
+
+def create_backend(name: Optional[str] = None) -> Optional[Any]:
+    """
+    Create the backend selected by name or the AI_IMAGE_BACKEND variable.
+
+    "openai" (the default) needs OPENAI_API_KEY; "mock" works offline.
+
+    Args:
+        name (str): Backend name
+
+    Returns:
+        Backend or None if it is not configured
+    """
+    name = (name or os.environ.get("AI_IMAGE_BACKEND") or "openai").lower()
+    if name == "mock":
+        return MockBackend()
+    if name == "openai":
+        api_key = os.environ.get("OPENAI_API_KEY")
+        return OpenAIBackend(api_key) if api_key else None
+    return None
+
+
+# Private helper functions
+
+def _parse_size(size: str) -> tuple:
+    """Parse "<width>x<height>" into integers."""
+    match = re.match(r'^\s*(\d+)\s*[xX×]\s*(\d+)\s*$', size)
+    if not match:
+        raise ValueError(f"Invalid image size: '{size}'")
+    return int(match.group(1)), int(match.group(2))
+
+
+def _solid_png(width: int, height: int, colour: bytes) -> bytes:
+    """Encode a solid-colour RGB PNG without third-party libraries."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + colour * width
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(row * height, 9)) + chunk(b"IEND", b""))
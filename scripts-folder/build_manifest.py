@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Build Manifest Module
+
+Incremental image builds for the Casino Website Generator.
+
+Every image operation (optimise, resize, responsive variants, format
+conversion) records, per source file:
+
+- the source's content hash
+- the operation's parameters
+- the content hash of every output it wrote (none when an output was
+  dropped, e.g. a WebP that was not smaller)
+
+An operation is up to date when its parameters are unchanged, the source
+still has the recorded hash (or, for in-place operations, the hash of the
+recorded output) and every recorded output still exists with its hash.
+Files are only re-hashed when their size or mtime changed, so checking a
+whole tree costs one stat per file.
+
+The manifest lives in .build-cache/image-build-manifest.json.
+"""
+
+import os
+import json
+from typing import List, Dict, Optional, Any
+
+from file_utils import write_atomic, hash_file
+
+
+BUILD_MANIFEST_FILE = os.path.join(".build-cache", "image-build-manifest.json")
+MANIFEST_VERSION = 1
+
+
+class BuildManifest:
+    """Source hash + parameters → output hashes, for every image operation."""
+
+    def __init__(self, manifest_path: Optional[str] = None):
+        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.root = current_dir
+        self.manifest_path = manifest_path or os.path.join(current_dir, BUILD_MANIFEST_FILE)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def is_up_to_date(self, operation: str, source: str, params: Dict[str, Any]) -> bool:
+        """
+        Check whether an operation's recorded result for a source is still valid.
+
+        Args:
+            operation (str): Operation name, e.g. 'optimize' or 'convert-avif'
+            source (str): Source file path
+            params (dict): JSON-serialisable operation parameters
+
+        Returns:
+            bool: True if nothing needs to be rebuilt
+        """
+        entry = self.entries.get(self._key(operation, source))
+        if entry is None or entry['params'] != _canonical(params):
+            return False
+
+        outputs = entry['outputs']
+        source_key = self._relative(source)
+        if source_key not in outputs:
+            fingerprint = self.fingerprint(source, entry['source'])
+            if fingerprint is None or fingerprint['sha256'] != entry['source']['sha256']:
+                return False
+
+        for output_key, recorded in outputs.items():
+            fingerprint = self.fingerprint(os.path.join(self.root, *output_key.split('/')), recorded)
+            if fingerprint is None or fingerprint['sha256'] != recorded['sha256']:
+                return False
+            if fingerprint is not recorded:
+                # Same content, new mtime (a copy or checkout); remember it
+                outputs[output_key] = fingerprint
+                self._dirty = True
+        return True
+
+    def record(self, operation: str, source: str, params: Dict[str, Any], outputs: List[str],
+               source_fingerprint: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record the result of an operation.
+
+        Args:
+            operation (str): Operation name
+            source (str): Source file path
+            params (dict): JSON-serialisable operation parameters
+            outputs (list): Files the operation wrote (the source itself for
+                            in-place operations, empty if nothing was kept)
+            source_fingerprint (dict): fingerprint() of the source taken before
+                                       an in-place operation changed it
+        """
+        source_fingerprint = source_fingerprint or self.fingerprint(source)
+        if source_fingerprint is None:
+            return
+        self.entries[self._key(operation, source)] = {
+            'params': _canonical(params),
+            'source': source_fingerprint,
+            'outputs': {self._relative(path): self.fingerprint(path) for path in outputs if os.path.exists(path)}
+        }
+        self._dirty = True
+
+    def fingerprint(self, path: str, known: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get {'sha256', 'size', 'mtime_ns'} for a file, hashing only if it changed.
+
+        Args:
+            path (str): File path
+            known (dict): A previous fingerprint of the same file
+
+        Returns:
+            dict or None: The fingerprint (known itself if still valid), or None if missing
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known
+        return {'sha256': hash_file(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def save(self) -> None:
+        """Drop entries whose source is gone and write the manifest atomically if it changed."""
+        for key in [key for key in self.entries
+                    if not os.path.exists(os.path.join(self.root, *key.partition('|')[2].split('/')))]:
+            del self.entries[key]
+            self._dirty = True
+        if not self._dirty:
+            return
+        write_atomic(self.manifest_path, json.dumps({"version": MANIFEST_VERSION, "entries": self.entries},
+                                                    indent=1, sort_keys=True).encode('utf-8'))
+        self._dirty = False
+
+    def _key(self, operation: str, source: str) -> str:
+        """Manifest key: operation and source path relative to the project root."""
+        return f"{operation}|{self._relative(source)}"
+
+    def _relative(self, path: str) -> str:
+        """Project-relative, '/'-separated path."""
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+
+    def _load(self) -> None:
+        """Load the manifest from disk, discarding incompatible versions."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.entries = data.get("entries", {})
+
+
+_manifest: Optional[BuildManifest] = None
+
+
+def load_build_manifest() -> BuildManifest:
+    """
+    Get the build manifest, shared within the process.
+
+    Returns:
+        BuildManifest: The manifest
+    """
+    global _manifest
+    if _manifest is None:
+        _manifest = BuildManifest()
+    return _manifest
+
+
+# Private helper functions
+
+def _canonical(params: Dict[str, Any]) -> Any:
+    """Round-trip parameters through JSON so tuples and lists compare equal."""
+    return json.loads(json.dumps(params, sort_keys=True))
@@ -22,6 +22,11 @@ import re
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 
+from country_config import load_site_selection
+from section_renderer import render_country_sections
+from sprite_builder import load_sprite_manifest
+from message_catalog import load_catalog, localise
+
 
 class ColorUtils:
     """Utility class for color manipulation and theme generation."""
@@ -875,6 +880,12 @@ def import_components():
             print(f"  ❌ {comp_name} ({variant_name}) - failed")
             failed_components.append(f"{comp_name} ({variant_name})")
 
+    # Country offers and regulator badges from configure_template()
+    _insert_country_sections(importer)
+
+    # Translate {MSG_*} placeholders for the configured country
+    _localise_page(importer)
+
     # Summary
     print(f"\n🎉 Enhanced mix-and-match component import completed!")
     print(f"✅ Successfully imported: {success_count}/{len(ordered_components)} components")
@@ -1026,6 +1037,79 @@ def _insert_component_html(importer: ComponentImporter, html_content: str, comp_
         f.write(new_html)
 
 
+def _insert_country_sections(importer: ComponentImporter) -> bool:
+    """Render the configured country's offers and regulator badges into the page."""
+    selection = load_site_selection()
+    if not selection:
+        print("ℹ️  No country configured - skipping offers and regulator badges")
+        return False
+    
+    # Use the sprites built by configure_template() where available
+    sprites = {}
+    for group in ["offers", "footer"]:
+        group_dir = importer.web_folder / "static" / group
+        manifest = load_sprite_manifest(str(group_dir))
+        if manifest:
+            sprites[group] = manifest
+            if manifest.get("raster"):
+                with open(group_dir / manifest["raster"]["css"], 'r', encoding='utf-8') as f:
+                    _append_component_css(importer, f.read())
+    
+    try:
+        sections = render_country_sections(selection["country"], selection.get("offers_count", 0),
+                                           sprites=sprites)
+    except Exception as e:
+        print(f"⚠️  Error rendering country sections: {e}")
+        return False
+    
+    html_file = importer.web_folder / "index.html"
+    with open(html_file, 'r', encoding='utf-8') as f:
+        current_html = f.read()
+    
+    # Offers sit before the footer, badges directly above the legal notice
+    if sections["offers"]:
+        marker = "<!-- Footer Component Start -->"
+        if marker not in current_html:
+            marker = "<!-- Legal Notice -->"
+        current_html = current_html.replace(marker, f"{sections['offers']}\n\n    {marker}", 1)
+    
+    if sections["badges"]:
+        marker = "<!-- Legal Notice -->"
+        current_html = current_html.replace(marker, f"{sections['badges']}\n\n    {marker}", 1)
+    
+    with open(html_file, 'w', encoding='utf-8') as f:
+        f.write(current_html)
+    
+    print(f"  ✅ {selection['country']} offers and regulator badges")
+    return True
+
+
+def _localise_page(importer: ComponentImporter) -> bool:
+    """Substitute the country's messages into the assembled page in one pass."""
+    selection = load_site_selection()
+    country = selection["country"] if selection else None
+    
+    try:
+        catalog = load_catalog(country)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Error loading message catalog: {e}")
+        return False
+    
+    if catalog is None:
+        print("⚠️  No message catalog found in master/locales/")
+        return False
+    
+    html_file = importer.web_folder / "index.html"
+    with open(html_file, 'r', encoding='utf-8') as f:
+        current_html = f.read()
+    
+    with open(html_file, 'w', encoding='utf-8') as f:
+        f.write(localise(current_html, catalog))
+    
+    print(f"  ✅ Page localised ({catalog.get('LANG', 'en')})")
+    return True
+
+
 def _append_component_css(importer: ComponentImporter, css_content: str):
     """Append component CSS to main stylesheet."""
     css_file = importer.web_folder / "css" / "styles.css"
@@ -7,8 +7,16 @@ for the Casino Website Generator.
 """
 
 import os
+import json
 import shutil
 
+from section_renderer import load_country_offers, select_top_offers, ask_offers_count
+from logo_store import ingest_master_logos, get_optimised_logo
+from sprite_builder import build_sprites
+
+
+SITE_SELECTION_FILE = "country.json"
+
 
 def configure_template():
     """
@@ -18,19 +26,18 @@ def configure_template():
     footer and offers content to web-folder/static/ directory.
     
     Available Countries:
-    - Denmark
-    - France  
-    - Portugal
-    - UK-IR
+    - Every country with both master/offers/{country}/ and master/footer/{country}/
+      (Denmark, France, Portugal, UK-IR, plus any added by country_onboarding)
     
     File Operations:
     - Source: master/footer/{country}/ → Destination: web-folder/static/footer/
     - Source: master/offers/{country}/ → Destination: web-folder/static/offers/
+    - Logos are copied from the optimised logo store when available
+    - Badges and logos are packed into sprites (sprite_builder)
+    - Selection (country, number of offers) → web-folder/static/country.json
     """
-    # List of countries from which we'll randomly select 7
-    countries = [
-        "Denmark", "France", "Portugal", "UK-IR"
-    ]
+    # Countries with both offers and footer content in master/
+    countries = get_available_countries()
 
     # Display countries with their indices
     print("Please select a country by entering its number:")
@@ -52,6 +59,9 @@ def configure_template():
     selected_country = countries[choice - 1]
     print(f"\nYou selected: {selected_country}")
 
+    # Make sure the logo store has optimised copies of all master logos
+    ingest_master_logos()
+
     # Define source and destination paths for footer
     current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     footer_source_dir = os.path.join(current_dir, "master", "footer", selected_country)
@@ -67,6 +77,20 @@ def configure_template():
     # Copy offers content
     _copy_country_content(offers_source_dir, offers_dest_dir, "offers")
 
+    # Ask how many offers the offers section should show
+    country_offers = load_country_offers(selected_country)
+    offers_count = ask_offers_count(len(select_top_offers(country_offers, len(country_offers))))
+
+    save_site_selection(selected_country, offers_count)
+    print(f"Offers section will show {offers_count} offer(s).")
+
+    # Pack badges and the selected offer logos into sprites to cut requests per page
+    if os.path.exists(footer_dest_dir):
+        build_sprites(footer_dest_dir, "footer")
+    if os.path.exists(offers_dest_dir):
+        selected_logos = [offer["image"] for offer in select_top_offers(country_offers, offers_count)]
+        build_sprites(offers_dest_dir, "offers", include=selected_logos)
+
 
 def _copy_country_content(source_dir, dest_dir, content_type):
     """
@@ -97,8 +121,13 @@ def _copy_country_content(source_dir, dest_dir, content_type):
             source_item = os.path.join(source_dir, item)
             dest_item = os.path.join(dest_dir, item)
             if os.path.isfile(source_item):
-                shutil.copy2(source_item, dest_item)
-                print(f"Copied {content_type} file: {item}")
+                optimised_item = get_optimised_logo(source_item, content_type)
+                if optimised_item:
+                    shutil.copyfile(optimised_item, dest_item)
+                    print(f"Copied optimised {content_type} file: {item}")
+                else:
+                    shutil.copy2(source_item, dest_item)
+                    print(f"Copied {content_type} file: {item}")
             elif os.path.isdir(source_item):
                 shutil.copytree(source_item, dest_item)
                 print(f"Copied {content_type} directory: {item}")
@@ -112,10 +141,24 @@ def get_available_countries():
     """
     Get list of available countries for configuration.
     
+    A country is available when master/ has both its offers and footer folders.
+    
     Returns:
         list: List of supported country names
     """
-    return ["Denmark", "France", "Portugal", "UK-IR"]
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    offers_dir = os.path.join(current_dir, "master", "offers")
+    footer_dir = os.path.join(current_dir, "master", "footer")
+    
+    if not os.path.isdir(offers_dir) or not os.path.isdir(footer_dir):
+        return []
+    
+    return sorted(
+        name for name in os.listdir(offers_dir)
+        if not name.startswith('.')
+        and os.path.isdir(os.path.join(offers_dir, name))
+        and os.path.isdir(os.path.join(footer_dir, name))
+    )
 
 
 def validate_country_support(country):
@@ -129,4 +172,45 @@ def validate_country_support(country):
         bool: True if country is supported, False otherwise
     """
     available_countries = get_available_countries()
-    return country in available_countries 
\ No newline at end of file
+    return country in available_countries
+
+
+def save_site_selection(country, offers_count):
+    """
+    Save the selected country and number of offers for the component importer.
+    
+    Args:
+        country (str): Selected country name
+        offers_count (int): Number of offers to render
+    """
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    static_dir = os.path.join(current_dir, "web-folder", "static")
+    os.makedirs(static_dir, exist_ok=True)
+    
+    with open(os.path.join(static_dir, SITE_SELECTION_FILE), 'w', encoding='utf-8') as f:
+        json.dump({"country": country, "offers_count": offers_count}, f, indent=2)
+
+
+def load_site_selection():
+    """
+    Load the country selection saved by configure_template().
+    
+    Returns:
+        dict or None: {"country": str, "offers_count": int} or None if not configured
+    """
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    selection_file = os.path.join(current_dir, "web-folder", "static", SITE_SELECTION_FILE)
+    
+    if not os.path.exists(selection_file):
+        return None
+    
+    try:
+        with open(selection_file, 'r', encoding='utf-8') as f:
+            selection = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not read country selection: {e}")
+        return None
+    
+    if not validate_country_support(selection.get("country")):
+        return None
+    return selection
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Country Onboarding Module
+
+Bulk-adds markets to master/offers and master/footer for the Casino Website
+Generator from a CSV or JSON manifest of operators and regulators.
+
+JSON manifest:
+    {"countries": [{"name": "Spain",
+                    "offers": [{"name": "...", "logo": "...", "url": "...", "offer": "..."}],
+                    "regulators": [{"name": "...", "logo": "...", "url": "..."}]}]}
+
+CSV manifest (one row per operator or regulator):
+    country,type,name,logo,url,offer
+    Spain,offer,Codere,logos/codere.png,https://www.codere.es,100% up to €200
+    Spain,regulator,dgoj,logos/dgoj.svg,https://www.ordenacionjuego.es,
+
+Logo paths are relative to the manifest. Every logo is optimised in a process
+pool, and each country directory is built in a temporary folder and renamed
+into place, so a failed run never leaves a half-written market behind.
+"""
+
+import os
+import re
+import csv
+import json
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional, Any
+
+from logo_store import optimise_logo, RASTER_EXTENSIONS
+
+
+MANIFEST_KEY_ALIASES = {
+    "name": "name",
+    "operator": "name",
+    "regulator": "name",
+    "logo": "logo",
+    "img": "logo",
+    "image": "logo",
+    "url": "url",
+    "link": "url",
+    "offer": "offer",
+    "bonus": "offer",
+}
+
+COUNTRY_NAME_PATTERN = re.compile(r'^[A-Za-z][A-Za-z0-9 _-]*$')
+
+
+def onboard_countries(manifest_path: str, workers: Optional[int] = None,
+                      replace: bool = False, master_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Validate a manifest and write its countries into master/.
+
+    Args:
+        manifest_path (str): CSV or JSON manifest
+        workers (int): Process pool size for logo optimisation (defaults to CPU count)
+        replace (bool): Replace countries that already exist in master/
+        master_dir (str): Optional master directory override
+
+    Returns:
+        dict: {'onboarded': [...], 'errors': [...], 'bytes_saved': int}
+    """
+    if master_dir is None:
+        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        master_dir = os.path.join(current_dir, "master")
+
+    summary = {'onboarded': [], 'errors': [], 'bytes_saved': 0}
+
+    try:
+        countries = load_manifest(manifest_path)
+    except (OSError, ValueError) as e:
+        summary['errors'].append(f"Could not read manifest: {e}")
+        _display_onboarding_summary(summary)
+        return summary
+
+    errors = validate_manifest(countries, master_dir, replace)
+    if errors:
+        summary['errors'].extend(errors)
+        _display_onboarding_summary(summary)
+        return summary
+
+    # Stage every country first, optimising all logos in one pool
+    staged = {}
+    jobs = []
+    try:
+        for country in countries:
+            staged[country["name"]] = _stage_country(country, master_dir, jobs)
+
+        print(f"Optimising {len(jobs)} logo(s) for {len(countries)} countr{'y' if len(countries) == 1 else 'ies'}...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (source, _, _), result in zip(jobs, pool.map(_optimise_job, jobs)):
+                original_size, optimised_size, error = result
+                if error:
+                    summary['errors'].append(f"{source}: {error}")
+                else:
+                    summary['bytes_saved'] += original_size - optimised_size
+
+        if summary['errors']:
+            return summary
+
+        for country_name, staged_dirs in staged.items():
+            for staging_dir, final_dir in staged_dirs:
+                _replace_directory(staging_dir, final_dir)
+            summary['onboarded'].append(country_name)
+    finally:
+        for staged_dirs in staged.values():
+            for staging_dir, _ in staged_dirs:
+                if os.path.exists(staging_dir):
+                    shutil.rmtree(staging_dir)
+        _display_onboarding_summary(summary)
+
+    return summary
+
+
+def load_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    Load a CSV or JSON manifest into normalised country entries.
+
+    Keys are matched case-insensitively against common spellings
+    (img/image/logo, URL/link, Offer/bonus) and values are stripped.
+    Logo paths are resolved relative to the manifest.
+
+    Args:
+        manifest_path (str): Path to a .csv or .json manifest
+
+    Returns:
+        list: Countries as {'name', 'offers': [...], 'regulators': [...]}
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    countries: Dict[str, Dict[str, Any]] = {}
+
+    def country_entry(name: str) -> Dict[str, Any]:
+        return countries.setdefault(name, {"name": name, "offers": [], "regulators": []})
+
+    if manifest_path.lower().endswith('.csv'):
+        with open(manifest_path, 'r', encoding='utf-8-sig', newline='') as f:
+            for line_number, row in enumerate(csv.DictReader(f), 2):
+                row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+                kind = row.get("type", "").lower()
+                if kind not in ("offer", "regulator"):
+                    raise ValueError(f"line {line_number}: type must be 'offer' or 'regulator'")
+                entry = _normalise_entry(row, base_dir)
+                country_entry(row.get("country", ""))["offers" if kind == "offer" else "regulators"].append(entry)
+    else:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for country in data.get("countries", []):
+            entry = country_entry(str(country.get("name", "")).strip())
+            entry["offers"].extend(_normalise_entry(o, base_dir) for o in country.get("offers", []))
+            entry["regulators"].extend(_normalise_entry(r, base_dir) for r in country.get("regulators", []))
+
+    return list(countries.values())
+
+
+def validate_manifest(countries: List[Dict[str, Any]], master_dir: str, replace: bool = False) -> List[str]:
+    """
+    Validate normalised manifest entries.
+
+    Args:
+        countries (list): Output of load_manifest()
+        master_dir (str): Master directory the countries will be written to
+        replace (bool): Allow countries that already exist
+
+    Returns:
+        list: Error messages, empty if the manifest is valid
+    """
+    errors = []
+    supported = RASTER_EXTENSIONS + ['.svg']
+
+    if not countries:
+        errors.append("Manifest contains no countries")
+
+    for country in countries:
+        name = country["name"]
+        if not COUNTRY_NAME_PATTERN.match(name):
+            errors.append(f"Invalid country name: '{name}'")
+            continue
+        if not replace and (os.path.exists(os.path.join(master_dir, "offers", name))
+                            or os.path.exists(os.path.join(master_dir, "footer", name))):
+            errors.append(f"{name}: already exists in master/ (use replace to overwrite)")
+        if not country["offers"]:
+            errors.append(f"{name}: no offers")
+
+        for kind, entries in [("offer", country["offers"]), ("regulator", country["regulators"])]:
+            # Logos and data keys are named by slug, so names that slugify alike collide
+            seen = {}
+            for entry in entries:
+                label = f"{name} {kind} '{entry['name']}'"
+                slug = _slugify(entry["name"])
+                if not entry["name"]:
+                    errors.append(f"{name}: {kind} without a name")
+                elif slug in seen:
+                    errors.append(f"{label}: same file name '{slug}' as '{seen[slug]}'")
+                else:
+                    seen[slug] = entry["name"]
+
+                if entry["url"] and not re.match(r'^https?://[^\s/]+', entry["url"]):
+                    errors.append(f"{label}: invalid URL '{entry['url']}'")
+                if kind == "offer":
+                    if not entry["url"]:
+                        errors.append(f"{label}: missing URL")
+                    if not entry["offer"]:
+                        errors.append(f"{label}: missing offer text")
+
+                if not entry["logo"]:
+                    if kind == "regulator":
+                        errors.append(f"{label}: missing logo")
+                elif not os.path.isfile(entry["logo"]):
+                    errors.append(f"{label}: logo not found: {entry['logo']}")
+                elif os.path.splitext(entry["logo"])[1].lower() not in supported:
+                    errors.append(f"{label}: unsupported logo format")
+
+    return errors
+
+
+# Private helper functions
+
+def _normalise_entry(raw: Dict[str, Any], base_dir: str) -> Dict[str, str]:
+    """Normalise one operator/regulator entry."""
+    entry = {"name": "", "logo": "", "url": "", "offer": ""}
+    for key, value in raw.items():
+        normalised_key = MANIFEST_KEY_ALIASES.get(str(key).strip().lower())
+        if normalised_key and isinstance(value, str):
+            entry[normalised_key] = value.strip()
+    if entry["logo"]:
+        entry["logo"] = os.path.normpath(os.path.join(base_dir, entry["logo"]))
+    return entry
+
+
+def _stage_country(country: Dict[str, Any], master_dir: str,
+                   jobs: List[Tuple[str, str, str]]) -> List[Tuple[str, str]]:
+    """Write a country's data files into staging folders and queue its logos."""
+    name = country["name"]
+    staged = []
+
+    offers_dir = os.path.join(master_dir, "offers")
+    os.makedirs(offers_dir, exist_ok=True)
+    offers_staging = _make_staging_dir(offers_dir, name)
+    staged.append((offers_staging, os.path.join(offers_dir, name)))
+
+    offers_data = {}
+    for offer in country["offers"]:
+        image = ""
+        if offer["logo"]:
+            image = f"{_slugify(offer['name'])}_logo{os.path.splitext(offer['logo'])[1].lower()}"
+            jobs.append((offer["logo"], os.path.join(offers_staging, image), "offers"))
+        offers_data[offer["name"]] = {"img": image, "url": offer["url"], "offer": offer["offer"]}
+    _write_json(os.path.join(offers_staging, f"{_slugify(name)}.json"), offers_data)
+
+    footer_dir = os.path.join(master_dir, "footer")
+    os.makedirs(footer_dir, exist_ok=True)
+    footer_staging = _make_staging_dir(footer_dir, name)
+    staged.append((footer_staging, os.path.join(footer_dir, name)))
+
+    footer_data = {}
+    for regulator in country["regulators"]:
+        image = f"{_slugify(regulator['name'])}{os.path.splitext(regulator['logo'])[1].lower()}"
+        jobs.append((regulator["logo"], os.path.join(footer_staging, image), "footer"))
+        footer_data[_slugify(regulator["name"])] = {"image": image, "url": regulator["url"]}
+    _write_json(os.path.join(footer_staging, "info.json"), footer_data)
+
+    return staged
+
+
+def _make_staging_dir(parent_dir: str, name: str) -> str:
+    """Create a hidden staging folder next to its final location."""
+    staging_dir = tempfile.mkdtemp(prefix=f".tmp-{name}-", dir=parent_dir)
+    os.chmod(staging_dir, 0o755)
+    return staging_dir
+
+
+def _optimise_job(job: Tuple[str, str, str]) -> Tuple[int, int, Optional[str]]:
+    """Process pool entry point for optimise_logo()."""
+    source, dest, profile = job
+    try:
+        original_size, optimised_size = optimise_logo(source, dest, profile)
+        return original_size, optimised_size, None
+    except Exception as e:
+        return 0, 0, str(e)
+
+
+def _replace_directory(staging_dir: str, final_dir: str) -> None:
+    """Rename a staged directory into place, swapping out any existing one."""
+    backup_dir = None
+    if os.path.exists(final_dir):
+        backup_dir = tempfile.mkdtemp(prefix=".old-", dir=os.path.dirname(final_dir))
+        os.rmdir(backup_dir)
+        os.rename(final_dir, backup_dir)
+    try:
+        os.rename(staging_dir, final_dir)
+    except OSError:
+        if backup_dir:
+            os.rename(backup_dir, final_dir)
+        raise
+    if backup_dir:
+        shutil.rmtree(backup_dir)
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """Write a data file in the same layout as the hand-written ones."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+        f.write("\n")
+
+
+def _slugify(name: str) -> str:
+    """Turn an operator or country name into a file-name-safe slug."""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or "logo"
+
+
+def _display_onboarding_summary(summary: Dict[str, Any]) -> None:
+    """Display onboarding summary."""
+    print(f"\n{'='*50}")
+    print("COUNTRY ONBOARDING SUMMARY")
+    print(f"{'='*50}")
+    print(f"✅ Countries Onboarded: {len(summary['onboarded'])}")
+    for country in summary['onboarded']:
+        print(f"   • {country}")
+    print(f"💾 Logo Size Saved: {summary['bytes_saved']} bytes")
+    print(f"❌ Errors: {len(summary['errors'])}")
+    for error in summary['errors']:
+        print(f"   • {error}")
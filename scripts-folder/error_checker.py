@@ -11,6 +11,8 @@ import re
 import html.parser
 from typing import List, Dict, Tuple, Optional
 
+from link_checker import check_links
+
 
 def error_checking():
     """
@@ -18,6 +20,7 @@ def error_checking():
     
     Performs validation checks on the generated casino website:
     - Empty links with '#'
+    - Broken external links
     - Missing or incorrect CSS files
     - Proper meta tags
     - Logo and favicon presence
@@ -37,6 +40,7 @@ def error_checking():
     # Run all validation checks
     results = {
         "empty_links": check_empty_links(web_folder),
+        "external_links": check_external_links(web_folder),
         "css_files": check_css_files(web_folder),
         "meta_tags": check_meta_tags(web_folder),
         "logos_favicons": check_logos_and_favicons(web_folder),
@@ -89,6 +93,24 @@ def check_empty_links(web_folder: str) -> Dict[str, List[str]]:
     }
 
 
+def check_external_links(web_folder: str) -> Dict[str, any]:
+    """
+    Check that absolute http(s) links in HTML files resolve.
+    
+    Uses the cached, rate-limited checker in link_checker.py, so repeated
+    runs only hit the network for new or expired URLs.
+    
+    Args:
+        web_folder (str): Path to web-folder directory
+        
+    Returns:
+        dict: Results with unreachable links
+    """
+    print("Checking external links...")
+    
+    return check_links(web_folder, include_master=False)
+
+
 def check_css_files(web_folder: str) -> Dict[str, any]:
     """
     Check that correct CSS files are linked and exist.
@@ -389,7 +411,8 @@ def check_casino_compliance(web_folder: str) -> Dict[str, any]:
         },
         {
             'name': 'Responsible Gambling',
-            'patterns': [r'responsible.gambling', r'gamble.responsibly', r'gambling.problem']
+            'patterns': [r'responsible.gambling', r'gamble.responsibly', r'gambling.problem',
+                         r'spil.ansvarligt', r'jouer.comporte.des.risques', r'jogue.com.responsabilidade']
         },
         {
             'name': 'Terms and Conditions',
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Favicon Builder Module
+
+One-pass favicon and touch-icon set generation for the Casino Website
+Generator.
+
+From one source logo, decoded once:
+
+- favicon.ico with 16, 32 and 48 pixel frames, at the site root where
+  browsers look for it by default
+- apple-touch-icon.png (180x180, on an opaque background, as iOS fills
+  transparency with black)
+- icon-192.png and icon-512.png, plus maskable-192.png and
+  maskable-512.png with the logo inside the maskable safe zone
+- favicon.svg with a square viewBox, when the source is an SVG (if
+  cairosvg is missing, the raster icons come from a raster of the same
+  name next to it, or are skipped)
+- site.webmanifest listing the PWA icons
+
+Icons go to static/icons/, outside static/images, so the image stages
+never treat them as site images.
+
+The matching <link> tags replace any existing icon links in the <head> of
+every generated page. The set is only rebuilt when the build manifest
+shows the source or the settings changed.
+"""
+
+import io
+import os
+import re
+import json
+import math
+from typing import List, Dict, Tuple, Optional, Any
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is required for the raster icons
+    Image = None
+
+try:
+    import cairosvg
+except ImportError:  # Without cairosvg an SVG source only yields favicon.svg
+    cairosvg = None
+
+from build_manifest import load_build_manifest
+from image_metadata import load_image_index
+from img_tag_rewriter import get_attribute, set_attribute, remove_attribute
+from svg_optimizer import optimize_svg_data
+from file_utils import write_atomic
+
+
+ICO_SIZES = [16, 32, 48]
+TOUCH_ICON_SIZE = 180
+PWA_ICON_SIZES = [192, 512]
+MASTER_SIZE = 512
+TOUCH_ICON_PADDING = 0.1
+MASKABLE_SAFE_ZONE = 0.8  # diameter of the circle every mask shape keeps, as a fraction of the icon
+DEFAULT_BACKGROUND = "#ffffff"
+ICONS_SUBDIR = os.path.join("static", "icons")
+SOURCE_FORMATS = ['SVG', 'PNG', 'WEBP', 'JPEG', 'GIF']
+
+ICON_LINK_PATTERN = re.compile(
+    r'[ \t]*<link\b[^>]*\brel\s*=\s*["\'](?:shortcut icon|icon|apple-touch-icon|manifest)["\'][^>]*>[ \t]*\r?\n?',
+    re.IGNORECASE)
+HEAD_END_PATTERN = re.compile(r'([ \t]*)</head\s*>', re.IGNORECASE)
+HEAD_INDENT_PATTERN = re.compile(r'<head\b[^>]*>\s*?\n([ \t]*)<', re.IGNORECASE)
+TITLE_PATTERN = re.compile(r'<title>([^<]*)</title>', re.IGNORECASE)
+
+
+def find_logo_source(images_dir: str) -> Optional[str]:
+    """
+    Pick the site logo to build icons from, using the image metadata index.
+
+    SVG logos win over rasters, and larger rasters over smaller ones.
+    Responsive variants and WebP/AVIF copies made by the pipeline are
+    never picked.
+
+    Args:
+        images_dir (str): static/images directory
+
+    Returns:
+        str or None: Path of the logo, or None if no image is named like one
+    """
+    index = load_image_index(images_dir)
+    candidates = []
+    for relative_path, metadata in index.source_entries().items():
+        name = os.path.basename(relative_path).lower()
+        if 'logo' not in name or metadata['format'] not in SOURCE_FORMATS or metadata.get('animated'):
+            continue
+        area = (metadata.get('width') or 0) * (metadata.get('height') or 0)
+        candidates.append((metadata['format'] == 'SVG', 'header/' in relative_path, area, relative_path))
+    if not candidates:
+        return None
+    return os.path.join(images_dir, *max(candidates)[3].split('/'))
+
+
+def build_favicon_set(source: str, web_folder: str, background: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate the favicon set from one logo.
+
+    Args:
+        source (str): Logo file (SVG or raster)
+        web_folder (str): Site root; favicon.ico and site.webmanifest go here,
+                          the other icons into static/icons/
+        background (str): Hex colour behind touch and maskable icons (defaults
+                          to the logo's own corner colour when it is opaque, white otherwise)
+
+    Returns:
+        dict: {'files': [written paths], 'links': [(rel, path, attributes)], 'up_to_date', 'errors': [...]}
+    """
+    summary = {'files': [], 'links': [], 'up_to_date': False, 'errors': []}
+    icons_dir = os.path.join(web_folder, ICONS_SUBDIR)
+    is_svg = source.lower().endswith('.svg')
+    raster_from = source if not is_svg or cairosvg is not None else _raster_twin(source)
+
+    outputs = _planned_outputs(web_folder, icons_dir, is_svg, raster=raster_from is not None)
+    summary['links'] = _link_specs(outputs)
+    manifest = load_build_manifest()
+    params = {'ico': ICO_SIZES, 'touch': TOUCH_ICON_SIZE, 'pwa': PWA_ICON_SIZES,
+              'background': background, 'files': sorted(os.path.relpath(path, web_folder) for path in outputs.values())}
+    if raster_from and raster_from != source:
+        fingerprint = manifest.fingerprint(raster_from)
+        params['raster_source'] = fingerprint['sha256'] if fingerprint else None
+
+    if manifest.is_up_to_date('favicons', source, params):
+        summary['up_to_date'] = True
+        return summary
+
+    try:
+        with open(source, 'rb') as f:
+            data = f.read()
+        os.makedirs(icons_dir, exist_ok=True)
+
+        if is_svg:
+            write_atomic(outputs['svg'], _square_svg(optimize_svg_data(data)))
+            summary['files'].append(outputs['svg'])
+            if raster_from is None:
+                summary['errors'].append("cairosvg is not installed and there is no raster logo of the same "
+                                         "name - only favicon.svg was built from the SVG logo")
+        if 'ico' in outputs:
+            if Image is None:
+                raise RuntimeError("Pillow is not installed - raster icons could not be built")
+            if raster_from != source:
+                with open(raster_from, 'rb') as f:
+                    data = f.read()
+            master = _decode_master(data, raster_from.lower().endswith('.svg'))
+            summary['files'].extend(_write_raster_icons(master, outputs, background or _default_background(master)))
+            write_atomic(outputs['webmanifest'], _webmanifest(web_folder, outputs))
+            summary['files'].append(outputs['webmanifest'])
+    except Exception as e:
+        summary['errors'].append(f"{os.path.basename(source)}: {e}")
+        return summary
+
+    manifest.record('favicons', source, params, summary['files'])
+    manifest.save()
+    return summary
+
+
+def insert_icon_links(html_files: List[str], links: List[Tuple[str, str, Dict[str, str]]]) -> Dict[str, int]:
+    """
+    Replace the icon <link> tags in the <head> of each page with the given set.
+
+    Args:
+        html_files (list): HTML files to update
+        links (list): 'links' from build_favicon_set()
+
+    Returns:
+        dict: {'files_updated'}
+    """
+    stats = {'files_updated': 0}
+
+    for html_file in html_files:
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        head_end = HEAD_END_PATTERN.search(content)
+        if not head_end:
+            continue
+
+        head = content[:head_end.start()]
+        indent_match = HEAD_INDENT_PATTERN.search(head)
+        indent = indent_match.group(1) if indent_match else "    "
+        html_dir = os.path.dirname(os.path.abspath(html_file))
+
+        tags = []
+        for rel, path, attributes in links:
+            tag = f'<link rel="{rel}">'
+            tag = set_attribute(tag, 'href', os.path.relpath(path, html_dir).replace(os.sep, '/'))
+            for name, value in attributes.items():
+                tag = set_attribute(tag, name, value)
+            tags.append(f"{indent}{tag}\n")
+
+        new_head = ICON_LINK_PATTERN.sub('', head)
+        new_content = new_head.rstrip(' \t') + "".join(tags) + head_end.group(1) + content[head_end.start() + len(head_end.group(1)):]
+        if new_content != content:
+            write_atomic(html_file, new_content.encode('utf-8'))
+            stats['files_updated'] += 1
+
+    return stats
+
+
+# Private helper functions
+
+def _raster_twin(svg_path: str) -> Optional[str]:
+    """A raster file with the same name as an SVG logo, next to it (e.g. logo.png for logo.svg)."""
+    stem = os.path.splitext(svg_path)[0]
+    for extension in ('.png', '.webp', '.jpg', '.jpeg', '.gif'):
+        if os.path.exists(stem + extension):
+            return stem + extension
+    return None
+
+
+def _planned_outputs(web_folder: str, icons_dir: str, is_svg: bool, raster: bool) -> Dict[str, str]:
+    """Output key → path for the files this source can produce."""
+    outputs = {}
+    if is_svg:
+        outputs['svg'] = os.path.join(icons_dir, "favicon.svg")
+    if raster:
+        outputs['ico'] = os.path.join(web_folder, "favicon.ico")
+        outputs['touch'] = os.path.join(icons_dir, "apple-touch-icon.png")
+        for size in PWA_ICON_SIZES:
+            outputs[f'icon-{size}'] = os.path.join(icons_dir, f"icon-{size}.png")
+            outputs[f'maskable-{size}'] = os.path.join(icons_dir, f"maskable-{size}.png")
+        outputs['webmanifest'] = os.path.join(web_folder, "site.webmanifest")
+    return outputs
+
+
+def _link_specs(outputs: Dict[str, str]) -> List[Tuple[str, str, Dict[str, str]]]:
+    """The <link> tags for a set of outputs: (rel, path, extra attributes)."""
+    links = []
+    if 'ico' in outputs:
+        # 32x32 rather than "any", so browsers that support SVG pick favicon.svg
+        links.append(("icon", outputs['ico'], {'sizes': "32x32"}))
+    if 'svg' in outputs:
+        links.append(("icon", outputs['svg'], {'type': "image/svg+xml"}))
+    if 'touch' in outputs:
+        links.append(("apple-touch-icon", outputs['touch'], {}))
+    if 'webmanifest' in outputs:
+        links.append(("manifest", outputs['webmanifest'], {}))
+    return links
+
+
+def _decode_master(data: bytes, is_svg: bool) -> Any:
+    """Decode the logo once into a square RGBA master, content trimmed and centred."""
+    if is_svg:
+        image = Image.open(io.BytesIO(cairosvg.svg2png(bytestring=data, output_width=MASTER_SIZE * 2)))
+    else:
+        image = Image.open(io.BytesIO(data))
+    with image:
+        image.draft('RGB', (MASTER_SIZE, MASTER_SIZE))
+        image = ImageOps.exif_transpose(image).convert('RGBA')
+
+    box = image.getchannel('A').point(lambda alpha: 255 if alpha > 8 else 0).getbbox()
+    if box:
+        image = image.crop(box)
+    image.thumbnail((MASTER_SIZE, MASTER_SIZE), Image.LANCZOS, reducing_gap=3.0)
+
+    master = Image.new('RGBA', (max(image.size),) * 2, (0, 0, 0, 0))
+    master.paste(image, ((master.width - image.width) // 2, (master.height - image.height) // 2))
+    master.info['content_size'] = image.size
+    return master
+
+
+def _write_raster_icons(master: Any, outputs: Dict[str, str], background: str) -> List[str]:
+    """Resample every raster icon from the master and write it."""
+    written = []
+
+    frames = [master.resize((size, size), Image.LANCZOS, reducing_gap=3.0) for size in ICO_SIZES]
+    buffer = io.BytesIO()
+    frames[-1].save(buffer, 'ICO', sizes=[(size, size) for size in ICO_SIZES], append_images=frames[:-1])
+    write_atomic(outputs['ico'], buffer.getvalue())
+    written.append(outputs['ico'])
+
+    # Touch icon: padded, on an opaque background
+    written.append(_save_png(_on_background(master, TOUCH_ICON_SIZE, 1 - 2 * TOUCH_ICON_PADDING, background),
+                             outputs['touch']))
+
+    # Maskable icons: the logo's bounding box must fit inside the safe-zone circle
+    content_width, content_height = master.info['content_size']
+    diagonal = math.hypot(content_width, content_height) / master.width
+    for size in PWA_ICON_SIZES:
+        icon = master.resize((size, size), Image.LANCZOS, reducing_gap=3.0)
+        written.append(_save_png(icon, outputs[f'icon-{size}']))
+        written.append(_save_png(_on_background(master, size, MASKABLE_SAFE_ZONE / diagonal, background),
+                                 outputs[f'maskable-{size}']))
+    return written
+
+
+def _on_background(master: Any, size: int, scale: float, background: str) -> Any:
+    """Scale the master by scale and centre it on a size x size opaque canvas."""
+    inner = max(1, round(size * min(1.0, scale)))
+    logo = master.resize((inner, inner), Image.LANCZOS, reducing_gap=3.0)
+    canvas = Image.new('RGBA', (size, size), background)
+    canvas.alpha_composite(logo, ((size - inner) // 2, (size - inner) // 2))
+    return canvas.convert('RGB')
+
+
+def _default_background(master: Any) -> str:
+    """The logo's corner colour when it is opaque there, white otherwise."""
+    red, green, blue, alpha = master.getpixel((0, 0))
+    if alpha < 255:
+        return DEFAULT_BACKGROUND
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def _square_svg(data: bytes) -> bytes:
+    """Give an SVG a square viewBox centred on its content, without fixed width/height."""
+    text = data.decode('utf-8')
+    root = re.search(r'<svg\b[^>]*>', text)
+    if not root:
+        return data
+    tag = root.group(0)
+    view_box = get_attribute(tag, 'viewBox')
+    try:
+        if view_box:
+            x, y, width, height = (float(value) for value in re.split(r'[\s,]+', view_box.strip()))
+        else:
+            x, y = 0.0, 0.0
+            width = float(re.match(r'[\d.]+', get_attribute(tag, 'width') or '').group(0))
+            height = float(re.match(r'[\d.]+', get_attribute(tag, 'height') or '').group(0))
+    except (ValueError, AttributeError):
+        return data
+
+    side = max(width, height)
+    x -= (side - width) / 2
+    y -= (side - height) / 2
+    numbers = " ".join(f"{value:g}" for value in (x, y, side, side))
+    new_tag = remove_attribute(remove_attribute(set_attribute(tag, 'viewBox', numbers), 'width'), 'height')
+    return (text[:root.start()] + new_tag + text[root.end():]).encode('utf-8')
+
+
+def _webmanifest(web_folder: str, outputs: Dict[str, str]) -> bytes:
+    """site.webmanifest listing the any-purpose and maskable PWA icons."""
+    name = "Casino"
+    index_html = os.path.join(web_folder, "index.html")
+    if os.path.exists(index_html):
+        with open(index_html, 'r', encoding='utf-8') as f:
+            title = TITLE_PATTERN.search(f.read())
+        if title and title.group(1).strip():
+            name = title.group(1).strip()
+
+    icons = []
+    for purpose in ("any", "maskable"):
+        for size in PWA_ICON_SIZES:
+            path = outputs[f"{'icon' if purpose == 'any' else 'maskable'}-{size}"]
+            icons.append({"src": os.path.relpath(path, web_folder).replace(os.sep, '/'),
+                          "sizes": f"{size}x{size}", "type": "image/png", "purpose": purpose})
+    return (json.dumps({"name": name, "icons": icons}, indent=2) + "\n").encode('utf-8')
+
+
+def _save_png(image: Any, path: str) -> str:
+    """Encode a PNG and write it atomically."""
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', optimize=True)
+    write_atomic(path, buffer.getvalue())
+    return path
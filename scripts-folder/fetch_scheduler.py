@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Fetch Scheduler Module
+
+Quota-aware scheduling of image API requests for the Casino Website
+Generator.
+
+- TokenBucket paces API calls and re-syncs itself from the server's
+  X-Ratelimit-* / RateLimit-* response headers
+- Jobs run in priority order: required manifest images (logo, main_banner,
+  favicon, ...) first, optional manifest images next, category photos last
+- When the quota runs out, unfinished jobs are saved to
+  .build-cache/fetch-queue.json and run first next time
+"""
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Callable
+
+from file_utils import write_atomic
+
+
+FETCH_QUEUE_FILE = os.path.join(".build-cache", "fetch-queue.json")
+DEFAULT_RATE_LIMIT = 50  # requests per window (Unsplash demo applications)
+DEFAULT_RATE_WINDOW = 60 * 60
+DEFAULT_MAX_WAIT = 60  # seconds to wait for a token before deferring work
+
+PRIORITY_REQUIRED = 0
+PRIORITY_OPTIONAL = 1
+PRIORITY_CATEGORY = 2
+
+
+class RateLimitExhausted(Exception):
+    """Raised when no request may be sent within the allowed wait."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"Rate limit exhausted, next request allowed in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Token bucket whose capacity and fill level follow rate-limit headers."""
+
+    def __init__(self, limit: int = DEFAULT_RATE_LIMIT, window: float = DEFAULT_RATE_WINDOW,
+                 max_wait: float = DEFAULT_MAX_WAIT):
+        self.capacity = float(limit)
+        self.window = window
+        self.max_wait = max_wait
+        self.tokens = float(limit)
+        self._updated = time.monotonic()
+        self._reset_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Take one token, sleeping up to max_wait for it.
+
+        Raises:
+            RateLimitExhausted: If the next token is further away than max_wait
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = self._time_to_next_token()
+            if wait > self.max_wait:
+                raise RateLimitExhausted(wait)
+            time.sleep(wait)
+
+    def update_from_headers(self, headers: Dict[str, str], exhausted: bool = False) -> None:
+        """
+        Re-sync the bucket with the server's view of the quota.
+
+        Understands X-Ratelimit-Limit/-Remaining (Unsplash), RateLimit-Limit/
+        -Remaining/-Reset and Retry-After. Reset values above 10^9 are treated
+        as Unix timestamps, smaller values as seconds from now.
+
+        Args:
+            headers (dict): Response headers
+            exhausted (bool): The response was a 429, so the quota is empty
+        """
+        limit = _header_number(headers, "X-Ratelimit-Limit", "RateLimit-Limit")
+        remaining = _header_number(headers, "X-Ratelimit-Remaining", "RateLimit-Remaining")
+        reset = _header_number(headers, "Retry-After", "X-Ratelimit-Reset", "RateLimit-Reset")
+
+        with self._lock:
+            self._refill()
+            if limit:
+                self.capacity = limit
+            if exhausted:
+                remaining = 0
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+            # Only a real reset header refills the bucket at once; without one
+            # (Unsplash) an empty bucket drips back at capacity/window
+            if reset is not None:
+                seconds = reset - time.time() if reset > 1e9 else reset
+                self._reset_at = time.monotonic() + max(0.0, seconds)
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed; caller holds the lock."""
+        now = time.monotonic()
+        if self._reset_at is not None:
+            if now < self._reset_at:
+                self._updated = now
+                return
+            # Window reset: the server starts counting from zero again
+            self._reset_at = None
+            self.tokens = self.capacity
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.capacity / self.window)
+        self._updated = now
+
+    def _time_to_next_token(self) -> float:
+        """Seconds until a token is available; caller holds the lock."""
+        if self._reset_at is not None:
+            return max(0.0, self._reset_at - time.monotonic())
+        return (1 - self.tokens) * self.window / self.capacity
+
+
+class FetchScheduler:
+    """Runs fetch jobs by priority and persists whatever the quota leaves."""
+
+    def __init__(self, run_job: Callable[[Dict[str, Any]], Any], queue_path: Optional[str] = None,
+                 workers: int = 4):
+        if queue_path is None:
+            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            queue_path = os.path.join(current_dir, FETCH_QUEUE_FILE)
+        self.run_job = run_job
+        self.queue_path = queue_path
+        self.workers = workers
+
+    def run(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run queued jobs from the last run plus new jobs, highest priority first.
+
+        Args:
+            jobs (list): Jobs from plan_fetch_jobs()
+
+        Returns:
+            dict: {'completed': [...], 'failed': [...], 'deferred': [...], 'retry_in': float}
+        """
+        pending = self._merge(self.load_queue(), jobs)
+        summary = {'completed': [], 'failed': [], 'deferred': [], 'retry_in': 0.0}
+        stop = threading.Event()
+        lock = threading.Lock()
+
+        def execute(job: Dict[str, Any]) -> None:
+            if stop.is_set():
+                with lock:
+                    summary['deferred'].append(job)
+                return
+            try:
+                self.run_job(job)
+                with lock:
+                    summary['completed'].append(job)
+            except RateLimitExhausted as e:
+                stop.set()
+                with lock:
+                    summary['deferred'].append(job)
+                    summary['retry_in'] = max(summary['retry_in'], e.retry_in)
+            except Exception as e:
+                with lock:
+                    summary['failed'].append(dict(job, error=str(e)))
+
+        # The pool starts jobs in submission order, so priorities hold
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for job in pending:
+                pool.submit(execute, job)
+
+        # Failed jobs are retried next run too, after the deferred ones
+        leftover = sorted(summary['deferred'], key=lambda job: job['priority'])
+        leftover += [{k: v for k, v in job.items() if k != 'error'} for job in summary['failed']]
+        self.save_queue(leftover)
+        return summary
+
+    def load_queue(self) -> List[Dict[str, Any]]:
+        """Load jobs left over from the previous run."""
+        if not os.path.exists(self.queue_path):
+            return []
+        try:
+            with open(self.queue_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("pending", [])
+        except (OSError, ValueError):
+            return []
+
+    def save_queue(self, jobs: List[Dict[str, Any]]) -> None:
+        """Persist unfinished jobs atomically (removes the file when empty)."""
+        if not jobs:
+            if os.path.exists(self.queue_path):
+                os.remove(self.queue_path)
+            return
+        write_atomic(self.queue_path, json.dumps({"saved_at": time.time(), "pending": jobs}, indent=2).encode('utf-8'))
+
+    @staticmethod
+    def _merge(queued: List[Dict[str, Any]], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge queued and new jobs by key; carried-over jobs go first within a priority."""
+        merged = {}
+        for job in queued + jobs:
+            merged.setdefault(job['key'], job)
+        return sorted(merged.values(), key=lambda job: job['priority'])
+
+
+def plan_fetch_jobs(manifest: Dict[str, Dict[str, Dict]], categories: Dict[str, List[str]],
+                    per_query: int) -> List[Dict[str, Any]]:
+    """
+    Turn the image manifest and category tags into prioritised fetch jobs.
+
+    Args:
+        manifest (dict): Output of create_casino_image_manifest()
+        categories (dict): Output of get_image_categories()
+        per_query (int): Photos per category search tag
+
+    Returns:
+        list: Jobs sorted by priority
+    """
+    jobs = []
+    for category, images in manifest.items():
+        for name, spec in images.items():
+            width, height = (int(value) for value in spec.get("size", "1x1").split("x"))
+            jobs.append({
+                'key': f"manifest:{category}/{name}",
+                'kind': "manifest",
+                'category': category,
+                'name': name,
+                'query': spec.get("description", name.replace("_", " ")),
+                'orientation': orientation_for_size(width, height),
+                'count': 1,
+                'priority': PRIORITY_REQUIRED if spec.get("required") else PRIORITY_OPTIONAL
+            })
+
+    for category, queries in categories.items():
+        for query in queries:
+            jobs.append({
+                'key': f"category:{category}/{query}",
+                'kind': "category",
+                'category': category,
+                'query': query,
+                'count': per_query,
+                'priority': PRIORITY_CATEGORY
+            })
+
+    return sorted(jobs, key=lambda job: job['priority'])
+
+
+def orientation_for_size(width: int, height: int) -> str:
+    """
+    Map a target size to an Unsplash orientation filter.
+
+    Args:
+        width (int): Target width
+        height (int): Target height
+
+    Returns:
+        str: "landscape", "portrait" or "squarish"
+    """
+    ratio = width / height if height else 1
+    if ratio > 1.3:
+        return "landscape"
+    if ratio < 0.77:
+        return "portrait"
+    return "squarish"
+
+
+# Private helper functions
+
+def _header_number(headers: Dict[str, str], *names: str) -> Optional[float]:
+    """Get the first numeric header among names (case-insensitive)."""
+    lowered = {key.lower(): value for key, value in headers.items()}
+    for name in names:
+        value = lowered.get(name.lower())
+        if value is None:
+            continue
+        try:
+            return float(str(value).split(",")[0].strip())
+        except ValueError:
+            continue
+    return None
+
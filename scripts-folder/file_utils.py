@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+File Utils Module
+
+File helpers shared by the build stages of the Casino Website Generator.
+
+- Atomic writes: data goes to a temporary file in the target folder and is
+  renamed into place, so an interrupted build never leaves a half-written
+  image, page or cache entry behind
+- Streaming SHA-256 of files, used for content-addressed caches and
+  incremental build checks
+"""
+
+import os
+import hashlib
+import tempfile
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Write bytes to a temporary file and rename it into place.
+
+    Args:
+        path (str): Destination file; missing parent folders are created
+        data (bytes): File content
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def hash_file(path: str) -> str:
+    """
+    Get the SHA-256 hex digest of a file.
+
+    Args:
+        path (str): File to hash
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
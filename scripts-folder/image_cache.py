@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Image Cache Module
+
+Local cache of downloaded images shared by every build of the Casino Website
+Generator, so sites asking for the same "casino" or "roulette" photos only
+download them once.
+
+- Entries are keyed by (query, parameters, remote ID)
+- Image bytes are stored once per content hash (objects/<sha[:2]>/<sha>)
+- A SQLite index holds entry metadata, cached search results and access
+  times; least-recently-used objects are evicted to stay under a disk budget
+"""
+
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from typing import List, Dict, Optional, Any
+
+from file_utils import hash_file
+
+
+IMAGE_CACHE_DIR = os.path.join(".build-cache", "images")
+DEFAULT_BUDGET_MB = 2048
+SEARCH_TTL = 7 * 24 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    params TEXT NOT NULL,
+    remote_id TEXT NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES objects(sha256),
+    metadata TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_sha256 ON entries(sha256);
+CREATE INDEX IF NOT EXISTS objects_last_access ON objects(last_access);
+CREATE TABLE IF NOT EXISTS searches (
+    key TEXT PRIMARY KEY,
+    results TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+class ImageCache:
+    """Content-addressed image cache with LRU eviction under a disk budget."""
+
+    def __init__(self, cache_dir: Optional[str] = None, budget_bytes: Optional[int] = None):
+        if cache_dir is None:
+            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            cache_dir = os.path.join(current_dir, IMAGE_CACHE_DIR)
+        if budget_bytes is None:
+            budget_bytes = int(os.environ.get("IMAGE_CACHE_BUDGET_MB", DEFAULT_BUDGET_MB)) * 1024 * 1024
+
+        self.cache_dir = cache_dir
+        self.budget_bytes = budget_bytes
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    @staticmethod
+    def make_key(query: str, params: Dict[str, Any], remote_id: str) -> str:
+        """
+        Build the cache key for a remote image.
+
+        Args:
+            query (str): Search query (case and surrounding whitespace ignored)
+            params (dict): Request parameters that change the bytes (size, format, ...)
+            remote_id (str): Provider's image ID
+
+        Returns:
+            str: Stable key
+        """
+        normalised = json.dumps([query.strip().lower(), params, remote_id], sort_keys=True)
+        return hashlib.sha256(normalised.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached image and mark it as recently used.
+
+        Args:
+            key (str): Key from make_key()
+
+        Returns:
+            str or None: Path of the cached object
+        """
+        with self._lock:
+            row = self._db.execute("SELECT sha256 FROM entries WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return None
+            path = self._object_path(row[0])
+            if not os.path.exists(path):
+                self._forget_object(row[0])
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE objects SET last_access = ? WHERE sha256 = ?", (time.time(), row[0]))
+            self._db.commit()
+            return path
+
+    def put(self, key: str, source_path: str, query: str, params: Dict[str, Any],
+            remote_id: str, metadata: Optional[Dict[str, Any]] = None,
+            sha256: Optional[str] = None) -> str:
+        """
+        Add a downloaded file to the cache and evict if over budget.
+
+        Args:
+            key (str): Key from make_key()
+            source_path (str): Downloaded file (left in place)
+            query (str): Search query
+            params (dict): Request parameters
+            remote_id (str): Provider's image ID
+            metadata (dict): Extra metadata stored with the entry (credits, ...)
+            sha256 (str): Content hash if the caller already computed it
+
+        Returns:
+            str: Path of the cached object
+        """
+        sha256 = sha256 or hash_file(source_path)
+        object_path = self._object_path(sha256)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(object_path), prefix=".tmp-")
+            os.close(fd)
+            try:
+                shutil.copyfile(source_path, temp_path)
+                os.replace(temp_path, object_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO objects (sha256, size, last_access) VALUES (?, ?, ?) "
+                "ON CONFLICT(sha256) DO UPDATE SET last_access = excluded.last_access",
+                (sha256, os.path.getsize(object_path), now))
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, query, params, remote_id, sha256, metadata, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, query, json.dumps(params, sort_keys=True), remote_id, sha256,
+                 json.dumps(metadata or {}), now))
+            self._db.commit()
+            self._evict_locked(keep=sha256)
+        return object_path
+
+    def materialise(self, key: str, dest_path: str) -> bool:
+        """
+        Place a cached image at dest_path (hardlink, falling back to copy).
+
+        Args:
+            key (str): Key from make_key()
+            dest_path (str): Destination file
+
+        Returns:
+            bool: True on cache hit
+        """
+        object_path = self.get(key)
+        if not object_path:
+            return False
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        try:
+            os.link(object_path, dest_path)
+        except OSError:
+            shutil.copyfile(object_path, dest_path)
+        return True
+
+    def get_search(self, query: str, params: Dict[str, Any], ttl: int = SEARCH_TTL) -> Optional[List[Dict]]:
+        """Get cached search results if younger than ttl seconds."""
+        key = self.make_key(query, params, "search")
+        with self._lock:
+            row = self._db.execute("SELECT results, fetched_at FROM searches WHERE key = ?", (key,)).fetchone()
+        if row and time.time() - row[1] < ttl:
+            return json.loads(row[0])
+        return None
+
+    def put_search(self, query: str, params: Dict[str, Any], results: List[Dict]) -> None:
+        """Cache search results."""
+        key = self.make_key(query, params, "search")
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO searches (key, results, fetched_at) VALUES (?, ?, ?)",
+                             (key, json.dumps(results), time.time()))
+            self._db.commit()
+
+    def total_size(self) -> int:
+        """Get the number of bytes held in objects."""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+
+    def evict(self) -> int:
+        """
+        Evict least-recently-used objects until the cache fits its budget.
+
+        Returns:
+            int: Bytes freed
+        """
+        with self._lock:
+            return self._evict_locked()
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._db.close()
+
+    def _evict_locked(self, keep: Optional[str] = None) -> int:
+        """Evict LRU objects; caller holds the lock."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        if total <= self.budget_bytes:
+            return 0
+
+        freed = 0
+        rows = self._db.execute("SELECT sha256, size FROM objects ORDER BY last_access ASC").fetchall()
+        for sha256, size in rows:
+            if total - freed <= self.budget_bytes:
+                break
+            if sha256 == keep:
+                continue
+            self._forget_object(sha256)
+            freed += size
+        self._db.commit()
+        return freed
+
+    def _forget_object(self, sha256: str) -> None:
+        """Delete an object and every entry pointing at it; caller holds the lock."""
+        path = self._object_path(sha256)
+        if os.path.exists(path):
+            os.remove(path)
+        self._db.execute("DELETE FROM entries WHERE sha256 = ?", (sha256,))
+        self._db.execute("DELETE FROM objects WHERE sha256 = ?", (sha256,))
+
+    def _object_path(self, sha256: str) -> str:
+        """Get the path of a stored object."""
+        return os.path.join(self.cache_dir, "objects", sha256[:2], sha256)
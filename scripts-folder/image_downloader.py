@@ -7,9 +7,444 @@ This includes downloading from Unsplash API and generating images with OpenAI AP
 """
 
 import os
-import requests
+import re
 import json
-from typing import List, Dict, Optional
+import time
+import random
+import shutil
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Any
+
+from image_cache import ImageCache
+from ai_generator import GenerationQueue, OpenAIBackend, create_backend
+from fetch_scheduler import FetchScheduler, TokenBucket, plan_fetch_jobs, orientation_for_size
+from img_processor import create_casino_image_manifest
+from image_planner import fill_missing_images, plan_image_tasks
+from stock_packs import get_stock_source, list_packs, update_pack, install_pack
+from file_utils import hash_file
+
+
+UNSPLASH_API_URL = "https://api.unsplash.com"
+DEFAULT_DOWNLOAD_WORKERS = 8
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 0.5  # seconds, doubled per attempt before jitter
+MAX_BACKOFF = 30
+REQUEST_TIMEOUT = 30
+CHUNK_SIZE = 64 * 1024
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class UnsplashDownloader:
+    """
+    Pooled, concurrent Unsplash client.
+    
+    One keep-alive requests.Session is shared by a bounded thread pool.
+    Failed requests are retried with jittered exponential backoff, honouring
+    Retry-After on 429/503 responses. With an ImageCache, search results and
+    photos already fetched by an earlier build are served locally. With a
+    TokenBucket, API calls are paced by the server's rate-limit headers and
+    RateLimitExhausted is raised instead of hammering an empty quota.
+    """
+    
+    def __init__(self, access_key: str, api_url: Optional[str] = None,
+                 workers: int = DEFAULT_DOWNLOAD_WORKERS, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, session: Optional[requests.Session] = None,
+                 cache: Optional[ImageCache] = None, rate_limiter: Optional[TokenBucket] = None):
+        self.access_key = access_key
+        self.api_url = (api_url or os.environ.get("UNSPLASH_API_URL") or UNSPLASH_API_URL).rstrip('/')
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.session = session or self._create_session(workers)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.stats = {'downloaded': 0, 'cache_hits': 0}
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._credits_lock = threading.Lock()
+    
+    def search(self, query: str, count: int = 10, orientation: Optional[str] = None) -> List[Dict]:
+        """
+        Search photos, paging until `count` results are collected.
+        
+        Args:
+            query (str): Search query
+            count (int): Number of photos wanted
+            orientation (str): Optional "landscape", "portrait" or "squarish"
+            
+        Returns:
+            list: Photo metadata dicts from the API
+        """
+        search_params = {"count": count, "orientation": orientation}
+        if self.cache:
+            cached = self.cache.get_search(query, search_params)
+            if cached is not None:
+                return cached
+        
+        photos = []
+        page = 1
+        while len(photos) < count:
+            params = {"query": query, "per_page": min(30, count - len(photos)), "page": page}
+            if orientation:
+                params["orientation"] = orientation
+            response = self._request("GET", f"{self.api_url}/search/photos", params=params)
+            results = response.json().get("results", [])
+            if not results:
+                break
+            photos.extend(results)
+            page += 1
+        
+        photos = photos[:count]
+        if self.cache:
+            self.cache.put_search(query, search_params, photos)
+        return photos
+    
+    def download_photo(self, photo: Dict, dest_dir: str, size: str = "regular",
+                       prefix: str = "", file_name: Optional[str] = None) -> Optional[Dict]:
+        """
+        Download one photo and register the download with Unsplash.
+        
+        Args:
+            photo (dict): Photo metadata from search()
+            dest_dir (str): Directory to save into
+            size (str): Key of photo["urls"] ("raw", "full", "regular", "small")
+            prefix (str): File name prefix (usually the search query slug)
+            file_name (str): Fixed file name instead of <prefix>-<id>.jpg
+            
+        Returns:
+            dict or None: Download record, or None if the download failed
+        """
+        image_url = photo.get("urls", {}).get(size)
+        if not image_url:
+            return None
+        
+        if not file_name:
+            file_name = f"{prefix}-{photo['id']}.jpg" if prefix else f"{photo['id']}.jpg"
+        dest_path = os.path.join(dest_dir, file_name)
+        cache_params = {"size": size}
+        cache_key = ImageCache.make_key(prefix, cache_params, photo["id"]) if self.cache else None
+        
+        try:
+            if os.path.exists(dest_path):
+                pass
+            elif self.cache and self.cache.materialise(cache_key, dest_path):
+                self._count('cache_hits')
+            else:
+                sha256 = self.stream_download(image_url, dest_path)
+                
+                # API guidelines: trigger the download endpoint for each use
+                download_location = photo.get("links", {}).get("download_location")
+                if download_location:
+                    self._request("GET", download_location)
+                
+                self._count('downloaded')
+                if self.cache:
+                    self.cache.put(cache_key, dest_path, prefix, cache_params, photo["id"], sha256=sha256)
+        except (requests.RequestException, ValueError) as e:
+            print(f"  ❌ {file_name}: {e}")
+            return None
+        
+        user = photo.get("user", {})
+        return {
+            "id": photo["id"],
+            "file": file_name,
+            "description": photo.get("alt_description") or photo.get("description") or "",
+            "photographer": user.get("name", ""),
+            "photographer_url": user.get("links", {}).get("html", ""),
+            "source_url": photo.get("links", {}).get("html", "")
+        }
+    
+    def stream_download(self, url: str, dest_path: str, expected_size: Optional[int] = None,
+                        expected_sha256: Optional[str] = None, authenticated: bool = False) -> str:
+        """
+        Stream a file to disk in chunks, resuming after dropped connections.
+        
+        Data goes to <dest_path>.part; a leftover .part from an earlier run is
+        resumed with a Range request guarded by If-Range, using the validator
+        (strong ETag or Last-Modified) saved in <dest_path>.part.etag, so a
+        file that changed on the server is fetched again in full. A .part
+        without a validator is discarded. The finished file is checked against the
+        expected (or Content-Length / Content-Range) size and hash, then
+        renamed into place, so memory use is flat and dest_path is either
+        absent or complete.
+        
+        Args:
+            url (str): File URL
+            dest_path (str): Final file path
+            expected_size (int): Optional size in bytes to verify
+            expected_sha256 (str): Optional SHA-256 hex digest to verify
+            authenticated (bool): Send the API key (only for API endpoints)
+            
+        Returns:
+            str: SHA-256 hex digest of the downloaded file
+        """
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        temp_path = f"{dest_path}.part"
+        validator_path = f"{temp_path}.etag"
+        validator = _read_validator(validator_path)
+        if validator is None and os.path.exists(temp_path):
+            # Nothing to prove the partial file still matches the remote one
+            os.remove(temp_path)
+        
+        for attempt in range(self.retries + 1):
+            offset = os.path.getsize(temp_path) if os.path.exists(temp_path) else 0
+            headers = {}
+            if offset and validator:
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = validator
+            elif offset:
+                os.remove(temp_path)
+                offset = 0
+            
+            try:
+                response = self._request("GET", url, authenticated=authenticated, headers=headers, stream=True)
+            except requests.HTTPError as e:
+                if offset and e.response is not None and e.response.status_code == 416:
+                    # Stale or oversized partial file - start again from zero
+                    os.remove(temp_path)
+                    continue
+                raise
+            
+            with response:
+                if response.status_code == 206:
+                    total_size = _content_range_total(response)
+                else:
+                    # Full response: the server ignored the range or the file changed
+                    offset = 0
+                    length = response.headers.get("Content-Length")
+                    total_size = int(length) if length and length.isdigit() else None
+                    validator = _response_validator(response)
+                    _write_validator(validator_path, validator)
+                
+                try:
+                    with open(temp_path, 'ab' if offset else 'wb') as f:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            f.write(chunk)
+                except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError, requests.Timeout):
+                    if attempt == self.retries:
+                        raise
+                    time.sleep(random.uniform(0, min(MAX_BACKOFF, self.backoff * (2 ** attempt))))
+                    continue
+            
+            size = os.path.getsize(temp_path)
+            expected = expected_size or total_size
+            if expected is not None and size < expected:
+                # Connection closed early without an error - resume
+                continue
+            
+            sha256 = hash_file(temp_path)
+            if (expected is not None and size != expected) or (expected_sha256 and sha256 != expected_sha256):
+                _remove_files(temp_path, validator_path)
+                raise ValueError(f"Integrity check failed for {url}: got {size} bytes, sha256 {sha256[:12]}")
+            
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, dest_path)
+            _remove_files(validator_path)
+            return sha256
+        
+        raise requests.RequestException(f"Download incomplete after {self.retries + 1} attempts: {url}")
+    
+    def download_query(self, query: str, count: int, dest_dir: str, size: str = "regular") -> List[Dict]:
+        """
+        Search one query and download its photos in parallel.
+        
+        Args:
+            query (str): Search query
+            count (int): Number of photos
+            dest_dir (str): Directory to save into
+            size (str): Photo size key
+            
+        Returns:
+            list: Download records
+        """
+        photos = self.search(query, count)
+        jobs = [self._pool.submit(self.download_photo, photo, dest_dir, size, _slugify(query)) for photo in photos]
+        records = [record for record in (job.result() for job in jobs) if record]
+        self._write_credits(dest_dir, records)
+        return records
+    
+    def run_fetch_job(self, job: Dict[str, Any], images_dir: str, size: str = "regular") -> List[Dict]:
+        """
+        Run one job from plan_fetch_jobs().
+        
+        Manifest jobs fetch a single photo saved as <category>/<name>.jpg and
+        are skipped when the category already has a <name>.* file; category
+        jobs download `count` photos for their search tag.
+        
+        Args:
+            job (dict): Fetch job
+            images_dir (str): static/images directory
+            size (str): Photo size key
+            
+        Returns:
+            list: Download records
+        """
+        dest_dir = os.path.join(images_dir, job['category'])
+        if job['kind'] != "manifest":
+            return self.download_query(job['query'], job['count'], dest_dir, size)
+        
+        if os.path.isdir(dest_dir) and any(os.path.splitext(name)[0] == job['name'] for name in os.listdir(dest_dir)):
+            return []
+        photos = self.search(job['query'], 1, job.get('orientation'))
+        records = [self.download_photo(photo, dest_dir, size, file_name=f"{job['name']}.jpg") for photo in photos]
+        records = [record for record in records if record]
+        self._write_credits(dest_dir, records)
+        return records
+    
+    def fetch_manifest_image(self, task: Dict[str, Any], staging_dir: str) -> Optional[str]:
+        """
+        Fetcher for image_planner.fill_missing_images().
+        
+        Searches the task's description with an orientation matching its
+        target size, downloads a size large enough to crop from and records
+        the credit under the image's final file name.
+        
+        Args:
+            task (dict): Planner task
+            staging_dir (str): Directory to download into
+            
+        Returns:
+            str or None: Downloaded file path, or None if nothing was found
+        """
+        photos = self.search(task['description'], 1, orientation_for_size(task['width'], task['height']))
+        if not photos:
+            return None
+        size = "full" if task['width'] > 1080 or task['height'] > 1080 else "regular"
+        record = self.download_photo(photos[0], staging_dir, size, file_name=f"{task['category']}-{task['name']}.jpg")
+        if not record:
+            return None
+        self._write_credits(os.path.dirname(task['dest']), [dict(record, file=os.path.basename(task['dest']))])
+        return os.path.join(staging_dir, record['file'])
+    
+    def download_category(self, category: str, queries: List[str], per_query: int,
+                          images_dir: str, size: str = "regular") -> List[Dict]:
+        """
+        Search all queries of a category, then download every hit in parallel.
+        
+        Args:
+            category (str): Category folder name (e.g. "hero")
+            queries (list): Search queries for the category
+            per_query (int): Photos per query
+            images_dir (str): static/images directory
+            size (str): Photo size key
+            
+        Returns:
+            list: Download records for the category
+        """
+        dest_dir = os.path.join(images_dir, category)
+        
+        searches = {query: self._pool.submit(self.search, query, per_query) for query in queries}
+        jobs = []
+        seen_ids = set()
+        for query, future in searches.items():
+            try:
+                photos = future.result()
+            except requests.RequestException as e:
+                print(f"  ❌ Search '{query}' failed: {e}")
+                continue
+            for photo in photos:
+                if photo["id"] not in seen_ids:
+                    seen_ids.add(photo["id"])
+                    jobs.append(self._pool.submit(self.download_photo, photo, dest_dir, size, _slugify(query)))
+        
+        records = [record for record in (job.result() for job in jobs) if record]
+        self._write_credits(dest_dir, records)
+        return records
+    
+    def download_categories(self, categories: Dict[str, List[str]], per_query: int,
+                            images_dir: str, size: str = "regular") -> Dict[str, List[Dict]]:
+        """
+        Download every category, running the categories concurrently.
+        
+        Args:
+            categories (dict): Category mapped to search queries
+            per_query (int): Photos per query
+            images_dir (str): static/images directory
+            size (str): Photo size key
+            
+        Returns:
+            dict: Category mapped to its download records
+        """
+        with ThreadPoolExecutor(max_workers=max(1, len(categories))) as category_pool:
+            futures = {
+                category: category_pool.submit(self.download_category, category, queries, per_query, images_dir, size)
+                for category, queries in categories.items()
+            }
+            return {category: future.result() for category, future in futures.items()}
+    
+    def close(self) -> None:
+        """Shut down the worker pool and the pooled session."""
+        self._pool.shutdown(wait=True)
+        self.session.close()
+    
+    def _count(self, stat: str) -> None:
+        """Increment a download statistic from a worker thread."""
+        with self._credits_lock:
+            self.stats[stat] += 1
+    
+    def _create_session(self, pool_size: int) -> requests.Session:
+        """Create a keep-alive session sized for the worker pool."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Accept-Version"] = "v1"
+        return session
+    
+    def _request(self, method: str, url: str, authenticated: bool = True, **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures with jittered backoff."""
+        headers = kwargs.pop("headers", {})
+        if authenticated:
+            headers["Authorization"] = f"Client-ID {self.access_key}"
+        
+        for attempt in range(self.retries + 1):
+            limited = authenticated and self.rate_limiter is not None
+            if limited:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, headers=headers, timeout=REQUEST_TIMEOUT, **kwargs)
+                if limited:
+                    self.rate_limiter.update_from_headers(response.headers, exhausted=response.status_code == 429)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response
+                # Release the pooled connection of a response that is not used
+                delay = _retry_after(response)
+                response.close()
+                if limited and response.status_code == 429:
+                    # The bucket now waits for the quota to reset
+                    continue
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                delay = None
+            
+            if delay is None:
+                # Full jitter: uniform in [0, backoff * 2^attempt]
+                delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * (2 ** attempt)))
+            time.sleep(delay)
+        
+        raise requests.RequestException(f"Retries exhausted for {url}")
+    
+    def _write_credits(self, dest_dir: str, records: List[Dict]) -> None:
+        """Record photographer credits for license compliance."""
+        if not records:
+            return
+        credits_file = os.path.join(dest_dir, "credits.json")
+        with self._credits_lock:
+            credits = {}
+            if os.path.exists(credits_file):
+                try:
+                    with open(credits_file, 'r', encoding='utf-8') as f:
+                        credits = json.load(f)
+                except (OSError, ValueError):
+                    credits = {}
+            for record in records:
+                credits[record["file"]] = record
+            with open(credits_file, 'w', encoding='utf-8') as f:
+                json.dump(credits, f, indent=2)
 
 
 def download_images():
@@ -27,14 +462,15 @@ def download_images():
     print("2. Generate with AI")
     print("3. Download Casino Stock Images")
     print("4. Process Existing Images")
+    print("5. Fill Missing Manifest Images")
     
     while True:
         try:
-            choice = int(input("\nYour choice (1-4): "))
-            if 1 <= choice <= 4:
+            choice = int(input("\nYour choice (1-5): "))
+            if 1 <= choice <= 5:
                 break
             else:
-                print("Please enter a number between 1 and 4.")
+                print("Please enter a number between 1 and 5.")
         except ValueError:
             print("Please enter a valid number.")
     
@@ -46,47 +482,141 @@ def download_images():
         download_casino_stock_images()
     elif choice == 4:
         process_existing_images()
+    elif choice == 5:
+        fill_manifest_images()
+
+
+def fill_manifest_images():
+    """
+    Fetch and resize only the manifest images the site is still missing.
+    
+    Images that are present, large enough and in an accepted format are left
+    alone, so a mostly complete site finishes almost immediately. Without
+    UNSPLASH_ACCESS_KEY, missing images are reported but not fetched.
+    """
+    access_key = os.environ.get("UNSPLASH_ACCESS_KEY")
+    if not access_key:
+        print("⚠️  UNSPLASH_ACCESS_KEY is not set - missing images will only be reported.")
+        fill_missing_images()
+        return
+    
+    cache = ImageCache()
+    downloader = UnsplashDownloader(access_key, cache=cache, rate_limiter=TokenBucket())
+    try:
+        fill_missing_images(fetcher=downloader.fetch_manifest_image)
+    finally:
+        downloader.close()
+        cache.close()
 
 
 def download_from_unsplash():
     """
     Download images from Unsplash API using casino-related search tags.
     
-    Planned search tags:
-    - casino
-    - poker
-    - roulette
-    - slot machine
-    - gambling
-    - chips
-    - cards
-    - jackpot
+    Required images from create_casino_image_manifest() are fetched first,
+    then optional ones, then photos for the get_image_categories() tags; each
+    category is saved to web-folder/static/images/<category>/. Requests are
+    paced by the API's rate-limit headers and work left when the quota runs
+    out is queued for the next run. Requires the UNSPLASH_ACCESS_KEY
+    environment variable.
+    
+    Search tags per category, for example:
+    - header: casino logo, luxury casino background, ...
+    - hero: casino banner, jackpot winner, ...
+    - games: poker cards, roulette wheel, slot machine, ...
     """
-    print("Unsplash image download feature is not yet implemented.")
-    print("Planned features:")
-    print("- Search by casino-related tags")
-    print("- Download high-quality images")
-    print("- Automatic image categorization")
-    print("- License compliance checking")
+    access_key = os.environ.get("UNSPLASH_ACCESS_KEY")
+    if not access_key:
+        print("❌ UNSPLASH_ACCESS_KEY is not set.")
+        print("Create an access key at https://unsplash.com/developers and export it:")
+        print("  export UNSPLASH_ACCESS_KEY=your_key")
+        return
+    
+    while True:
+        answer = input("\nImages per search tag (1-30, default=2): ").strip()
+        if answer == "":
+            per_query = 2
+            break
+        try:
+            per_query = int(answer)
+            if 1 <= per_query <= 30:
+                break
+            print("Please enter a number between 1 and 30.")
+        except ValueError:
+            print("Please enter a valid number.")
+    
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    images_dir = os.path.join(current_dir, "web-folder", "static", "images")
+    categories = get_image_categories()
+    
+    jobs = plan_fetch_jobs(create_casino_image_manifest(), categories, per_query)
+    
+    print(f"\nFetching manifest images and {per_query} image(s) per tag for {len(categories)} categories...")
+    started = time.monotonic()
+    cache = ImageCache()
+    downloader = UnsplashDownloader(access_key, cache=cache, rate_limiter=TokenBucket())
+    scheduler = FetchScheduler(lambda job: downloader.run_fetch_job(job, images_dir))
+    try:
+        summary = scheduler.run(jobs)
+    finally:
+        downloader.close()
+        cache.close()
+    
+    for job in summary['failed']:
+        print(f"  ❌ {job['category']}/{job.get('name', job['query'])}: {job['error']}")
+    print(f"\n🎉 Completed {len(summary['completed'])} fetch job(s) in {time.monotonic() - started:.1f}s to {images_dir}")
+    print(f"♻️  From cache: {downloader.stats['cache_hits']}, fetched: {downloader.stats['downloaded']}")
+    if summary['deferred']:
+        print(f"⏳ Rate limit reached: {len(summary['deferred'])} job(s) queued for the next run "
+              f"(quota resets in ~{summary['retry_in'] / 60:.0f} min)")
 
 
 def generate_with_ai():
     """
     Generate images using OpenAI API for custom casino graphics.
     
-    Planned generation types:
+    Generation types (see get_ai_generation_prompts()):
     - Logo designs
     - Casino banners
     - Promotional graphics
     - Game icons
     - Background patterns
+    
+    Requests go through a GenerationQueue, so prompts already generated for
+    another site are copied from the cache instead of calling the API again.
+    Set AI_IMAGE_BACKEND=mock to generate placeholders offline.
     """
-    print("AI image generation feature is not yet implemented.")
-    print("Planned features:")
-    print("- Custom logo generation")
-    print("- Casino-themed banners")
-    print("- Promotional graphics")
-    print("- Game category icons")
+    backend = create_backend()
+    if backend is None:
+        print("❌ OPENAI_API_KEY is not set.")
+        print("Export an API key, or set AI_IMAGE_BACKEND=mock for offline placeholders:")
+        print("  export OPENAI_API_KEY=your_key")
+        return
+    
+    theme = input("\nVisual theme (default=luxury black and gold): ").strip() or "luxury black and gold"
+    
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    images_dir = os.path.join(current_dir, "web-folder", "static", "images")
+    prompts = get_ai_generation_prompts()
+    
+    print(f"\nGenerating {len(prompts)} image(s) with {backend.name}...")
+    queue = GenerationQueue(backend)
+    try:
+        futures = {
+            target: queue.submit(spec["prompt"].format(theme=theme), spec["size"])
+            for target, spec in prompts.items()
+        }
+        for target, future in futures.items():
+            try:
+                _place_file(future.result(), os.path.join(images_dir, f"{target}.png"))
+                print(f"  ✅ {target}.png")
+            except (requests.RequestException, OSError, ValueError) as e:
+                print(f"  ❌ {target}: {e}")
+    finally:
+        queue.close()
+    
+    print(f"\n♻️  From cache: {queue.stats['cache_hits']}, generated: {queue.stats['generated']}, "
+          f"merged duplicates: {queue.stats['deduplicated']}")
 
 
 def download_casino_stock_images():
@@ -99,14 +629,38 @@ def download_casino_stock_images():
     - Game thumbnails
     - Promotional banners
     - Footer decorations
+    
+    Each category is a versioned stock pack (see stock_packs.py) read from
+    STOCK_PACK_SOURCE (a directory or http(s) mirror, default
+    master/stock-packs). Packs are updated by transferring only changed
+    entries into the local store, then hardlinked into static/images.
     """
-    print("Casino stock image download feature is not yet implemented.")
-    print("Planned categories:")
-    print("- Header backgrounds")
-    print("- Hero banners") 
-    print("- Game thumbnails")
-    print("- Promotional banners")
-    print("- Footer decorations")
+    source = get_stock_source()
+    try:
+        packs = list_packs(source)
+    except (OSError, ValueError, requests.RequestException) as e:
+        print(f"❌ No stock pack source available at {source}: {e}")
+        print("Set STOCK_PACK_SOURCE to a pack directory or mirror URL, or publish packs with:")
+        print("  python main_controller.py stock-pack <name> <version> <images_dir>")
+        return
+    
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    images_dir = os.path.join(current_dir, "web-folder", "static", "images")
+    
+    print(f"Updating {len(packs)} stock pack(s) from {source}...")
+    for name in sorted(packs):
+        try:
+            update = update_pack(name, source)
+            install = install_pack(name, images_dir)
+        except (OSError, ValueError, KeyError, requests.RequestException) as e:
+            print(f"  ❌ {name}: {e}")
+            continue
+        
+        version = update['version']
+        if update['previous_version'] and update['previous_version'] != version:
+            version = f"{update['previous_version']} → {version}"
+        print(f"  ✅ {name} {version}: {update['transferred']} transferred ({update['bytes']} bytes), "
+              f"{update['reused']} reused, {install['linked']} linked, {install['removed']} removed")
 
 
 def process_existing_images():
@@ -198,10 +752,54 @@ def get_image_categories() -> Dict[str, List[str]]:
     }
 
 
+def get_ai_generation_prompts() -> Dict[str, Dict[str, str]]:
+    """
+    Get AI generation prompts for casino websites.
+    
+    Prompts contain a {theme} placeholder; sizes are ones the OpenAI
+    Images API accepts.
+    
+    Returns:
+        dict: "<category>/<name>" mapped to {'prompt', 'size'}
+    """
+    return {
+        "header/logo": {
+            "prompt": "Minimal flat casino logo emblem with playing card suits, {theme}, plain background",
+            "size": "1024x1024"
+        },
+        "hero/main_banner": {
+            "prompt": "Wide cinematic casino interior banner with roulette and slot machines, {theme}",
+            "size": "1792x1024"
+        },
+        "promotions/bonus": {
+            "prompt": "Promotional graphic of golden coins and casino chips bursting from a gift box, {theme}",
+            "size": "1792x1024"
+        },
+        "games/poker": {
+            "prompt": "Game icon of a poker hand and chips, {theme}",
+            "size": "1024x1024"
+        },
+        "games/roulette": {
+            "prompt": "Game icon of a roulette wheel viewed from above, {theme}",
+            "size": "1024x1024"
+        },
+        "games/slots": {
+            "prompt": "Game icon of a slot machine showing three sevens, {theme}",
+            "size": "1024x1024"
+        },
+        "backgrounds/pattern": {
+            "prompt": "Seamless subtle background pattern of card suits, {theme}",
+            "size": "1024x1024"
+        }
+    }
+
+
 def setup_image_directories():
     """
     Setup image directory structure in web-folder/static/images/
     
+    Only directories that do not exist yet are created (and reported).
+    
     Creates:
     - images/header/
     - images/hero/
@@ -225,43 +823,35 @@ def setup_image_directories():
         "thumbnails"
     ]
     
+    existing = set()
+    if os.path.isdir(base_images_dir):
+        with os.scandir(base_images_dir) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
+    
     for category in categories:
-        category_dir = os.path.join(base_images_dir, category)
-        os.makedirs(category_dir, exist_ok=True)
-        print(f"Created directory: {category_dir}")
+        if category not in existing:
+            category_dir = os.path.join(base_images_dir, category)
+            os.makedirs(category_dir, exist_ok=True)
+            print(f"Created directory: {category_dir}")
 
 
 def validate_image_requirements() -> bool:
     """
     Validate that all required images are present for website generation.
     
+    Required images come from create_casino_image_manifest(); images that
+    exist but are undersized or in the wrong format count as missing.
+    
     Returns:
         bool: True if all required images are present
     """
     current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     images_dir = os.path.join(current_dir, "web-folder", "static", "images")
     
-    required_images = {
-        "header": ["logo.png", "background.jpg"],
-        "hero": ["banner.jpg", "casino-hero.jpg"],
-        "games": ["poker.jpg", "roulette.jpg", "slots.jpg"],
-        "promotions": ["bonus.jpg", "jackpot.jpg"],
-        "footer": ["pattern.png"],
-        "icons": ["favicon.ico", "apple-touch-icon.png"]
-    }
-    
-    missing_images = []
-    
-    for category, images in required_images.items():
-        category_dir = os.path.join(images_dir, category)
-        if not os.path.exists(category_dir):
-            missing_images.append(f"Directory missing: {category}")
-            continue
-            
-        for image in images:
-            image_path = os.path.join(category_dir, image)
-            if not os.path.exists(image_path):
-                missing_images.append(f"{category}/{image}")
+    missing_images = [
+        f"{task['key']} ({task['reason']})"
+        for task in plan_image_tasks(images_dir) if task['required']
+    ]
     
     if missing_images:
         print("Missing required images:")
@@ -273,38 +863,71 @@ def validate_image_requirements() -> bool:
     return True
 
 
-# Placeholder functions for future API integrations
+# API integration helpers
 
-def _download_from_unsplash_api(query: str, count: int = 10) -> List[Dict]:
+def _download_from_unsplash_api(query: str, count: int = 10, dest_dir: Optional[str] = None,
+                                downloader: Optional[UnsplashDownloader] = None) -> List[Dict]:
     """
-    Download images from Unsplash API (placeholder).
+    Download images for a single query from Unsplash API.
     
     Args:
         query (str): Search query
         count (int): Number of images to download
+        dest_dir (str): Directory to save into (defaults to static/images/<query>)
+        downloader (UnsplashDownloader): Optional shared downloader
         
     Returns:
         list: List of downloaded image metadata
     """
-    # Placeholder for Unsplash API integration
-    # Will require API key and requests implementation
-    pass
+    if dest_dir is None:
+        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        dest_dir = os.path.join(current_dir, "web-folder", "static", "images", _slugify(query))
+    
+    own_downloader = downloader is None
+    if own_downloader:
+        access_key = os.environ.get("UNSPLASH_ACCESS_KEY")
+        if not access_key:
+            print("❌ UNSPLASH_ACCESS_KEY is not set.")
+            return []
+        downloader = UnsplashDownloader(access_key, cache=ImageCache())
+    
+    try:
+        return downloader.download_query(query, count, dest_dir)
+    finally:
+        if own_downloader:
+            downloader.close()
+            downloader.cache.close()
 
 
-def _generate_with_openai_api(prompt: str, size: str = "1024x1024") -> Optional[str]:
+def _generate_with_openai_api(prompt: str, size: str = "1024x1024",
+                              queue: Optional[GenerationQueue] = None) -> Optional[str]:
     """
-    Generate image using OpenAI API (placeholder).
+    Generate image using OpenAI API.
     
     Args:
         prompt (str): Image generation prompt
         size (str): Image size (e.g., "1024x1024")
+        queue (GenerationQueue): Optional shared queue (defaults to an OpenAI-backed one)
         
     Returns:
-        str or None: Generated image URL or None if failed
+        str or None: Path of the generated (cached) PNG or None if failed
     """
-    # Placeholder for OpenAI API integration
-    # Will require API key and OpenAI client
-    pass
+    own_queue = queue is None
+    if own_queue:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            print("❌ OPENAI_API_KEY is not set.")
+            return None
+        queue = GenerationQueue(OpenAIBackend(api_key))
+    
+    try:
+        return queue.generate(prompt, size)
+    except (requests.RequestException, KeyError, ValueError) as e:
+        print(f"❌ Image generation failed: {e}")
+        return None
+    finally:
+        if own_queue:
+            queue.close()
 
 
 def _optimize_image(image_path: str, quality: int = 85) -> bool:
@@ -320,4 +943,70 @@ def _optimize_image(image_path: str, quality: int = 85) -> bool:
     """
     # Placeholder for image optimization
     # Will require PIL/Pillow or similar library
-    pass 
\ No newline at end of file
+    pass
+
+
+def _place_file(source_path: str, dest_path: str) -> None:
+    """Hardlink a cached file into the site, copying across filesystems."""
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    if os.path.exists(dest_path):
+        os.remove(dest_path)
+    try:
+        os.link(source_path, dest_path)
+    except OSError:
+        shutil.copyfile(source_path, dest_path)
+
+
+def _slugify(text: str) -> str:
+    """Turn a search query into a file-name-safe slug."""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def _content_range_total(response: requests.Response) -> Optional[int]:
+    """Get the full file size from a 206 response's Content-Range header."""
+    match = re.match(r'bytes \d+-\d+/(\d+)', response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+def _response_validator(response: requests.Response) -> Optional[str]:
+    """Strong ETag or Last-Modified of a response, usable in If-Range."""
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+def _read_validator(path: str) -> Optional[str]:
+    """Read the If-Range validator saved next to a partial download."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_validator(path: str, validator: Optional[str]) -> None:
+    """Save (or, without one, remove) the If-Range validator of a partial download."""
+    if validator:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(validator)
+    else:
+        _remove_files(path)
+
+
+def _remove_files(*paths: str) -> None:
+    """Remove files that may not exist."""
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Get the Retry-After delay in seconds, if the server sent one."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return min(MAX_BACKOFF, max(0.0, float(value)))
+    except ValueError:
+        return None
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Image Metadata Module
+
+Header-only metadata index for the image trees of the Casino Website
+Generator.
+
+PNG, JPEG, WebP, GIF and SVG files are identified from their headers alone:
+dimensions, format, colour mode, alpha, animation and (for JPEG) progressive
+encoding are read without decoding pixels. Each entry also records the
+content hash and a dominant colour, computed from a reduced decode (JPEG
+draft mode) or, for SVG, from the fill colours used.
+
+The index is kept in .build-cache/image-index/ (outside the site, so it is
+never shipped) and refreshed incrementally: only files whose size or mtime
+changed are read again. Image tools query it instead of opening images.
+"""
+
+import os
+import re
+import json
+import struct
+import hashlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any, Iterable
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for dominant colours
+    Image = None
+
+from file_utils import write_atomic, hash_file
+
+
+IMAGE_INDEX_DIR = os.path.join(".build-cache", "image-index")
+INDEX_VERSION = 2
+INDEXED_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.webp', '.gif', '.svg']
+SVG_HEADER_BYTES = 64 * 1024
+DEFAULT_INDEX_WORKERS = 8
+
+PNG_MODES = {0: 'L', 2: 'RGB', 3: 'P', 4: 'LA', 6: 'RGBA'}
+PNG_GREY_DEPTH_MODES = {1: '1', 16: 'I;16'}  # Pillow keeps these greyscale depths
+JPEG_MODES = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+VARIANT_PATTERN = re.compile(r'_\d+w$')  # <name>_<width>w responsive variants
+CONVERTED_FORMATS = ['WEBP', 'AVIF']  # modern-format copies written next to a JPEG/PNG
+
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class ImageIndex:
+    """Incrementally refreshed metadata index for one image tree."""
+
+    def __init__(self, root: str, index_path: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        if index_path is None:
+            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            root_key = hashlib.sha1(self.root.encode('utf-8')).hexdigest()[:16]
+            index_path = os.path.join(current_dir, IMAGE_INDEX_DIR, f"{root_key}.json")
+        self.index_path = index_path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def refresh(self, workers: int = DEFAULT_INDEX_WORKERS) -> Dict[str, int]:
+        """
+        Bring the index up to date with one scandir walk of the tree.
+
+        Args:
+            workers (int): Threads used to read changed files
+
+        Returns:
+            dict: Counts of 'unchanged', 'updated' and 'removed' entries
+        """
+        stats = {'unchanged': 0, 'updated': 0, 'removed': 0}
+        seen = set()
+        stale = []
+
+        for relative_path, stat in _scan_tree(self.root):
+            seen.add(relative_path)
+            entry = self.entries.get(relative_path)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                stats['unchanged'] += 1
+            else:
+                stale.append(relative_path)
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for relative_path, entry in zip(stale, pool.map(self._read, stale)):
+                    if entry:
+                        self.entries[relative_path] = entry
+                        stats['updated'] += 1
+            self._dirty = True
+
+        for relative_path in set(self.entries) - seen:
+            del self.entries[relative_path]
+            stats['removed'] += 1
+            self._dirty = True
+
+        self.save()
+        return stats
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get metadata for a file in the tree, re-reading it if it changed.
+
+        Args:
+            path (str): Absolute path, or path relative to the root
+
+        Returns:
+            dict or None: Metadata, or None if the file is missing or unsupported
+        """
+        relative_path = self._relative(path)
+        if relative_path is None:
+            return None
+        full_path = os.path.join(self.root, *relative_path.split('/'))
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self.entries.get(relative_path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry
+
+        entry = self._read(relative_path)
+        with self._lock:
+            if entry:
+                self.entries[relative_path] = entry
+            else:
+                self.entries.pop(relative_path, None)
+            self._dirty = True
+        return entry
+
+    def query(self, **criteria: Any) -> Dict[str, Dict[str, Any]]:
+        """
+        Find entries whose fields equal the given values, e.g. query(format='PNG', alpha=False).
+
+        Returns:
+            dict: Relative path mapped to metadata
+        """
+        return {
+            path: entry for path, entry in self.entries.items()
+            if all(entry.get(field) == value for field, value in criteria.items())
+        }
+
+    def source_entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the entries that are not image pipeline output: responsive
+        variants and WebP/AVIF copies next to a JPEG or PNG of the same name
+        are left out.
+
+        Returns:
+            dict: Relative path mapped to metadata
+        """
+        original_stems = {os.path.splitext(path)[0] for path, entry in self.entries.items()
+                          if entry['format'] in ('JPEG', 'PNG')}
+        return {
+            path: entry for path, entry in self.entries.items()
+            if not is_responsive_variant(path)
+            and not (entry['format'] in CONVERTED_FORMATS and os.path.splitext(path)[0] in original_stems)
+        }
+
+    def save(self) -> None:
+        """Write the index atomically if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"version": INDEX_VERSION, "root": self.root, "entries": self.entries},
+                              indent=1, sort_keys=True)
+            self._dirty = False
+        write_atomic(self.index_path, data.encode('utf-8'))
+
+    def _read(self, relative_path: str) -> Optional[Dict[str, Any]]:
+        """Read one file's metadata."""
+        full_path = os.path.join(self.root, *relative_path.split('/'))
+        try:
+            stat = os.stat(full_path)
+            metadata = read_image_metadata(full_path)
+        except OSError:
+            return None
+        if metadata is None:
+            return None
+        metadata['size'] = stat.st_size
+        metadata['mtime_ns'] = stat.st_mtime_ns
+        return metadata
+
+    def _relative(self, path: str) -> Optional[str]:
+        """Turn a path into an index key, or None if it is outside the root."""
+        full_path = os.path.abspath(path if os.path.isabs(path) else os.path.join(self.root, path))
+        if os.path.commonpath([full_path, self.root]) != self.root:
+            return None
+        return os.path.relpath(full_path, self.root).replace(os.sep, '/')
+
+    def _load(self) -> None:
+        """Load the index from disk, discarding incompatible versions."""
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION and data.get("root") == self.root:
+            self.entries = data.get("entries", {})
+
+
+_open_indexes: Dict[str, ImageIndex] = {}
+
+
+def load_image_index(root: Optional[str] = None, refresh: bool = True) -> ImageIndex:
+    """
+    Get the index for an image tree, shared within the process.
+
+    Args:
+        root (str): Tree root (defaults to web-folder/static/images)
+        refresh (bool): Refresh it from disk first
+
+    Returns:
+        ImageIndex: The index
+    """
+    if root is None:
+        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        root = os.path.join(current_dir, "web-folder", "static", "images")
+    root = os.path.abspath(root)
+    if root not in _open_indexes:
+        _open_indexes[root] = ImageIndex(root)
+    if refresh:
+        _open_indexes[root].refresh()
+    return _open_indexes[root]
+
+
+def is_responsive_variant(path: str) -> bool:
+    """Check whether a file is a generated <name>_<width>w variant."""
+    return bool(VARIANT_PATTERN.search(os.path.splitext(os.path.basename(path))[0]))
+
+
+def get_image_metadata(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Get metadata for any image, through the index of an open tree that contains it.
+
+    Args:
+        path (str): Image path
+
+    Returns:
+        dict or None: Metadata, or None if the file is missing or unsupported
+    """
+    full_path = os.path.abspath(path)
+    for root, index in _open_indexes.items():
+        if os.path.commonpath([full_path, root]) == root:
+            return index.get(full_path)
+    try:
+        return read_image_metadata(full_path)
+    except OSError:
+        return None
+
+
+def read_image_metadata(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read metadata from an image file's header.
+
+    Args:
+        path (str): Image path
+
+    Returns:
+        dict or None: {'format', 'width', 'height', 'mode', 'alpha', 'animated',
+                       'progressive', 'sha256', 'dominant_colour'}, or None if
+                       the format is not recognised
+    """
+    with open(path, 'rb') as f:
+        head = f.read(SVG_HEADER_BYTES)
+
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        metadata = _read_png(path)
+    elif head.startswith(b'\xff\xd8'):
+        metadata = _read_jpeg(path)
+    elif head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        metadata = _read_webp(head)
+    elif head[:6] in (b'GIF87a', b'GIF89a'):
+        metadata = _read_gif(path)
+    elif b'<svg' in head:
+        metadata = _read_svg(head.decode('utf-8', errors='replace'))
+    else:
+        return None
+
+    if metadata is None:
+        return None
+    metadata.setdefault('animated', False)
+    metadata.setdefault('progressive', False)
+    metadata['sha256'] = hash_file(path)
+    if 'dominant_colour' not in metadata:
+        metadata['dominant_colour'] = _dominant_colour(path)
+    return metadata
+
+
+# Private helper functions
+
+def _scan_tree(root: str) -> Iterable:
+    """Yield (relative path, stat) for indexable files, in one scandir walk."""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in INDEXED_EXTENSIONS and entry.is_file():
+                    yield os.path.relpath(entry.path, root).replace(os.sep, '/'), entry.stat()
+
+
+def _read_png(path: str) -> Optional[Dict[str, Any]]:
+    """Read IHDR and the chunk list up to the first IDAT."""
+    with open(path, 'rb') as f:
+        f.seek(8)
+        length, kind = struct.unpack(">I4s", f.read(8))
+        if kind != b'IHDR':
+            return None
+        width, height, bit_depth, colour_type = struct.unpack(">IIBB", f.read(10))
+        f.seek(length - 10 + 4, os.SEEK_CUR)
+
+        alpha = colour_type in (4, 6)
+        animated = False
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, kind = struct.unpack(">I4s", header)
+            if kind == b'IDAT' or kind == b'IEND':
+                break
+            if kind == b'tRNS':
+                alpha = True
+            elif kind == b'acTL':
+                animated = True
+            f.seek(length + 4, os.SEEK_CUR)
+
+    return {
+        'format': 'PNG',
+        'width': width,
+        'height': height,
+        'mode': (PNG_GREY_DEPTH_MODES.get(bit_depth, 'L') if colour_type == 0
+                 else PNG_MODES.get(colour_type, 'unknown')),
+        'bit_depth': bit_depth,
+        'alpha': alpha,
+        'animated': animated
+    }
+
+
+def _read_jpeg(path: str) -> Optional[Dict[str, Any]]:
+    """Walk JPEG markers up to the first start-of-frame."""
+    with open(path, 'rb') as f:
+        f.seek(2)
+        while True:
+            byte = f.read(1)
+            if not byte:
+                return None
+            if byte != b'\xff':
+                continue
+            marker = f.read(1)
+            while marker == b'\xff':
+                marker = f.read(1)
+            if not marker:
+                return None
+            code = marker[0]
+            if code in (0x01, 0xD8) or 0xD0 <= code <= 0xD7:
+                continue
+            if code in (0xD9, 0xDA):
+                return None
+            length = struct.unpack(">H", f.read(2))[0]
+            if code in JPEG_SOF_MARKERS:
+                precision, height, width, components = struct.unpack(">BHHB", f.read(6))
+                return {
+                    'format': 'JPEG',
+                    'width': width,
+                    'height': height,
+                    'mode': JPEG_MODES.get(components, 'unknown'),
+                    'bit_depth': precision,
+                    'alpha': False,
+                    'progressive': code in (0xC2, 0xC6, 0xCA, 0xCE)
+                }
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_webp(head: bytes) -> Optional[Dict[str, Any]]:
+    """Read the first WebP chunk (VP8X, VP8L or VP8)."""
+    chunk = head[12:16]
+    metadata = {'format': 'WEBP'}
+    if chunk == b'VP8X' and len(head) >= 30:
+        flags = head[20]
+        metadata.update({
+            'width': int.from_bytes(head[24:27], 'little') + 1,
+            'height': int.from_bytes(head[27:30], 'little') + 1,
+            'alpha': bool(flags & 0x10),
+            'animated': bool(flags & 0x02)
+        })
+    elif chunk == b'VP8L' and len(head) >= 25 and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], 'little')
+        metadata.update({
+            'width': (bits & 0x3FFF) + 1,
+            'height': ((bits >> 14) & 0x3FFF) + 1,
+            'alpha': bool((bits >> 28) & 1)
+        })
+    elif chunk == b'VP8 ' and len(head) >= 30 and head[23:26] == b'\x9d\x01\x2a':
+        metadata.update({
+            'width': struct.unpack("<H", head[26:28])[0] & 0x3FFF,
+            'height': struct.unpack("<H", head[28:30])[0] & 0x3FFF,
+            'alpha': False
+        })
+    else:
+        return None
+    metadata['mode'] = 'RGBA' if metadata['alpha'] else 'RGB'
+    return metadata
+
+
+def _read_gif(path: str) -> Optional[Dict[str, Any]]:
+    """Read the screen descriptor and walk blocks for transparency and frames."""
+    with open(path, 'rb') as f:
+        header = f.read(13)
+        width, height, packed = struct.unpack("<HHB", header[6:11])
+        if packed & 0x80:
+            f.seek(3 * (2 << (packed & 0x07)), os.SEEK_CUR)
+
+        alpha = False
+        frames = 0
+        while True:
+            block = f.read(1)
+            if not block or block == b'\x3b':
+                break
+            if block == b'\x21':
+                label = f.read(1)
+                if label == b'\xf9':
+                    size = f.read(1)[0]
+                    data = f.read(size)
+                    alpha = alpha or bool(data and data[0] & 0x01)
+                _skip_gif_sub_blocks(f)
+            elif block == b'\x2c':
+                frames += 1
+                descriptor = f.read(9)
+                if len(descriptor) < 9:
+                    break
+                if descriptor[8] & 0x80:
+                    f.seek(3 * (2 << (descriptor[8] & 0x07)), os.SEEK_CUR)
+                f.read(1)  # LZW minimum code size
+                _skip_gif_sub_blocks(f)
+            else:
+                break
+
+    return {
+        'format': 'GIF',
+        'width': width,
+        'height': height,
+        'mode': 'P',
+        'alpha': alpha,
+        'animated': frames > 1
+    }
+
+
+def _skip_gif_sub_blocks(f) -> None:
+    """Skip a chain of GIF data sub-blocks."""
+    while True:
+        size = f.read(1)
+        if not size or size[0] == 0:
+            return
+        f.seek(size[0], os.SEEK_CUR)
+
+
+def _read_svg(text: str) -> Optional[Dict[str, Any]]:
+    """Read size from the root <svg> tag and the most used fill colour."""
+    root = re.search(r'<svg\b[^>]*>', text, re.IGNORECASE)
+    if not root:
+        return None
+    attributes = dict(re.findall(r'([\w:-]+)\s*=\s*["\']([^"\']*)["\']', root.group(0)))
+
+    width = _svg_length(attributes.get('width'))
+    height = _svg_length(attributes.get('height'))
+    view_box = [float(value) for value in re.split(r'[\s,]+', attributes.get('viewBox', '').strip()) if value]
+    if len(view_box) == 4:
+        if width is None and height is None:
+            width, height = view_box[2], view_box[3]
+        elif width is None and view_box[3]:
+            width = height * view_box[2] / view_box[3]
+        elif height is None and view_box[2]:
+            height = width * view_box[3] / view_box[2]
+
+    colours = Counter(
+        colour.lower() if len(colour) == 7 else '#' + ''.join(c * 2 for c in colour[1:]).lower()
+        for colour in re.findall(r'(?:fill|stop-color)\s*[:=]\s*["\']?(#[0-9a-fA-F]{6}|#[0-9a-fA-F]{3})\b', text)
+    )
+
+    return {
+        'format': 'SVG',
+        'width': round(width) if width else None,
+        'height': round(height) if height else None,
+        'mode': 'vector',
+        'alpha': True,
+        'dominant_colour': colours.most_common(1)[0][0] if colours else None
+    }
+
+
+def _svg_length(value: Optional[str]) -> Optional[float]:
+    """Parse an absolute SVG length (unitless or px); relative units give None."""
+    if not value:
+        return None
+    match = re.match(r'^\s*([\d.]+)\s*(px)?\s*$', value)
+    return float(match.group(1)) if match else None
+
+
+def _dominant_colour(path: str) -> Optional[str]:
+    """Most common colour of the opaque pixels, from a heavily reduced decode."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as image:
+            image.draft('RGB', (64, 64))
+            image.thumbnail((32, 32))
+            rgba = list(image.convert('RGBA').getdata())
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    # Ignore transparent areas unless the whole image is translucent
+    pixels = [pixel[:3] for pixel in rgba if pixel[3] >= 128] or [pixel[:3] for pixel in rgba]
+    if not pixels:
+        return None
+
+    sample = Image.new('RGB', (len(pixels), 1))
+    sample.putdata(pixels)
+    quantised = sample.quantize(colors=4)
+    palette = quantised.getpalette()
+    count, index = max(quantised.getcolors())
+    return '#{:02x}{:02x}{:02x}'.format(*palette[index * 3:index * 3 + 3])
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Image Placeholders Module
+
+Low-quality image placeholders (LQIP) for the Casino Website Generator.
+
+- Every site raster over MIN_SOURCE_BYTES gets a placeholder at most
+  PLACEHOLDER_SIZE pixels on its longest side, averaged down with numpy
+  over premultiplied alpha (so transparent areas do not bleed dark fringes)
+- Placeholders are encoded as WebP or PNG, whichever is smaller, and kept
+  as data URIs of a few hundred bytes in .build-cache/placeholders.json,
+  keyed by content hash
+- <img> tags pointing at those images get the placeholder as an inline
+  background, which the browser stretches (and so blurs) to the tag's box
+  and which is dropped when the image loads; no extra request is made
+"""
+
+import os
+import re
+import io
+import json
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is required to build placeholders
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:  # Without numpy Pillow's box filter is used
+    np = None
+
+from image_metadata import load_image_index
+from file_utils import write_atomic
+
+
+PLACEHOLDER_CACHE_FILE = os.path.join(".build-cache", "placeholders.json")
+PLACEHOLDER_VERSION = 1
+PLACEHOLDER_SIZE = 16
+MIN_SOURCE_BYTES = 10 * 1024  # smaller images arrive about as fast as their placeholder
+PLACEHOLDER_FORMATS = ['JPEG', 'PNG', 'WEBP', 'GIF']
+DEFAULT_WORKERS = 8
+
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+SRC_PATTERN = re.compile(r'\bsrc\s*=\s*(["\'])([^"\']*)\1', re.IGNORECASE)
+STYLE_PATTERN = re.compile(r'\bstyle\s*=\s*(["\'])([^"\']*)\1', re.IGNORECASE)
+ONLOAD_PATTERN = re.compile(r'\bonload\s*=', re.IGNORECASE)
+LQIP_ONLOAD = "this.style.backgroundImage='none'"
+LQIP_STYLE_PATTERN = re.compile(r'background-image:url\(data:image/[^)]*\);background-size:100% 100%;?')
+
+
+def build_placeholders(images_dir: str, workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+    """
+    Build (or load from cache) placeholders for the site's raster images.
+
+    Args:
+        images_dir (str): static/images directory
+        workers (int): Threads used to decode images
+
+    Returns:
+        dict: {'placeholders': {source path: data URI}, 'built', 'cached', 'errors': [...]}
+    """
+    images_dir = os.path.abspath(images_dir)
+    index = load_image_index(images_dir)
+    cache = _load_cache()
+    summary = {'placeholders': {}, 'built': 0, 'cached': 0, 'errors': []}
+
+    wanted = {}
+    # Variants and WebP/AVIF copies are shown through the <img> of their source
+    for relative_path, metadata in sorted(index.source_entries().items()):
+        if metadata['format'] not in PLACEHOLDER_FORMATS or metadata['size'] < MIN_SOURCE_BYTES:
+            continue
+        wanted[os.path.join(images_dir, *relative_path.split('/'))] = metadata['sha256']
+
+    missing = {path: sha for path, sha in wanted.items() if sha not in cache}
+    if missing and Image is None:
+        summary['errors'].append("Pillow is not installed - placeholders could not be built")
+    elif missing:
+        paths = list(missing)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path, result in zip(paths, pool.map(_placeholder_job, paths)):
+                if isinstance(result, Exception):
+                    summary['errors'].append(f"{os.path.relpath(path, images_dir)}: {result}")
+                else:
+                    cache[missing[path]] = result
+                    summary['built'] += 1
+        _save_cache({sha: cache[sha] for sha in set(wanted.values()) if sha in cache})
+
+    for path, sha in wanted.items():
+        if sha in cache:
+            summary['placeholders'][path] = cache[sha]
+    summary['cached'] = len(summary['placeholders']) - summary['built']
+    return summary
+
+
+def make_placeholder(image: Any) -> str:
+    """
+    Reduce an image to a placeholder data URI.
+
+    Args:
+        image (PIL.Image.Image): Source image
+
+    Returns:
+        str: data:image/webp or data:image/png URI
+    """
+    scale = min(1.0, PLACEHOLDER_SIZE / max(image.size))
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    rgba = image.convert('RGBA')
+
+    if np is None:
+        small = rgba.resize(size, Image.BOX)
+    else:
+        small = Image.fromarray(_box_average(rgba, size), 'RGBA')
+    if small.getextrema()[3][0] == 255:
+        small = small.convert('RGB')
+
+    candidates = []
+    for image_format, options in (('WEBP', {'quality': 40, 'method': 6}), ('PNG', {'optimize': True})):
+        buffer = io.BytesIO()
+        try:
+            small.save(buffer, image_format, **options)
+        except (OSError, KeyError):
+            continue
+        candidates.append((len(buffer.getvalue()), image_format.lower(), buffer.getvalue()))
+    _, subtype, data = min(candidates)
+    return f"data:image/{subtype};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def inject_placeholders(html_files: List[str], placeholders: Dict[str, str]) -> Dict[str, int]:
+    """
+    Give <img> tags their placeholder as a background that is cleared on load.
+
+    Tags injected by an earlier run get the current placeholder; tags with
+    an onload handler of their own are left alone.
+
+    Args:
+        html_files (list): HTML files to rewrite
+        placeholders (dict): 'placeholders' from build_placeholders()
+
+    Returns:
+        dict: {'files_updated', 'tags_updated'}
+    """
+    stats = {'files_updated': 0, 'tags_updated': 0}
+
+    for html_file in html_files:
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        html_dir = os.path.dirname(os.path.abspath(html_file))
+        updated_tags = 0
+
+        def rewrite(match: re.Match) -> str:
+            nonlocal updated_tags
+            tag = match.group(0)
+            src_match = SRC_PATTERN.search(tag)
+            if not src_match or re.match(r'^([a-z]+:|//)', src_match.group(2), re.IGNORECASE):
+                return tag
+            source = os.path.normpath(os.path.join(html_dir, src_match.group(2).split('?')[0].split('#')[0]))
+            placeholder = placeholders.get(source)
+            if not placeholder:
+                return tag
+
+            new_tag = add_placeholder(tag, placeholder)
+            if new_tag != tag:
+                updated_tags += 1
+            return new_tag
+
+        new_content = IMG_TAG_PATTERN.sub(rewrite, content)
+        if updated_tags:
+            write_atomic(html_file, new_content.encode('utf-8'))
+            stats['files_updated'] += 1
+            stats['tags_updated'] += updated_tags
+
+    return stats
+
+
+def add_placeholder(tag: str, placeholder: str) -> str:
+    """
+    Add (or update) the placeholder background of one <img> tag.
+
+    Args:
+        tag (str): The <img ...> tag
+        placeholder (str): Placeholder data URI
+
+    Returns:
+        str: The rewritten tag, or the tag unchanged if it has its own onload handler
+    """
+    lqip_style = f"background-image:url({placeholder});background-size:100% 100%;"
+    injected = LQIP_ONLOAD in tag
+    if ONLOAD_PATTERN.search(tag) and not injected:
+        return tag
+
+    style_match = STYLE_PATTERN.search(tag)
+    if style_match:
+        existing = LQIP_STYLE_PATTERN.sub('', style_match.group(2))
+        style = f'style={style_match.group(1)}{lqip_style}{existing}{style_match.group(1)}'
+        new_tag = tag[:style_match.start()] + style + tag[style_match.end():]
+    else:
+        closing = ' />' if tag.endswith('/>') else '>'
+        new_tag = f'{tag[:-len(closing.strip())].rstrip()} style="{lqip_style}"{closing}'
+    if not injected:
+        closing = ' />' if new_tag.endswith('/>') else '>'
+        new_tag = f'{new_tag[:-len(closing.strip())].rstrip()} onload="{LQIP_ONLOAD}"{closing}'
+    return new_tag
+
+
+# Private helper functions
+
+def _placeholder_job(path: str) -> Any:
+    """Thread pool entry point: decode one image at reduced scale and build its placeholder."""
+    try:
+        with Image.open(path) as image:
+            image.draft('RGB', (PLACEHOLDER_SIZE * 8, PLACEHOLDER_SIZE * 8))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'RGBA'):
+                # reduce() does not take palette, bilevel or 16-bit images (GIFs are always P)
+                image = image.convert('RGBA')
+            factor = max(1, min(image.size) // (PLACEHOLDER_SIZE * 4))
+            if factor > 1:
+                image = image.reduce(factor)
+            return make_placeholder(image)
+    except Exception as e:
+        return e
+
+
+def _box_average(rgba: Any, size: Any) -> Any:
+    """Average an RGBA image down to size in premultiplied alpha, one reshape per axis."""
+    width, height = size
+    pixels = np.asarray(rgba, dtype=np.float32)
+    alpha = pixels[:, :, 3:4] / 255
+    premultiplied = np.concatenate((pixels[:, :, :3] * alpha, pixels[:, :, 3:4]), axis=2)
+
+    # Every output pixel covers a whole number of source rows and columns
+    rows = np.linspace(0, pixels.shape[0], height + 1).astype(np.intp)
+    cols = np.linspace(0, pixels.shape[1], width + 1).astype(np.intp)
+    summed = np.add.reduceat(np.add.reduceat(premultiplied, rows[:-1], axis=0), cols[:-1], axis=1)
+    counts = np.outer(np.diff(rows), np.diff(cols))[:, :, None]
+    averaged = summed / counts
+
+    coverage = averaged[:, :, 3:4] / 255
+    with np.errstate(divide='ignore', invalid='ignore'):
+        colour = np.where(coverage > 0, averaged[:, :, :3] / coverage, 0)
+    return np.clip(np.concatenate((colour, averaged[:, :, 3:4]), axis=2) + 0.5, 0, 255).astype(np.uint8)
+
+
+def _cache_path() -> str:
+    """Get the placeholder cache path."""
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(current_dir, PLACEHOLDER_CACHE_FILE)
+
+
+def _load_cache() -> Dict[str, str]:
+    """Load content hash → placeholder data URI."""
+    try:
+        with open(_cache_path(), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != PLACEHOLDER_VERSION or data.get("size") != PLACEHOLDER_SIZE:
+        return {}
+    return data.get("placeholders", {})
+
+
+def _save_cache(cache: Dict[str, str]) -> None:
+    """Save the cache atomically."""
+    write_atomic(_cache_path(), json.dumps({"version": PLACEHOLDER_VERSION, "size": PLACEHOLDER_SIZE,
+                                            "placeholders": cache}, indent=1, sort_keys=True).encode('utf-8'))
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Image Planner Module
+
+Works out which manifest images a site is missing for the Casino Website
+Generator and fills only that delta.
+
+- static/images is snapshotted in one scandir pass
+- Every entry of create_casino_image_manifest() is matched against the
+  snapshot and checked for format and size (the manifest size, or the
+  get_standard_image_sizes() size for the same role if larger)
+- Missing or undersized images are fetched in parallel, and fetched,
+  wrong-format or wrong-aspect sources are smart-cropped to the target size
+  and converted in a process pool; larger images with the right shape are
+  kept as they are for responsive variants
+
+A complete site costs one directory walk plus an image metadata index lookup
+per manifest image, so re-running it is close to free.
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional, Any, Callable
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is only needed to resize
+    Image = None
+
+from img_processor import create_casino_image_manifest, get_standard_image_sizes
+from image_metadata import load_image_index
+from image_resizer import smart_fit, contain_fit, CONTAIN_TARGETS
+
+
+ASPECT_TOLERANCE = 0.02
+RASTER_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.ico']
+
+# Manifest image name → get_standard_image_sizes() key
+STANDARD_SIZE_KEYS = {
+    "logo": "header_logo",
+    "main_banner": "hero_banner",
+    "jackpot_banner": "promo_banner",
+    "poker_thumbnail": "game_thumbnail",
+    "roulette_thumbnail": "game_thumbnail",
+    "slots_thumbnail": "game_thumbnail",
+    "favicon": "favicon",
+    "apple_touch_icon": "apple_touch_icon"
+}
+
+SAVE_FORMATS = {
+    '.jpg': 'JPEG',
+    '.jpeg': 'JPEG',
+    '.png': 'PNG',
+    '.webp': 'WEBP',
+    '.ico': 'ICO'
+}
+
+
+def snapshot_images(images_dir: str) -> Dict[str, Dict[str, int]]:
+    """
+    Snapshot a directory tree with os.scandir.
+
+    Args:
+        images_dir (str): static/images directory
+
+    Returns:
+        dict: Path relative to images_dir mapped to {'size', 'mtime_ns'}
+    """
+    snapshot = {}
+    pending = [images_dir]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    relative_path = os.path.relpath(entry.path, images_dir).replace(os.sep, '/')
+                    snapshot[relative_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    return snapshot
+
+
+def plan_image_tasks(images_dir: str, snapshot: Optional[Dict[str, Dict[str, int]]] = None,
+                     manifest: Optional[Dict[str, Dict[str, Dict]]] = None) -> List[Dict[str, Any]]:
+    """
+    Compute the exact set of manifest images that need work.
+
+    Args:
+        images_dir (str): static/images directory
+        snapshot (dict): Output of snapshot_images() (taken if omitted)
+        manifest (dict): Image manifest (defaults to create_casino_image_manifest())
+
+    Returns:
+        list: Tasks as {'key', 'category', 'name', 'required', 'reason', 'action',
+              'source', 'dest', 'width', 'height', 'fit', 'description'}; action is
+              "fetch" (nothing usable on disk) or "resize" (usable source exists),
+              and fit is "contain" (padded) for logos and icons, "cover" otherwise
+    """
+    if snapshot is None:
+        snapshot = snapshot_images(images_dir)
+    if manifest is None:
+        manifest = create_casino_image_manifest()
+    standard_sizes = get_standard_image_sizes()
+    index = load_image_index(images_dir, refresh=False)
+
+    # Index snapshot by (category, stem) once instead of probing per format
+    by_stem: Dict[Tuple[str, str], List[str]] = {}
+    for relative_path in snapshot:
+        category, _, file_name = relative_path.rpartition('/')
+        stem, extension = os.path.splitext(file_name)
+        if extension.lower() in RASTER_EXTENSIONS + ['.svg']:
+            by_stem.setdefault((category, stem), []).append(relative_path)
+
+    tasks = []
+    for category, images in manifest.items():
+        for name, spec in images.items():
+            width, height = _target_size(name, spec, standard_sizes)
+            formats = ['.' + fmt.lower() for fmt in spec.get("formats", ["png"])]
+            dest_extension = next((fmt for fmt in formats if fmt in SAVE_FORMATS), '.png')
+            candidates = sorted(by_stem.get((category, name), []),
+                                key=lambda path: os.path.splitext(path)[1].lower() not in formats)
+
+            task = {
+                'key': f"{category}/{name}",
+                'category': category,
+                'name': name,
+                'required': bool(spec.get("required")),
+                'description': spec.get("description", name.replace("_", " ")),
+                'dest': os.path.join(images_dir, category, name + dest_extension),
+                'width': width,
+                'height': height,
+                'fit': 'contain' if STANDARD_SIZE_KEYS.get(name) in CONTAIN_TARGETS else 'cover',
+                'source': None
+            }
+
+            if not candidates:
+                tasks.append(dict(task, action="fetch", reason="missing"))
+                continue
+
+            best = candidates[0]
+            extension = os.path.splitext(best)[1].lower()
+            if extension == '.svg':
+                if extension in formats:
+                    continue
+                tasks.append(dict(task, action="fetch", reason="unsupported format"))
+                continue
+
+            dimensions = _read_dimensions(index, os.path.join(images_dir, best))
+            if dimensions is None:
+                tasks.append(dict(task, action="fetch", reason="unreadable"))
+            elif dimensions[0] < width or dimensions[1] < height:
+                tasks.append(dict(task, action="fetch",
+                                  reason=f"undersized ({dimensions[0]}x{dimensions[1]} < {width}x{height})"))
+            elif extension not in formats:
+                tasks.append(dict(task, action="resize", source=os.path.join(images_dir, best), reason="wrong format"))
+            elif abs(dimensions[0] / dimensions[1] - width / height) > ASPECT_TOLERANCE * width / height:
+                tasks.append(dict(task, action="resize", source=os.path.join(images_dir, best), reason="wrong aspect ratio"))
+
+    index.save()
+    return sorted(tasks, key=lambda task: not task['required'])
+
+
+def fill_missing_images(images_dir: Optional[str] = None,
+                        fetcher: Optional[Callable[[Dict[str, Any], str], Optional[str]]] = None,
+                        workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Fetch and resize only the manifest images a site is missing.
+
+    Args:
+        images_dir (str): static/images directory (defaults to the web-folder one)
+        fetcher (callable): fetcher(task, staging_dir) -> downloaded file path or None;
+                            without one, missing images are only reported
+        workers (int): Worker count for fetching and resizing (defaults to CPU count)
+
+    Returns:
+        dict: {'planned', 'fetched', 'resized', 'up_to_date', 'errors': [...]}
+    """
+    if images_dir is None:
+        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        images_dir = os.path.join(current_dir, "web-folder", "static", "images")
+
+    snapshot = snapshot_images(images_dir)
+    tasks = plan_image_tasks(images_dir, snapshot)
+    manifest_count = sum(len(images) for images in create_casino_image_manifest().values())
+    summary = {'planned': len(tasks), 'fetched': 0, 'resized': 0,
+               'up_to_date': manifest_count - len(tasks), 'errors': []}
+
+    if not tasks:
+        _display_plan_summary(summary)
+        return summary
+
+    for directory in {os.path.dirname(task['dest']) for task in tasks}:
+        os.makedirs(directory, exist_ok=True)
+
+    fetch_tasks = [task for task in tasks if task['action'] == "fetch"]
+    resize_tasks = [task for task in tasks if task['action'] == "resize"]
+
+    os.makedirs(images_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=".fetch-", dir=images_dir)
+    try:
+        if fetch_tasks and fetcher is None:
+            summary['errors'].extend(f"{task['key']}: {task['reason']} (no image source configured)"
+                                     for task in fetch_tasks)
+        elif fetch_tasks:
+            with ThreadPoolExecutor(max_workers=workers or 4) as pool:
+                for task, path in zip(fetch_tasks, pool.map(lambda task: _safe_fetch(fetcher, task, staging_dir),
+                                                            fetch_tasks)):
+                    if isinstance(path, str):
+                        summary['fetched'] += 1
+                        resize_tasks.append(dict(task, source=path))
+                    else:
+                        summary['errors'].append(f"{task['key']}: {path or 'no image found'}")
+
+        if resize_tasks and Image is None:
+            summary['errors'].append("Pillow is not installed - images could not be resized")
+        elif resize_tasks:
+            jobs = [(task['source'], task['dest'], task['width'], task['height'], task['fit'])
+                    for task in resize_tasks]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for task, error in zip(resize_tasks, pool.map(_resize_job, jobs)):
+                    if error:
+                        summary['errors'].append(f"{task['key']}: {error}")
+                    else:
+                        summary['resized'] += 1
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    _display_plan_summary(summary)
+    return summary
+
+
+# Private helper functions
+
+def _target_size(name: str, spec: Dict[str, Any], standard_sizes: Dict[str, Tuple[int, int]]) -> Tuple[int, int]:
+    """Get the size an image must have: the larger of manifest and standard size."""
+    width, height = 0, 0
+    if "size" in spec:
+        width, height = (int(value) for value in spec["size"].lower().split("x"))
+    standard = standard_sizes.get(STANDARD_SIZE_KEYS.get(name, ""))
+    if standard:
+        width, height = max(width, standard[0]), max(height, standard[1])
+    return width, height
+
+
+def _read_dimensions(index: Any, path: str) -> Optional[Tuple[int, int]]:
+    """Look image dimensions up in the metadata index."""
+    metadata = index.get(path)
+    if not metadata or not metadata.get('width') or not metadata.get('height'):
+        return None
+    return metadata['width'], metadata['height']
+
+
+def _safe_fetch(fetcher: Callable, task: Dict[str, Any], staging_dir: str) -> Optional[str]:
+    """Run a fetcher, returning the error message instead of raising."""
+    try:
+        return fetcher(task, staging_dir)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+
+def _resize_job(job: Tuple[str, str, int, int, str]) -> Optional[str]:
+    """Process pool entry point: smart-crop (or pad, for logos and icons) a source to the target size."""
+    source, dest, width, height, fit = job
+    image_format = SAVE_FORMATS[os.path.splitext(dest)[1].lower()]
+    options = {
+        'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+        'PNG': {'optimize': True},
+        'WEBP': {'quality': 85, 'method': 6},
+        'ICO': {'sizes': [(width, height)]}
+    }[image_format]
+
+    temp_path = None
+    try:
+        with Image.open(source) as image:
+            image.draft('RGB', (width, height))
+            image = ImageOps.exif_transpose(image)
+            if fit == 'contain':
+                resized = contain_fit(image, (width, height))
+                if image_format == 'JPEG':
+                    # No transparency in JPEG: pad with the logo's corner colour
+                    background = Image.new('RGBA', (width, height), image.convert('RGB').getpixel((0, 0)))
+                    resized = Image.alpha_composite(background, resized)
+                image = resized
+            else:
+                image = smart_fit(image, (width, height))
+            if image_format == 'JPEG' and image.mode != 'RGB':
+                image = image.convert('RGB')
+            elif image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA')
+
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(dest), prefix=".tmp-")
+            os.close(fd)
+            image.save(temp_path, image_format, **options)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, dest)
+        return None
+    except Exception as e:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return str(e)
+
+
+def _display_plan_summary(summary: Dict[str, Any]) -> None:
+    """Display image plan summary."""
+    print(f"\n{'='*50}")
+    print("MANIFEST IMAGES SUMMARY")
+    print(f"{'='*50}")
+    print(f"✅ Up To Date: {summary['up_to_date']}")
+    print(f"📥 Fetched: {summary['fetched']}")
+    print(f"📐 Resized/Converted: {summary['resized']}")
+    print(f"❌ Errors: {len(summary['errors'])}")
+    for error in summary['errors']:
+        print(f"   • {error}")
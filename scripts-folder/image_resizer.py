@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Image Resizer Module
+
+Parallel reshaping of site images to the standard casino image shapes for
+the Casino Website Generator.
+
+- Each image is mapped to a get_standard_image_sizes() target from the
+  whole words of its file name, or its folder name (main_banner →
+  hero_banner, poker_thumbnail → game_thumbnail, logo → header_logo, ...)
+- Photos with the wrong aspect ratio are smart-cropped to the target's;
+  logos and icons are scaled to fit and padded instead, so no artwork is
+  cut off
+- Sources keep their resolution, so responsive_images can still build
+  every breakpoint from them; only images wider than the largest
+  breakpoint are scaled down (never below the target size)
+- Images with the target's shape are skipped using the image metadata
+  index, without decoding them; reshaped images are recorded in the build
+  manifest so later runs recognise their own output by content hash
+- The crop keeps the most informative region: an edge + local entropy map
+  of a reduced copy is computed with numpy, and the crop window with the
+  highest score wins (centre crop when numpy is not installed)
+- JPEGs are decoded at reduced scale with draft(); other formats shrink
+  with reduce() before the final Lanczos pass
+- Jobs run in a process pool with one worker per CPU, admitted against
+  the memory budget using sizes estimated from the image headers
+"""
+
+import os
+import re
+import tempfile
+from typing import Dict, Tuple, Optional, Any
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is required to resize
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:  # Without numpy crops fall back to the centre
+    np = None
+
+from image_metadata import load_image_index, is_responsive_variant
+from build_manifest import load_build_manifest
+from memory_budget import bounded_map, estimate_decoded_bytes
+from responsive_images import RESPONSIVE_WIDTHS
+
+
+ANALYSIS_SIZE = 256
+ENTROPY_BLOCK = 8
+ENTROPY_LEVELS = 16
+CENTRE_BIAS = 0.15
+REDUCING_GAP = 3.0
+WORKING_SET_FACTOR = 3  # decoded source, transposed copy and resampling buffers
+ASPECT_TOLERANCE = 0.02
+MAX_SOURCE_WIDTH = max(RESPONSIVE_WIDTHS)
+
+RESIZABLE_FORMATS = {'JPEG': '.jpg', 'PNG': '.png', 'WEBP': '.webp'}
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 85, 'method': 6}
+}
+
+# Name words → get_standard_image_sizes() key, most specific first
+TARGET_RULES = [
+    ("favicon", "favicon"),
+    ("apple_touch", "apple_touch_icon"),
+    ("logo", "header_logo"),
+    ("thumbnail", "game_thumbnail"),
+    ("thumb", "game_thumbnail"),
+    ("slot_machine", "slot_machine"),
+    ("roulette_table", "roulette_table"),
+    ("card", "casino_card"),
+    ("jackpot", "promo_banner"),
+    ("promo", "promo_banner"),
+    ("footer", "footer_decoration"),
+    ("hero", "hero_banner"),
+    ("banner", "hero_banner")
+]
+
+# Targets that are scaled to fit and padded rather than cropped
+CONTAIN_TARGETS = {"header_logo", "favicon", "apple_touch_icon"}
+
+# Folder → size key, for files whose names say nothing
+FOLDER_TARGETS = {
+    "hero": "hero_banner",
+    "games": "game_thumbnail",
+    "promotions": "promo_banner",
+    "footer": "footer_decoration"
+}
+
+
+def target_for_image(relative_path: str, standard_sizes: Dict[str, Tuple[int, int]]) -> Optional[Tuple[str, Tuple[int, int]]]:
+    """
+    Map an image to its standard size.
+
+    Args:
+        relative_path (str): Path relative to static/images, '/'-separated
+        standard_sizes (dict): Output of get_standard_image_sizes()
+
+    Returns:
+        tuple or None: (size key, (width, height)), or None if no rule matches
+    """
+    folder, _, file_name = relative_path.lower().rpartition('/')
+    words = "_" + "_".join(re.findall(r'[a-z]+', os.path.splitext(file_name)[0])) + "_"
+    # Whole words only, so "scorecard" is not a card and "catalogo" not a logo
+    key = next((key for fragment, key in TARGET_RULES if f"_{fragment}_" in words), None)
+    if key is None:
+        key = FOLDER_TARGETS.get(folder.rpartition('/')[2])
+    if key is None or key not in standard_sizes:
+        return None
+    return key, standard_sizes[key]
+
+
+def plan_resize_jobs(images_dir: str, standard_sizes: Dict[str, Tuple[int, int]]) -> Dict[str, Any]:
+    """
+    Work out which images need resizing, from the metadata index alone.
+
+    Args:
+        images_dir (str): static/images directory
+        standard_sizes (dict): Output of get_standard_image_sizes()
+
+    Returns:
+        dict: {'jobs': [(path, width, height, fit)], 'costs': [estimated bytes per job],
+               'up_to_date', 'unmatched', 'undersized': [...]}
+    """
+    index = load_image_index(images_dir)
+    manifest = load_build_manifest()
+    plan = {'jobs': [], 'costs': [], 'up_to_date': 0, 'unmatched': 0, 'undersized': []}
+
+    for relative_path, metadata in sorted(index.entries.items()):
+        if (metadata['format'] not in RESIZABLE_FORMATS or metadata.get('animated')
+                or is_responsive_variant(relative_path)):
+            continue
+        target = target_for_image(relative_path, standard_sizes)
+        if target is None:
+            plan['unmatched'] += 1
+            continue
+        key, (width, height) = target
+        fit = 'contain' if key in CONTAIN_TARGETS else 'cover'
+        path = os.path.join(images_dir, *relative_path.split('/'))
+        source_size = (metadata['width'], metadata['height'])
+        output_size = _output_size(source_size, (width, height), fit)
+        if manifest.is_up_to_date('resize', path, _resize_params(width, height, fit)) or output_size == source_size:
+            plan['up_to_date'] += 1
+        elif output_size[0] < width or output_size[1] < height:
+            plan['undersized'].append(
+                f"{relative_path}: {metadata['width']}x{metadata['height']} < {key} {width}x{height}")
+        else:
+            plan['jobs'].append((path, width, height, fit))
+            plan['costs'].append(estimate_decoded_bytes(metadata, _draft_size(source_size, output_size, fit))
+                                 * WORKING_SET_FACTOR)
+
+    return plan
+
+
+def resize_image_set(images_dir: str, standard_sizes: Dict[str, Tuple[int, int]],
+                     workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Reshape every image that does not have its standard shape yet.
+
+    Images are replaced atomically, so hardlinked copies elsewhere (stock
+    packs, caches) keep their original contents.
+
+    Args:
+        images_dir (str): static/images directory
+        standard_sizes (dict): Output of get_standard_image_sizes()
+        workers (int): Process count (defaults to the CPU count)
+
+    Returns:
+        dict: {'resized', 'up_to_date', 'unmatched', 'undersized': [...], 'errors': [...]}
+    """
+    plan = plan_resize_jobs(images_dir, standard_sizes)
+    summary = {'resized': 0, 'up_to_date': plan['up_to_date'], 'unmatched': plan['unmatched'],
+               'undersized': plan['undersized'], 'errors': []}
+
+    if plan['jobs'] and Image is None:
+        summary['errors'].append("Pillow is not installed - images could not be resized")
+    elif plan['jobs']:
+        manifest = load_build_manifest()
+        originals = {path: manifest.fingerprint(path) for path, _, _, _ in plan['jobs']}
+        errors = bounded_map(_resize_job, plan['jobs'], plan['costs'], workers)
+        for (path, width, height, fit), error in zip(plan['jobs'], errors):
+            if error:
+                summary['errors'].append(f"{os.path.relpath(path, images_dir)}: {error}")
+            else:
+                manifest.record('resize', path, _resize_params(width, height, fit), [path], originals[path])
+                summary['resized'] += 1
+        manifest.save()
+
+    return summary
+
+
+def smart_fit(image: Any, size: Tuple[int, int]) -> Any:
+    """
+    Cover-crop an image to size around its most informative region.
+
+    Args:
+        image (PIL.Image.Image): Source image (draft() may already be applied)
+        size (tuple): Target (width, height)
+
+    Returns:
+        PIL.Image.Image: Image of exactly the target size
+    """
+    box = find_crop_box(image, size)
+    return image.resize(size, Image.LANCZOS, box=box, reducing_gap=REDUCING_GAP)
+
+
+def contain_fit(image: Any, size: Tuple[int, int]) -> Any:
+    """
+    Scale an image to fit inside size and centre it on a padded canvas.
+
+    Args:
+        image (PIL.Image.Image): Source image
+        size (tuple): Target (width, height)
+
+    Returns:
+        PIL.Image.Image: RGBA image of exactly the target size, padded with transparency
+    """
+    image = image.convert('RGBA')
+    scale = min(size[0] / image.width, size[1] / image.height)
+    inner = (max(1, min(size[0], round(image.width * scale))), max(1, min(size[1], round(image.height * scale))))
+    if inner != image.size:
+        image = image.resize(inner, Image.LANCZOS, reducing_gap=REDUCING_GAP)
+    canvas = Image.new('RGBA', size, (0, 0, 0, 0))
+    canvas.paste(image, ((size[0] - inner[0]) // 2, (size[1] - inner[1]) // 2))
+    return canvas
+
+
+def find_crop_box(image: Any, size: Tuple[int, int]) -> Tuple[float, float, float, float]:
+    """
+    Find the largest crop with the target aspect ratio that keeps the most detail.
+
+    Args:
+        image (PIL.Image.Image): Source image
+        size (tuple): Target (width, height)
+
+    Returns:
+        tuple: (left, top, right, bottom) in source pixels
+    """
+    source_width, source_height = image.size
+    target_ratio = size[0] / size[1]
+    if source_width / source_height > target_ratio:
+        crop_width, crop_height = source_height * target_ratio, source_height
+    else:
+        crop_width, crop_height = source_width, source_width / target_ratio
+
+    free_axis = 0 if crop_width < source_width - 1 else 1
+    slack = (source_width - crop_width) if free_axis == 0 else (source_height - crop_height)
+    if slack < 1:
+        return (0, 0, source_width, source_height)
+
+    offset = slack / 2
+    if np is not None:
+        offset = _best_offset(_saliency_map(image), free_axis, crop_width / source_width
+                              if free_axis == 0 else crop_height / source_height) * slack
+
+    if free_axis == 0:
+        return (offset, 0, offset + crop_width, source_height)
+    return (0, offset, source_width, offset + crop_height)
+
+
+# Private helper functions
+
+def _resize_job(job: Tuple[str, int, int, str]) -> Optional[str]:
+    """Process pool entry point: reshape one image in place."""
+    path, width, height, fit = job
+    temp_path = None
+    try:
+        with Image.open(path) as image:
+            image_format = image.format
+            output_size = _output_size(image.size, (width, height), fit)
+            image.draft(image.mode, _draft_size(image.size, output_size, fit))
+            image = ImageOps.exif_transpose(image)
+            if fit == 'contain':
+                resized = contain_fit(image, output_size)
+                if image_format == 'JPEG':
+                    # No transparency in JPEG: pad with the logo's corner colour
+                    background = Image.new('RGBA', output_size, image.convert('RGB').getpixel((0, 0)))
+                    resized = Image.alpha_composite(background, resized)
+            else:
+                resized = smart_fit(image, output_size)
+        if image_format == 'JPEG' and resized.mode != 'RGB':
+            resized = resized.convert('RGB')
+        elif resized.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+            resized = resized.convert('RGBA')
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        os.close(fd)
+        resized.save(temp_path, image_format, **SAVE_OPTIONS[image_format])
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+        return None
+    except Exception as e:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return str(e)
+
+
+def _output_size(source_size: Tuple[int, int], target: Tuple[int, int], fit: str) -> Tuple[int, int]:
+    """
+    Size a source is reshaped to: the target's aspect ratio at the source's
+    own resolution (cropped for cover, padded for contain), scaled down only
+    past MAX_SOURCE_WIDTH. Sources already within ASPECT_TOLERANCE of the
+    ratio keep their size.
+    """
+    source_width, source_height = source_size
+    ratio = target[0] / target[1]
+    if abs(source_width / source_height - ratio) <= ratio * ASPECT_TOLERANCE:
+        shaped_width, shaped_height = float(source_width), float(source_height)
+    elif fit == 'cover':
+        shaped_width, shaped_height = min(source_width, source_height * ratio), min(source_height, source_width / ratio)
+    else:
+        shaped_width, shaped_height = max(source_width, source_height * ratio), max(source_height, source_width / ratio)
+
+    limit = max(MAX_SOURCE_WIDTH, target[0])
+    if shaped_width > limit:
+        shaped_width, shaped_height = limit, shaped_height * limit / shaped_width
+    return round(shaped_width), round(shaped_height)
+
+
+def _draft_size(source_size: Tuple[int, int], output_size: Tuple[int, int], fit: str) -> Tuple[int, int]:
+    """Smallest source size the output can still be made from, as _resize_job passes to draft()."""
+    ratios = (output_size[0] / source_size[0], output_size[1] / source_size[1])
+    scale = max(ratios) if fit == 'cover' else min(ratios)
+    return int(source_size[0] * scale) + 1, int(source_size[1] * scale) + 1
+
+
+def _resize_params(width: int, height: int, fit: str) -> Dict[str, Any]:
+    """Build manifest parameters of one resize."""
+    return {'size': [width, height], 'fit': fit, 'max_width': MAX_SOURCE_WIDTH,
+            'save': SAVE_OPTIONS, 'centre_bias': CENTRE_BIAS}
+
+
+def _saliency_map(image: Any) -> Any:
+    """Edge magnitude plus local entropy of a reduced greyscale copy, normalised to [0, 1]."""
+    factor = max(1, max(image.size) // ANALYSIS_SIZE)
+    small = image.reduce(factor) if factor > 1 else image
+    if small.mode in ('RGBA', 'LA', 'PA') or 'transparency' in small.info:
+        # Transparent areas carry no detail
+        rgba = small.convert('RGBA')
+        grey = np.asarray(rgba.convert('L'), dtype=np.float32) * (np.asarray(rgba.getchannel('A'), dtype=np.float32) / 255)
+    else:
+        grey = np.asarray(small.convert('L'), dtype=np.float32)
+
+    edges = np.zeros_like(grey)
+    edges[:, 1:] += np.abs(np.diff(grey, axis=1))
+    edges[1:, :] += np.abs(np.diff(grey, axis=0))
+
+    return _normalise(edges) + _normalise(_block_entropy(grey))
+
+
+def _block_entropy(grey: Any) -> Any:
+    """Shannon entropy of each ENTROPY_BLOCK square, spread back over its pixels."""
+    height, width = grey.shape
+    rows, cols = max(1, height // ENTROPY_BLOCK), max(1, width // ENTROPY_BLOCK)
+    block_h, block_w = max(1, height // rows), max(1, width // cols)
+    trimmed = grey[:rows * block_h, :cols * block_w]
+
+    levels = (trimmed * (ENTROPY_LEVELS / 256)).astype(np.intp)
+    block_ids = np.arange(rows * cols).reshape(rows, cols)
+    block_ids = np.repeat(np.repeat(block_ids, block_h, axis=0), block_w, axis=1)
+
+    counts = np.bincount((block_ids * ENTROPY_LEVELS + levels).ravel(),
+                         minlength=rows * cols * ENTROPY_LEVELS).reshape(rows * cols, ENTROPY_LEVELS)
+    probabilities = counts / (block_h * block_w)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entropy = -np.nansum(probabilities * np.log2(probabilities), axis=1).reshape(rows, cols)
+
+    spread = np.repeat(np.repeat(entropy, block_h, axis=0), block_w, axis=1)
+    result = np.zeros_like(grey)
+    result[:spread.shape[0], :spread.shape[1]] = spread
+    return result
+
+
+def _best_offset(saliency: Any, axis: int, window_fraction: float) -> float:
+    """Slide a window along one axis and return the best start as a fraction of the slack."""
+    # Image axis 0 (x) is array axis 1, so summing array axis 'axis' leaves a profile along it
+    profile = saliency.sum(axis=axis)
+    length = len(profile)
+    window = max(1, min(length, int(round(length * window_fraction))))
+    positions = length - window + 1
+    if positions <= 1 or not profile.any():
+        return 0.5
+
+    cumulative = np.concatenate(([0.0], np.cumsum(profile)))
+    scores = cumulative[window:] - cumulative[:-window]
+    # Prefer the centre when the content is evenly spread
+    distance = np.abs(np.linspace(-1.0, 1.0, positions))
+    scores = scores * (1.0 - CENTRE_BIAS * distance)
+    return float(np.argmax(scores)) / (positions - 1)
+
+
+def _normalise(values: Any) -> Any:
+    """Scale an array to [0, 1]."""
+    peak = float(values.max())
+    return values / peak if peak > 0 else values
@@ -8,8 +8,31 @@ in the Casino Website Generator.
 
 import os
 import shutil
+import tempfile
 from typing import List, Dict, Tuple, Optional
 
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is required to optimize file sizes
+    Image = None
+
+from build_manifest import load_build_manifest
+from image_metadata import load_image_index, get_image_metadata, is_responsive_variant
+from image_resizer import resize_image_set
+from responsive_images import build_responsive_sets, rewrite_img_srcsets
+from modern_formats import available_formats, convert_to_modern_formats, rewrite_picture_elements, SSIM_TARGET
+from svg_optimizer import optimize_svg_tree
+from image_placeholders import build_placeholders, inject_placeholders, add_placeholder
+from img_tag_rewriter import rewrite_img_tags
+from favicon_builder import find_logo_source, build_favicon_set, insert_icon_links
+
+
+MAX_WEB_WIDTH = 2400
+OPTIMIZE_SETTINGS = {
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True}
+}
+
 
 def process_images():
     """
@@ -21,6 +44,7 @@ def process_images():
     - Convert between formats
     - Generate responsive image sets
     - Fix image issues
+    - Generate favicons and touch icons
     """
     print("=== Image Processing System ===")
     print("1. Resize Images")
@@ -29,14 +53,15 @@ def process_images():
     print("4. Generate Responsive Sets")
     print("5. Fix Image Issues")
     print("6. Batch Process All")
+    print("7. Generate Favicons")
     
     while True:
         try:
-            choice = int(input("\nYour choice (1-6): "))
-            if 1 <= choice <= 6:
+            choice = int(input("\nYour choice (1-7): "))
+            if 1 <= choice <= 7:
                 break
             else:
-                print("Please enter a number between 1 and 6.")
+                print("Please enter a number between 1 and 7.")
         except ValueError:
             print("Please enter a valid number.")
     
@@ -52,6 +77,8 @@ def process_images():
         fix_image_issues()
     elif choice == 6:
         batch_process_all()
+    elif choice == 7:
+        generate_favicons()
 
 
 def resize_images():
@@ -81,12 +108,8 @@ def resize_images():
     for category, size in standard_sizes.items():
         print(f"  {category}: {size[0]}x{size[1]}")
     
-    print("\nImage resizing feature is not yet implemented.")
-    print("Planned functionality:")
-    print("- Automatic size detection")
-    print("- Batch resizing")
-    print("- Aspect ratio preservation")
-    print("- Quality optimization")
+    summary = resize_image_set(images_dir, standard_sizes)
+    _display_resize_summary(summary)
 
 
 def optimize_file_sizes():
@@ -104,22 +127,38 @@ def optimize_file_sizes():
     current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     images_dir = os.path.join(current_dir, "web-folder", "static", "images")
     
+    if not os.path.exists(images_dir):
+        print("Error: Images directory not found!")
+        return
+    
     optimization_stats = {
         'processed': 0,
         'size_saved': 0,
+        'up_to_date': 0,
         'errors': 0
     }
     
-    image_files = _get_image_files(images_dir)
-    
-    for image_file in image_files:
+    # Only sources that changed since their last optimization are re-encoded
+    index = load_image_index(images_dir)
+    manifest = load_build_manifest()
+    
+    for relative_path, metadata in sorted(index.entries.items()):
+        if metadata['format'] not in OPTIMIZE_SETTINGS or is_responsive_variant(relative_path):
+            continue
+        image_file = os.path.join(images_dir, *relative_path.split('/'))
+        params = {'format': metadata['format'], 'save': OPTIMIZE_SETTINGS[metadata['format']]}
+        if manifest.is_up_to_date('optimize', image_file, params):
+            optimization_stats['up_to_date'] += 1
+            continue
+        
         try:
-            original_size = os.path.getsize(image_file)
+            original = manifest.fingerprint(image_file)
+            original_size = original['size']
             
-            # Placeholder for optimization
             optimized_size = _optimize_image_file(image_file)
             
             if optimized_size:
+                manifest.record('optimize', image_file, params, [image_file], original)
                 size_saved = original_size - optimized_size
                 optimization_stats['processed'] += 1
                 optimization_stats['size_saved'] += size_saved
@@ -130,51 +169,41 @@ def optimize_file_sizes():
             optimization_stats['errors'] += 1
             print(f"Error processing {os.path.basename(image_file)}: {str(e)}")
     
+    manifest.save()
     _display_optimization_summary(optimization_stats)
 
 
 def convert_formats():
     """
-    Convert images between different formats.
+    Convert images to modern formats for modern browsers.
     
     Conversions:
-    - PNG to WebP (for modern browsers)
-    - JPEG to WebP (for modern browsers)
-    - Large PNG to JPEG (for photos)
-    - SVG optimization
+    - PNG and JPEG to AVIF and WebP, each at the lowest quality that keeps
+      the SSIM target
+    - <img> tags wrapped in <picture> elements with the original as fallback
+    - SVG optimization (embedded rasters are written out as separate files
+      when SVG_EXTRACT_RASTERS=1, for SVGs that are inlined rather than
+      loaded through <img>)
     """
     print("Converting image formats...")
     
-    print("Available conversions:")
-    print("1. PNG to WebP")
-    print("2. JPEG to WebP")
-    print("3. PNG to JPEG (photos)")
-    print("4. Optimize SVG")
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    web_folder = os.path.join(current_dir, "web-folder")
+    images_dir = os.path.join(web_folder, "static", "images")
     
-    while True:
-        try:
-            choice = int(input("\nConversion type (1-4): "))
-            if 1 <= choice <= 4:
-                break
-            else:
-                print("Please enter a number between 1 and 4.")
-        except ValueError:
-            print("Please enter a valid number.")
+    if not os.path.exists(images_dir):
+        print("Error: Images directory not found!")
+        return
     
-    conversion_types = {
-        1: "PNG to WebP",
-        2: "JPEG to WebP", 
-        3: "PNG to JPEG",
-        4: "SVG optimization"
-    }
+    formats = available_formats()
+    print(f"Target formats: {', '.join(formats) or 'none available'} (SSIM >= {SSIM_TARGET})")
+    
+    summary = convert_to_modern_formats(images_dir)
+    summary.update(rewrite_picture_elements(_get_html_files(web_folder)))
+    _display_conversion_summary(summary)
     
-    print(f"Selected: {conversion_types[choice]}")
-    print("Format conversion feature is not yet implemented.")
-    print("Planned functionality:")
-    print("- Batch conversion")
-    print("- Quality preservation")
-    print("- Fallback generation")
-    print("- Browser compatibility")
+    svg_results = optimize_svg_tree(images_dir, extract_rasters=os.environ.get("SVG_EXTRACT_RASTERS") == "1")
+    _display_svg_summary(svg_results)
 
 
 def generate_responsive_sets():
@@ -186,9 +215,20 @@ def generate_responsive_sets():
     - Tablet versions (768px width)
     - Desktop versions (1200px width)
     - Retina versions (2x resolution)
+    
+    Each source is decoded once and downsampled level by level; <img> tags
+    in the site's HTML then get matching srcset and sizes attributes.
     """
     print("Generating responsive image sets...")
     
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    web_folder = os.path.join(current_dir, "web-folder")
+    images_dir = os.path.join(web_folder, "static", "images")
+    
+    if not os.path.exists(images_dir):
+        print("Error: Images directory not found!")
+        return
+    
     screen_sizes = {
         'mobile': 480,
         'tablet': 768,
@@ -200,40 +240,65 @@ def generate_responsive_sets():
     for size_name, width in screen_sizes.items():
         print(f"  {size_name}: {width}px width")
     
-    print("\nResponsive image generation is not yet implemented.")
-    print("Planned functionality:")
-    print("- Multiple size generation")
-    print("- Srcset HTML generation")
-    print("- Picture element support")
-    print("- Automatic optimization")
+    summary = build_responsive_sets(images_dir, list(screen_sizes.values()))
+    summary.update(rewrite_img_srcsets(_get_html_files(web_folder), summary['variants']))
+    _display_responsive_summary(summary)
 
 
 def fix_image_issues():
     """
     Fix common image issues in casino websites.
     
-    Fixes:
+    Fixes (one rewrite per HTML file):
+    - Missing width/height, taken from the image metadata index
+    - Missing loading/decoding hints below the fold, fetchpriority on the hero
+    - Missing low-quality placeholders
+    
+    Then reports what is left:
     - Broken image links
     - Missing alt text
-    - Incorrect dimensions
     - Poor quality images
     - Missing responsive attributes
+    - Missing dimensions
     """
     print("Fixing image issues...")
     
     current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     web_folder = os.path.join(current_dir, "web-folder")
+    images_dir = os.path.join(web_folder, "static", "images")
+    html_files = _get_html_files(web_folder)
+    
+    transforms = []
+    placeholder_summary = None
+    if os.path.exists(images_dir):
+        load_image_index(images_dir)
+        placeholder_summary = build_placeholders(images_dir)
+        placeholders = placeholder_summary['placeholders']
+        placeholder_summary['tags_updated'] = 0
+        
+        def placeholder_transform(tag: str, source: Optional[str]) -> str:
+            if source not in placeholders:
+                return tag
+            new_tag = add_placeholder(tag, placeholders[source])
+            placeholder_summary['tags_updated'] += new_tag != tag
+            return new_tag
+        
+        transforms.append(placeholder_transform)
+    
+    rewrite_summary = rewrite_img_tags(html_files, transforms)
+    _display_tag_rewrite_summary(rewrite_summary)
+    if placeholder_summary:
+        _display_placeholder_summary(placeholder_summary)
     
     issues_found = {
         'broken_links': 0,
         'missing_alt': 0,
         'poor_quality': 0,
-        'missing_responsive': 0
+        'missing_responsive': 0,
+        'missing_dimensions': 0
     }
     
-    # Check HTML files for image issues
-    html_files = _get_html_files(web_folder)
-    
+    # Check HTML files for the issues that need a person to fix
     for html_file in html_files:
         file_issues = _check_image_issues_in_html(html_file)
         for issue_type, count in file_issues.items():
@@ -242,34 +307,98 @@ def fix_image_issues():
     _display_image_issues_summary(issues_found)
 
 
+def generate_placeholders():
+    """
+    Inline a blurred low-quality placeholder behind every large site image.
+    
+    Placeholders are data URIs of a few hundred bytes, shown as the <img>
+    background until the image itself has loaded, so slow connections see
+    the layout filled in without any extra request.
+    """
+    print("Generating image placeholders...")
+    
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    web_folder = os.path.join(current_dir, "web-folder")
+    images_dir = os.path.join(web_folder, "static", "images")
+    
+    if not os.path.exists(images_dir):
+        print("Error: Images directory not found!")
+        return
+    
+    summary = build_placeholders(images_dir)
+    summary.update(inject_placeholders(_get_html_files(web_folder), summary['placeholders']))
+    _display_placeholder_summary(summary)
+
+
+def generate_favicons(source: Optional[str] = None):
+    """
+    Generate the favicon and touch-icon set and link it from every page.
+    
+    Generates (from one decode of the site logo):
+    - favicon.ico (16, 32 and 48px)
+    - apple-touch-icon.png (180x180)
+    - 192/512px PWA icons, plain and maskable, with site.webmanifest
+    - favicon.svg when the logo is an SVG
+    
+    Args:
+        source (str): Logo to use (defaults to the largest logo in static/images)
+    """
+    print("Generating favicons...")
+    
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    web_folder = os.path.join(current_dir, "web-folder")
+    images_dir = os.path.join(web_folder, "static", "images")
+    
+    source = source or (find_logo_source(images_dir) if os.path.exists(images_dir) else None)
+    if not source or not os.path.exists(source):
+        print("Error: No logo found to build favicons from!")
+        return
+    
+    summary = build_favicon_set(source, web_folder)
+    summary.update(insert_icon_links(_get_html_files(web_folder), summary['links']))
+    summary['source'] = os.path.relpath(source, current_dir)
+    _display_favicon_summary(summary)
+
+
 def batch_process_all():
     """
     Perform all image processing operations in sequence.
     
     Operations:
-    1. Fix image issues
-    2. Resize to standard sizes
-    3. Optimize file sizes
+    1. Resize to standard sizes
+    2. Optimize file sizes
+    3. Fix image issues (dimensions, loading hints and placeholders)
     4. Generate responsive sets
     5. Convert to modern formats
+    6. Generate favicons
+    
+    Image issues are fixed after resizing, so the width/height and the
+    placeholders written into the pages describe the final images, and the
+    sizes attributes of step 4 are built from those widths.
+    
+    Every stage checks the build manifest first, so a repeated run only
+    processes images that are new or changed since the last one.
     """
     print("Starting batch processing of all images...")
     
-    print("Step 1: Fixing image issues...")
-    fix_image_issues()
-    
-    print("\nStep 2: Resizing images...")
+    print("Step 1: Resizing images...")
     resize_images()
     
-    print("\nStep 3: Optimizing file sizes...")
+    print("\nStep 2: Optimizing file sizes...")
     optimize_file_sizes()
     
+    print("\nStep 3: Fixing image issues...")
+    fix_image_issues()
+    
     print("\nStep 4: Generating responsive sets...")
     generate_responsive_sets()
     
     print("\nStep 5: Converting formats...")
     convert_formats()
     
+    print("\nStep 6: Generating favicons...")
+    generate_favicons()
+    
     print("\n✅ Batch processing completed!")
 
 
@@ -298,6 +427,9 @@ def validate_image_quality(image_path: str) -> Dict[str, any]:
     """
     Validate image quality and return recommendations.
     
+    Dimensions, format and colour mode come from the image metadata index
+    (header reads only), so no image is decoded.
+    
     Args:
         image_path (str): Path to image file
         
@@ -310,6 +442,9 @@ def validate_image_quality(image_path: str) -> Dict[str, any]:
     file_size = os.path.getsize(image_path)
     file_ext = os.path.splitext(image_path)[1].lower()
     
+    load_image_index(refresh=False)
+    metadata = get_image_metadata(image_path) or {}
+    
     recommendations = []
     
     # Check file size
@@ -320,9 +455,27 @@ def validate_image_quality(image_path: str) -> Dict[str, any]:
     if file_ext in ['.bmp', '.tiff']:
         recommendations.append("Consider converting to JPEG or PNG")
     
+    if metadata:
+        actual_format = metadata['format']
+        expected_format = {'.jpg': 'JPEG', '.jpeg': 'JPEG'}.get(file_ext, file_ext.lstrip('.').upper())
+        if actual_format != expected_format:
+            recommendations.append(f"File is {actual_format} but named {file_ext}, rename it")
+        if (metadata.get('width') or 0) > MAX_WEB_WIDTH:
+            recommendations.append(f"Image is {metadata['width']}px wide, resize to {MAX_WEB_WIDTH}px or less")
+        if metadata['mode'] == 'CMYK':
+            recommendations.append("CMYK colour mode, convert to RGB for browsers")
+        if actual_format == 'PNG' and not metadata['alpha'] and file_size > 200 * 1024:
+            recommendations.append("Opaque PNG photo, consider JPEG or WebP")
+        if actual_format == 'JPEG' and not metadata['progressive'] and file_size > 100 * 1024:
+            recommendations.append("Consider progressive JPEG encoding")
+    
     return {
         'file_size': file_size,
         'format': file_ext,
+        'width': metadata.get('width'),
+        'height': metadata.get('height'),
+        'mode': metadata.get('mode'),
+        'alpha': metadata.get('alpha'),
         'recommendations': recommendations
     }
 
@@ -331,6 +484,9 @@ def generate_srcset_html(base_image_path: str, sizes: List[int]) -> str:
     """
     Generate HTML srcset attribute for responsive images.
     
+    When base_image_path exists on disk, widths whose variant file has not
+    been generated are left out.
+    
     Args:
         base_image_path (str): Base image path
         sizes (list): List of widths for responsive versions
@@ -340,10 +496,13 @@ def generate_srcset_html(base_image_path: str, sizes: List[int]) -> str:
     """
     base_name = os.path.splitext(base_image_path)[0]
     extension = os.path.splitext(base_image_path)[1]
+    check_files = os.path.exists(base_image_path)
     
     srcset_parts = []
     for size in sizes:
         responsive_path = f"{base_name}_{size}w{extension}"
+        if check_files and not os.path.exists(responsive_path):
+            continue
         srcset_parts.append(f"{responsive_path} {size}w")
     
     return ", ".join(srcset_parts)
@@ -376,18 +535,49 @@ def _get_html_files(directory: str) -> List[str]:
 
 def _optimize_image_file(image_path: str) -> Optional[int]:
     """
-    Optimize a single image file (placeholder).
+    Re-encode a JPEG or PNG with OPTIMIZE_SETTINGS, keeping it only if smaller.
+    
+    EXIF orientation is applied and the metadata dropped; ICC profiles are
+    kept so colours do not shift. The file is replaced atomically.
     
     Args:
         image_path (str): Path to image file
         
     Returns:
-        int or None: New file size or None if failed
+        int or None: New file size (unchanged if re-encoding did not help) or None if failed
     """
-    # Placeholder for image optimization
-    # Would use PIL/Pillow or similar library
-    print(f"Image optimization not yet implemented for: {os.path.basename(image_path)}")
-    return None
+    if Image is None:
+        print(f"Pillow is not installed - cannot optimize {os.path.basename(image_path)}")
+        return None
+    
+    temp_path = None
+    try:
+        with Image.open(image_path) as image:
+            image_format = image.format
+            save_options = dict(OPTIMIZE_SETTINGS[image_format])
+            if image.info.get('icc_profile'):
+                save_options['icc_profile'] = image.info['icc_profile']
+            image = ImageOps.exif_transpose(image)
+            if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(image_path), prefix=".tmp-")
+            os.close(fd)
+            image.save(temp_path, image_format, **save_options)
+        
+        new_size = os.path.getsize(temp_path)
+        if new_size >= os.path.getsize(image_path):
+            return os.path.getsize(image_path)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, image_path)
+        temp_path = None
+        return new_size
+    except Exception as e:
+        print(f"Error optimizing {os.path.basename(image_path)}: {str(e)}")
+        return None
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
 
 
 def _check_image_issues_in_html(html_file: str) -> Dict[str, int]:
@@ -404,7 +594,8 @@ def _check_image_issues_in_html(html_file: str) -> Dict[str, int]:
         'broken_links': 0,
         'missing_alt': 0,
         'poor_quality': 0,
-        'missing_responsive': 0
+        'missing_responsive': 0,
+        'missing_dimensions': 0
     }
     
     try:
@@ -426,6 +617,10 @@ def _check_image_issues_in_html(html_file: str) -> Dict[str, int]:
             if 'srcset=' not in img_tag.lower() and 'sizes=' not in img_tag.lower():
                 issues['missing_responsive'] += 1
             
+            # Check for missing dimensions (causes layout shift)
+            if not re.search(r'\bwidth\s*=', img_tag, re.IGNORECASE) or not re.search(r'\bheight\s*=', img_tag, re.IGNORECASE):
+                issues['missing_dimensions'] += 1
+            
             # Extract src attribute
             src_match = re.search(r'src\s*=\s*["\']([^"\']*)["\']', img_tag, re.IGNORECASE)
             if src_match:
@@ -450,6 +645,7 @@ def _display_optimization_summary(stats: Dict[str, int]) -> None:
     print("IMAGE OPTIMIZATION SUMMARY")
     print(f"{'='*50}")
     print(f"✅ Images Processed: {stats['processed']}")
+    print(f"♻️  Already Optimized: {stats.get('up_to_date', 0)}")
     print(f"💾 Total Size Saved: {stats['size_saved']} bytes")
     print(f"❌ Errors: {stats['errors']}")
     
@@ -458,6 +654,116 @@ def _display_optimization_summary(stats: Dict[str, int]) -> None:
         print(f"📊 Average Savings: {avg_savings:.2f} bytes per image")
 
 
+def _display_resize_summary(summary: Dict[str, any]) -> None:
+    """Display image resize summary."""
+    print(f"\n{'='*50}")
+    print("IMAGE RESIZE SUMMARY")
+    print(f"{'='*50}")
+    print(f"📐 Resized: {summary['resized']}")
+    print(f"✅ Already Standard Size: {summary['up_to_date']}")
+    print(f"➖ No Standard Size: {summary['unmatched']}")
+    print(f"⚠️  Undersized: {len(summary['undersized'])}")
+    for message in summary['undersized']:
+        print(f"   • {message}")
+    print(f"❌ Errors: {len(summary['errors'])}")
+    for error in summary['errors']:
+        print(f"   • {error}")
+
+
+def _display_responsive_summary(summary: Dict[str, any]) -> None:
+    """Display responsive image summary."""
+    print(f"\n{'='*50}")
+    print("RESPONSIVE IMAGES SUMMARY")
+    print(f"{'='*50}")
+    print(f"🖼️  Pyramids Built: {summary['built']}")
+    print(f"✅ Already Up To Date: {summary['up_to_date']}")
+    print(f"📝 Img Tags Updated: {summary['tags_updated']} in {summary['files_updated']} file(s)")
+    print(f"❌ Errors: {len(summary['errors'])}")
+    for error in summary['errors']:
+        print(f"   • {error}")
+
+
+def _display_conversion_summary(summary: Dict[str, any]) -> None:
+    """Display format conversion summary."""
+    print(f"\n{'='*50}")
+    print("FORMAT CONVERSION SUMMARY")
+    print(f"{'='*50}")
+    for image_format, count in summary['converted'].items():
+        print(f"✅ {image_format}: {count} converted, {summary['bytes_saved'][image_format]} bytes saved")
+    print(f"♻️  Already Up To Date: {summary['up_to_date']}")
+    print(f"➖ Not Smaller Than Source: {summary['not_smaller']}")
+    print(f"📝 Img Tags Wrapped In <picture>: {summary['tags_updated']} in {summary['files_updated']} file(s)")
+    print(f"❌ Errors: {len(summary['errors'])}")
+    for error in summary['errors']:
+        print(f"   • {error}")
+
+
+def _display_svg_summary(results: Dict[str, Dict[str, any]]) -> None:
+    """Display SVG optimization summary with savings per file."""
+    print(f"\n{'='*50}")
+    print("SVG OPTIMIZATION SUMMARY")
+    print(f"{'='*50}")
+    total_saved = 0
+    for path, stats in results.items():
+        if 'error' in stats:
+            print(f"❌ {path}: {stats['error']}")
+            continue
+        saved = stats['original_size'] - stats['optimized_size']
+        total_saved += saved
+        percent = saved * 100 / stats['original_size'] if stats['original_size'] else 0
+        extracted = f", {stats['rasters_extracted']} raster(s) extracted" if stats['rasters_extracted'] else ""
+        print(f"✅ {path}: {stats['original_size']} → {stats['optimized_size']} bytes (-{percent:.1f}%){extracted}")
+    print(f"💾 Total Size Saved: {total_saved} bytes")
+
+
+def _display_placeholder_summary(summary: Dict[str, any]) -> None:
+    """Display image placeholder summary."""
+    print(f"\n{'='*50}")
+    print("IMAGE PLACEHOLDER SUMMARY")
+    print(f"{'='*50}")
+    sizes = [len(uri) for uri in summary['placeholders'].values()]
+    print(f"🖼️  Placeholders Built: {summary['built']}")
+    print(f"♻️  From Cache: {summary['cached']}")
+    if sizes:
+        print(f"📏 Average Inline Size: {sum(sizes) // len(sizes)} bytes")
+    files = f" in {summary['files_updated']} file(s)" if 'files_updated' in summary else ""
+    print(f"📝 Img Tags Updated: {summary['tags_updated']}{files}")
+    print(f"❌ Errors: {len(summary['errors'])}")
+    for error in summary['errors']:
+        print(f"   • {error}")
+
+
+def _display_tag_rewrite_summary(summary: Dict[str, any]) -> None:
+    """Display img tag rewrite summary."""
+    print(f"\n{'='*50}")
+    print("IMG TAG REWRITE SUMMARY")
+    print(f"{'='*50}")
+    print(f"📐 Dimensions Added: {summary['dimensions_added']}")
+    if summary['dimensions_fixed']:
+        print(f"📏 Stale Dimensions Replaced: {summary['dimensions_fixed']}")
+    print(f"💤 Lazy Loading Added: {summary['lazy_added']}")
+    print(f"🚀 Hero Images Prioritised: {summary['hero_images']}")
+    print(f"📝 Img Tags Updated: {summary['tags_updated']} in {summary['files_updated']} file(s)")
+    if summary['unknown_dimensions']:
+        print(f"⚠️  Unknown Dimensions: {summary['unknown_dimensions']} (remote or missing images)")
+
+
+def _display_favicon_summary(summary: Dict[str, any]) -> None:
+    """Display favicon generation summary."""
+    print(f"\n{'='*50}")
+    print("FAVICON SUMMARY")
+    print(f"{'='*50}")
+    print(f"🎯 Source: {summary['source']}")
+    if summary['up_to_date']:
+        print("♻️  Icons Already Up To Date")
+    for path in summary['files']:
+        print(f"✅ {os.path.basename(path)} ({os.path.getsize(path)} bytes)")
+    print(f"📝 Pages Linked: {summary['files_updated']} updated")
+    print(f"❌ Errors: {len(summary['errors'])}")
+    for error in summary['errors']:
+        print(f"   • {error}")
+
+
 def _display_image_issues_summary(issues: Dict[str, int]) -> None:
     """Display image issues summary."""
     print(f"\n{'='*50}")
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Image Tag Rewriter Module
+
+One-pass <img> tag fixer for generated pages of the Casino Website
+Generator.
+
+- Missing width/height attributes are filled in from the image metadata
+  index (header reads only), so browsers reserve the space and the layout
+  does not shift as images arrive; a lone width or height gets its partner
+  from the aspect ratio, and a pair that no longer matches the image's
+  aspect ratio (e.g. after resizing) is replaced by its intrinsic size
+- The hero image gets fetchpriority="high" (and never loading="lazy")
+- Images below the fold get loading="lazy" and decoding="async"
+- Extra per-tag transforms (such as placeholders) run in the same pass, so
+  each HTML file is read once and written at most once
+"""
+
+import os
+import re
+from typing import List, Dict, Tuple, Optional, Callable, Any
+
+from image_metadata import get_image_metadata
+from file_utils import write_atomic
+
+
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+HERO_CONTAINER_PATTERN = re.compile(
+    r'<([a-z][a-z0-9]*)\b[^>]*\b(?:class|id)\s*=\s*["\'][^"\']*\bhero\b', re.IGNORECASE)
+HEADER_END_PATTERN = re.compile(r'</header\s*>', re.IGNORECASE)
+HERO_NAME_PATTERN = re.compile(r'hero|banner', re.IGNORECASE)
+ASPECT_TOLERANCE = 0.02
+
+# Transform signature: (tag, local image path or None) -> tag
+TagTransform = Callable[[str, Optional[str]], str]
+
+
+def rewrite_img_tags(html_files: List[str], transforms: Optional[List[TagTransform]] = None) -> Dict[str, Any]:
+    """
+    Add dimensions and loading hints to every <img> tag, one write per file.
+
+    Args:
+        html_files (list): HTML files to rewrite
+        transforms (list): Extra callables applied to each tag in the same pass
+
+    Returns:
+        dict: {'files_updated', 'tags_updated', 'dimensions_added', 'dimensions_fixed',
+               'lazy_added', 'hero_images', 'unknown_dimensions'}
+    """
+    stats = {'files_updated': 0, 'tags_updated': 0, 'dimensions_added': 0, 'dimensions_fixed': 0,
+             'lazy_added': 0, 'hero_images': 0, 'unknown_dimensions': 0}
+
+    for html_file in html_files:
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        new_content = rewrite_img_tags_in_html(content, os.path.dirname(os.path.abspath(html_file)),
+                                               transforms, stats)
+        if new_content != content:
+            write_atomic(html_file, new_content.encode('utf-8'))
+            stats['files_updated'] += 1
+
+    return stats
+
+
+def rewrite_img_tags_in_html(content: str, html_dir: str, transforms: Optional[List[TagTransform]] = None,
+                             stats: Optional[Dict[str, int]] = None) -> str:
+    """
+    Rewrite the <img> tags of one HTML document.
+
+    Args:
+        content (str): HTML source
+        html_dir (str): Directory relative src paths resolve against
+        transforms (list): Extra callables applied to each tag
+        stats (dict): Counters to update (see rewrite_img_tags)
+
+    Returns:
+        str: The rewritten HTML
+    """
+    stats = stats if stats is not None else {}
+    tags = list(IMG_TAG_PATTERN.finditer(content))
+    if not tags:
+        return content
+
+    hero_index, fold = _find_hero_and_fold(content, tags)
+    output = []
+    position = 0
+
+    for number, match in enumerate(tags):
+        tag = match.group(0)
+        src = get_attribute(tag, 'src')
+        source = None
+        if src and not re.match(r'^([a-z]+:|//)', src, re.IGNORECASE):
+            source = os.path.normpath(os.path.join(html_dir, src.split('?')[0].split('#')[0]))
+
+        new_tag = _add_dimensions(tag, source, stats)
+        if number == hero_index:
+            new_tag = remove_attribute(new_tag, 'loading')
+            if get_attribute(new_tag, 'fetchpriority') is None:
+                new_tag = set_attribute(new_tag, 'fetchpriority', 'high')
+                stats['hero_images'] = stats.get('hero_images', 0) + 1
+        elif match.start() >= fold:
+            if get_attribute(new_tag, 'loading') is None:
+                new_tag = set_attribute(new_tag, 'loading', 'lazy')
+                stats['lazy_added'] = stats.get('lazy_added', 0) + 1
+            if get_attribute(new_tag, 'decoding') is None:
+                new_tag = set_attribute(new_tag, 'decoding', 'async')
+        for transform in transforms or []:
+            new_tag = transform(new_tag, source)
+
+        if new_tag != tag:
+            stats['tags_updated'] = stats.get('tags_updated', 0) + 1
+        output.append(content[position:match.start()])
+        output.append(new_tag)
+        position = match.end()
+
+    output.append(content[position:])
+    return "".join(output)
+
+
+def get_attribute(tag: str, name: str) -> Optional[str]:
+    """
+    Get an attribute value from a tag.
+
+    Args:
+        tag (str): HTML start tag
+        name (str): Attribute name
+
+    Returns:
+        str or None: The value ('' for a bare attribute), or None if absent
+    """
+    match = _attribute_pattern(name).search(tag)
+    if not match:
+        return None
+    value = match.group(1)
+    if value is None:
+        return ''
+    return value[1:-1] if value[:1] in ('"', "'") else value
+
+
+def set_attribute(tag: str, name: str, value: str) -> str:
+    """
+    Set an attribute on a tag, replacing it if present or appending it otherwise.
+
+    Args:
+        tag (str): HTML start tag
+        name (str): Attribute name
+        value (str): New value (must not contain double quotes)
+
+    Returns:
+        str: The rewritten tag
+    """
+    attribute = f'{name}="{value}"'
+    match = _attribute_pattern(name).search(tag)
+    if match:
+        return tag[:match.start()] + attribute + tag[match.end():]
+    closing = ' />' if tag.endswith('/>') else '>'
+    return f'{tag[:-len(closing.strip())].rstrip()} {attribute}{closing}'
+
+
+def remove_attribute(tag: str, name: str) -> str:
+    """Remove an attribute (and the space before it) from a tag."""
+    match = _attribute_pattern(name).search(tag)
+    if not match:
+        return tag
+    start = match.start()
+    while start > 0 and tag[start - 1].isspace():
+        start -= 1
+    return tag[:start] + tag[match.end():]
+
+
+# Private helper functions
+
+def _attribute_pattern(name: str) -> re.Pattern:
+    """Pattern for one attribute, not matching longer names such as data-src for src."""
+    return re.compile(r'(?<![\w:-])' + re.escape(name) +
+                      r'(?:\s*=\s*("[^"]*"|\'[^\']*\'|[^\s"\'=<>`]+))?(?=[\s/>])', re.IGNORECASE)
+
+
+def _add_dimensions(tag: str, source: Optional[str], stats: Dict[str, int]) -> str:
+    """Fill in missing width/height, or replace a stale pair, from the image's intrinsic size."""
+    width, height = get_attribute(tag, 'width'), get_attribute(tag, 'height')
+    both_set = width is not None and height is not None
+    if both_set and not (width.isdigit() and height.isdigit() and int(width) and int(height)):
+        return tag
+
+    metadata = get_image_metadata(source) if source else None
+    if not metadata or not metadata.get('width') or not metadata.get('height'):
+        if not both_set:
+            stats['unknown_dimensions'] = stats.get('unknown_dimensions', 0) + 1
+        return tag
+    intrinsic_width, intrinsic_height = metadata['width'], metadata['height']
+
+    if both_set:
+        # Pixel sizes of another aspect ratio would distort the image; they are
+        # usually left over from before the image was resized or replaced
+        ratio = intrinsic_width / intrinsic_height
+        if abs(int(width) / int(height) - ratio) <= ratio * ASPECT_TOLERANCE:
+            return tag
+        stats['dimensions_fixed'] = stats.get('dimensions_fixed', 0) + 1
+        return set_attribute(set_attribute(tag, 'width', str(round(intrinsic_width))),
+                             'height', str(round(intrinsic_height)))
+
+    if width is not None and width.isdigit():
+        height = str(max(1, round(int(width) * intrinsic_height / intrinsic_width)))
+    elif height is not None and height.isdigit():
+        width = str(max(1, round(int(height) * intrinsic_width / intrinsic_height)))
+    elif width is None and height is None:
+        width, height = str(round(intrinsic_width)), str(round(intrinsic_height))
+    else:
+        # A percentage or other non-pixel value; leave it to the author
+        return tag
+
+    stats['dimensions_added'] = stats.get('dimensions_added', 0) + 1
+    return set_attribute(set_attribute(tag, 'width', width), 'height', height)
+
+
+def _find_hero_and_fold(content: str, tags: List[re.Match]) -> Tuple[Optional[int], int]:
+    """
+    Locate the hero image and the end of the first screen.
+
+    The hero is the first image inside the first element whose class or id
+    contains "hero", and the fold is where that element ends. Without one,
+    the first image named like a hero or banner is the hero, and the fold
+    follows it (or the page <header>, or the first image).
+    """
+    container = HERO_CONTAINER_PATTERN.search(content)
+    if container:
+        end = _element_end(content, container.group(1), container.start())
+        inside = [number for number, tag in enumerate(tags) if container.start() <= tag.start() < end]
+        return (inside[0] if inside else None), end
+
+    for number, tag in enumerate(tags):
+        if HERO_NAME_PATTERN.search(get_attribute(tag.group(0), 'src') or ''):
+            return number, tag.end()
+
+    header_end = HEADER_END_PATTERN.search(content)
+    if header_end:
+        return None, header_end.end()
+    return None, tags[0].end()
+
+
+def _element_end(content: str, name: str, start: int) -> int:
+    """Find the end of the element opened at start by counting nested tags of the same name."""
+    pattern = re.compile(r'<(/?)' + re.escape(name) + r'\b[^>]*>', re.IGNORECASE)
+    depth = 0
+    for match in pattern.finditer(content, start):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return match.end()
+    return len(content)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Link Checker Module
+
+Verifies external URLs for the Casino Website Generator: operator URLs in
+master/offers, regulator URLs in master/footer and absolute hrefs in the
+generated HTML.
+
+- One pooled requests.Session shared by a bounded thread pool
+- Per-host rate limiting so no site sees a burst of requests
+- HEAD first, falling back to GET for servers that reject HEAD
+- A 429 backs off the whole host for its Retry-After before retrying
+- Results cached on disk with a TTL, so re-checks only hit the network
+  for new or expired URLs
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Iterable
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from section_renderer import normalise_offers, normalise_badges
+from file_utils import write_atomic
+
+
+LINK_CACHE_FILE = os.path.join(".build-cache", "link-cache.json")
+DEFAULT_WORKERS = 16
+DEFAULT_TIMEOUT = 10
+DEFAULT_HOST_INTERVAL = 0.5  # seconds between requests to the same host
+OK_TTL = 24 * 60 * 60
+FAILED_TTL = 60 * 60
+USER_AGENT = "CasinoWebsiteGenerator-LinkChecker/1.0"
+RATE_LIMIT_RETRIES = 2
+DEFAULT_RATE_LIMIT_BACKOFF = 5.0  # seconds, when a 429 has no Retry-After
+MAX_RETRY_AFTER = 60.0
+
+# Statuses that often mean "HEAD not supported" rather than a broken link
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 500, 501, 503}
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host by a minimum interval."""
+
+    def __init__(self, interval: float = DEFAULT_HOST_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, host: str) -> None:
+        """Block until the next request to host may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def back_off(self, host: str, delay: float) -> None:
+        """Hold every request to host for delay seconds (e.g. after a 429)."""
+        with self._lock:
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + delay)
+
+
+class LinkChecker:
+    """Concurrent, rate-limited, cached external link checker."""
+
+    def __init__(self, cache_path: Optional[str] = None, workers: int = DEFAULT_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT, host_interval: float = DEFAULT_HOST_INTERVAL,
+                 session: Optional[requests.Session] = None):
+        if cache_path is None:
+            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            cache_path = os.path.join(current_dir, LINK_CACHE_FILE)
+        self.cache_path = cache_path
+        self.workers = workers
+        self.timeout = timeout
+        self.rate_limiter = HostRateLimiter(host_interval)
+        self.session = session or self._create_session(workers)
+        self.cache = self._load_cache()
+        self._cache_lock = threading.Lock()
+
+    def check_urls(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Check URLs, serving fresh results from the cache.
+
+        Args:
+            urls (iterable): URLs to check (whitespace is stripped, duplicates merged)
+
+        Returns:
+            dict: URL mapped to {'ok', 'status', 'final_url', 'error', 'checked_at', 'cached'}
+        """
+        unique_urls = sorted({url.strip() for url in urls if url and url.strip()})
+        results = {}
+        pending = []
+
+        now = time.time()
+        for url in unique_urls:
+            cached = self.cache.get(url)
+            if cached and now - cached['checked_at'] < (OK_TTL if cached['ok'] else FAILED_TTL):
+                results[url] = dict(cached, cached=True)
+            else:
+                pending.append(url)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for url, result in zip(pending, pool.map(self.check_url, pending)):
+                    results[url] = dict(result, cached=False)
+            self._save_cache()
+
+        return results
+
+    def check_url(self, url: str) -> Dict:
+        """
+        Check a single URL with HEAD, falling back to GET.
+
+        Args:
+            url (str): Absolute http(s) URL
+
+        Returns:
+            dict: Check result (also stored in the cache)
+        """
+        result = {'ok': False, 'status': None, 'final_url': url, 'error': None, 'checked_at': time.time()}
+        host = urlsplit(url).netloc.lower()
+
+        try:
+            response = self._send("HEAD", url, host)
+            if response.status_code in HEAD_FALLBACK_STATUSES:
+                response = self._send("GET", url, host)
+            result['status'] = response.status_code
+            result['final_url'] = response.url
+            result['ok'] = response.status_code < 400
+        except requests.RequestException as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+
+        with self._cache_lock:
+            self.cache[url] = result
+        return result
+
+    def close(self) -> None:
+        """Close the pooled session."""
+        self.session.close()
+
+    def _send(self, method: str, url: str, host: str) -> requests.Response:
+        """Send one rate-limited request, backing the host off and retrying on 429."""
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.wait(host)
+            response = self.session.request(method, url, timeout=self.timeout, allow_redirects=True,
+                                            stream=method == "GET")
+            response.close()
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                return response
+            self.rate_limiter.back_off(host, _retry_after(response))
+        return response
+
+    def _create_session(self, pool_size: int) -> requests.Session:
+        """Create a keep-alive session with a connection pool per host."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = USER_AGENT
+        return session
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        """Load cached results from disk."""
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self) -> None:
+        """Write cached results to disk atomically."""
+        with self._cache_lock:
+            data = json.dumps(self.cache, indent=1, sort_keys=True)
+        write_atomic(self.cache_path, data.encode('utf-8'))
+
+
+def collect_master_urls(master_dir: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Collect operator and regulator URLs from master/offers and master/footer.
+
+    Args:
+        master_dir (str): Optional master directory override
+
+    Returns:
+        dict: URL mapped to the data files that reference it
+    """
+    if master_dir is None:
+        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        master_dir = os.path.join(current_dir, "master")
+
+    sources: Dict[str, List[str]] = {}
+    for content_type, normalise in [("offers", normalise_offers), ("footer", normalise_badges)]:
+        content_dir = os.path.join(master_dir, content_type)
+        if not os.path.isdir(content_dir):
+            continue
+        for root, dirs, files in os.walk(content_dir):
+            for file in files:
+                if not file.endswith('.json'):
+                    continue
+                json_file = os.path.join(root, file)
+                try:
+                    with open(json_file, 'r', encoding='utf-8') as f:
+                        entries = normalise(json.load(f))
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  Could not read {json_file}: {e}")
+                    continue
+                for entry in entries:
+                    if entry["url"].startswith(("http://", "https://")):
+                        sources.setdefault(entry["url"], []).append(os.path.relpath(json_file, master_dir))
+    return sources
+
+
+def collect_html_urls(web_folder: str) -> Dict[str, List[str]]:
+    """
+    Collect absolute http(s) hrefs from generated HTML files.
+
+    Args:
+        web_folder (str): Path to web-folder directory
+
+    Returns:
+        dict: URL mapped to the HTML files that reference it
+    """
+    href_pattern = re.compile(r'<a\b[^>]*href\s*=\s*["\'](https?://[^"\']+)["\']', re.IGNORECASE)
+    sources: Dict[str, List[str]] = {}
+    for root, dirs, files in os.walk(web_folder):
+        for file in files:
+            if not file.endswith('.html'):
+                continue
+            html_file = os.path.join(root, file)
+            with open(html_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+            for url in href_pattern.findall(content):
+                sources.setdefault(url.strip(), []).append(os.path.relpath(html_file, web_folder))
+    return sources
+
+
+def check_links(web_folder: Optional[str] = None, include_master: bool = True,
+                checker: Optional[LinkChecker] = None) -> Dict[str, any]:
+    """
+    Check master data URLs and generated page links.
+
+    Args:
+        web_folder (str): Generated site to scan (skipped if None)
+        include_master (bool): Also check master/offers and master/footer URLs
+        checker (LinkChecker): Optional pre-configured checker
+
+    Returns:
+        dict: Results in the error_checker format (status, issues, count)
+    """
+    sources: Dict[str, List[str]] = {}
+    if include_master:
+        for url, files in collect_master_urls().items():
+            sources.setdefault(url, []).extend(files)
+    if web_folder and os.path.exists(web_folder):
+        for url, files in collect_html_urls(web_folder).items():
+            sources.setdefault(url, []).extend(files)
+
+    own_checker = checker is None
+    checker = checker or LinkChecker()
+    try:
+        started = time.monotonic()
+        results = checker.check_urls(sources)
+        elapsed = time.monotonic() - started
+    finally:
+        if own_checker:
+            checker.close()
+
+    issues = []
+    for url, result in sorted(results.items()):
+        if not result['ok']:
+            issues.append({
+                'url': url,
+                'status': result['status'],
+                'error': result['error'],
+                'files': sorted(set(sources.get(url, [])))
+            })
+
+    cached = sum(1 for result in results.values() if result['cached'])
+    print(f"Checked {len(results)} external link(s) in {elapsed:.1f}s ({cached} from cache)")
+
+    return {
+        'status': 'PASS' if not issues else 'FAIL',
+        'issues': issues,
+        'count': len(issues)
+    }
+
+
+# Private helper functions
+
+def _retry_after(response: requests.Response) -> float:
+    """Seconds a 429 asks to wait (Retry-After in seconds or as a date), capped at MAX_RETRY_AFTER."""
+    value = response.headers.get("Retry-After", "").strip()
+    delay = DEFAULT_RATE_LIMIT_BACKOFF
+    if value.isdigit():
+        delay = float(value)
+    elif value:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            pass
+    return min(MAX_RETRY_AFTER, max(0.0, delay))
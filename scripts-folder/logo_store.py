@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Logo Store Module
+
+Optimises master offer logos and footer badges once into a content-addressed
+store shared by every build of the Casino Website Generator.
+
+Store layout (.build-cache/logo-store/):
+- objects/<key[:2]>/<key>/<file>  Optimised output, keyed by source hash + profile
+- index.json                      Master path → size, mtime and source hash
+
+configure_template() copies optimised logos from the store, so each site
+ships small files without paying the optimisation cost again.
+"""
+
+import os
+import re
+import io
+import json
+import hashlib
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Tuple, Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for raster logos
+    Image = None
+
+from svg_optimizer import optimize_svg_data
+from file_utils import write_atomic, hash_file
+
+
+LOGO_STORE_DIR = os.path.join(".build-cache", "logo-store")
+STORE_VERSION = "2"
+RASTER_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.webp', '.gif']
+
+# Display boxes (width, height) at 2x for retina screens
+LOGO_PROFILES = {
+    "offers": (320, 96),
+    "footer": (240, 80)
+}
+
+
+def ingest_master_logos(workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Optimise every logo under master/offers and master/footer into the store.
+
+    Logos whose source hash is already in the store are skipped.
+
+    Args:
+        workers (int): Process pool size (defaults to CPU count)
+
+    Returns:
+        dict: Counts of optimised, cached and failed logos and bytes saved
+    """
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    master_dir = os.path.join(current_dir, "master")
+    store_dir = get_store_dir()
+    index = _load_index(store_dir)
+
+    stats = {'optimised': 0, 'cached': 0, 'failed': 0, 'bytes_saved': 0}
+    jobs = []
+
+    for profile in LOGO_PROFILES:
+        profile_dir = os.path.join(master_dir, profile)
+        if not os.path.isdir(profile_dir):
+            continue
+        for country in sorted(os.listdir(profile_dir)):
+            country_dir = os.path.join(profile_dir, country)
+            if not os.path.isdir(country_dir):
+                continue
+            for name in sorted(os.listdir(country_dir)):
+                source = os.path.join(country_dir, name)
+                if not _is_logo_file(source):
+                    continue
+                key = _get_object_key(source, profile, index, master_dir)
+                if os.path.exists(_get_object_path(store_dir, key, name)):
+                    stats['cached'] += 1
+                else:
+                    jobs.append((source, profile, _get_object_path(store_dir, key, name)))
+
+    if jobs:
+        print(f"Optimising {len(jobs)} logo(s) into {store_dir}...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (source, _, _), result in zip(jobs, pool.map(_optimise_job, jobs)):
+                original_size, optimised_size, error = result
+                if error:
+                    stats['failed'] += 1
+                    print(f"  ❌ {os.path.relpath(source, master_dir)}: {error}")
+                else:
+                    stats['optimised'] += 1
+                    stats['bytes_saved'] += original_size - optimised_size
+
+    _save_index(store_dir, index)
+    _display_ingest_summary(stats)
+    return stats
+
+
+def get_optimised_logo(source_path: str, profile: str) -> Optional[str]:
+    """
+    Get the store path of the optimised version of a master logo.
+
+    Args:
+        source_path (str): Path of the master logo
+        profile (str): "offers" or "footer"
+
+    Returns:
+        str or None: Path to the optimised file, or None if not ingested yet
+    """
+    if profile not in LOGO_PROFILES or not _is_logo_file(source_path):
+        return None
+
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    master_dir = os.path.join(current_dir, "master")
+    store_dir = get_store_dir()
+    index = _load_index(store_dir)
+
+    key = _get_object_key(source_path, profile, index, master_dir, update=False)
+    object_path = _get_object_path(store_dir, key, os.path.basename(source_path))
+    return object_path if os.path.exists(object_path) else None
+
+
+def optimise_logo(source_path: str, dest_path: str, profile: str) -> Tuple[int, int]:
+    """
+    Write an optimised copy of a logo.
+
+    SVGs are minified; rasters are downscaled to fit the profile's display
+    box and re-encoded in their own format. Output that would be larger than
+    the source is replaced by a plain copy.
+
+    Args:
+        source_path (str): Source logo
+        dest_path (str): Destination file (written atomically)
+        profile (str): "offers" or "footer"
+
+    Returns:
+        tuple: (original_size, optimised_size)
+    """
+    with open(source_path, 'rb') as f:
+        original = f.read()
+
+    extension = os.path.splitext(source_path)[1].lower()
+    if extension == '.svg':
+        optimised = minify_svg(original.decode('utf-8', errors='replace')).encode('utf-8')
+    elif extension in RASTER_EXTENSIONS and Image is not None:
+        optimised = _optimise_raster(original, extension, LOGO_PROFILES[profile])
+    else:
+        optimised = original
+
+    if len(optimised) >= len(original):
+        optimised = original
+
+    write_atomic(dest_path, optimised)
+    return len(original), len(optimised)
+
+
+def minify_svg(svg_content: str) -> str:
+    """
+    Minify SVG markup without changing how it renders.
+
+    Runs the streaming SVG optimiser (metadata and editor namespaces
+    stripped, numbers rounded, groups collapsed, embedded rasters
+    recompressed and deduplicated). Markup it cannot parse gets the regex
+    clean-up instead: XML prolog, comments, metadata blocks, editor
+    namespaces and whitespace between tags are removed.
+
+    Args:
+        svg_content (str): SVG document
+
+    Returns:
+        str: Minified SVG document
+    """
+    try:
+        return optimize_svg_data(svg_content.encode('utf-8')).decode('utf-8')
+    except (ET.ParseError, ValueError):
+        pass
+
+    content = re.sub(r'<\?xml[^>]*\?>', '', svg_content)
+    content = re.sub(r'<!DOCTYPE[^>]*>', '', content, flags=re.IGNORECASE)
+    content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
+    content = re.sub(r'<metadata\b.*?</metadata>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<(sodipodi|inkscape):[^>]*/>', '', content)
+    content = re.sub(r'<(sodipodi|inkscape):(\w+)\b.*?</\1:\2>', '', content, flags=re.DOTALL)
+    content = re.sub(r'\s+(sodipodi|inkscape|xmlns:(sodipodi|inkscape|dc|cc|rdf))(:[\w-]+)?="[^"]*"', '', content)
+    content = re.sub(r'>\s+<', '><', content)
+    return content.strip()
+
+
+def get_store_dir() -> str:
+    """Get the logo store directory, creating it if needed."""
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    store_dir = os.path.join(current_dir, LOGO_STORE_DIR)
+    os.makedirs(store_dir, exist_ok=True)
+    return store_dir
+
+
+# Private helper functions
+
+def _optimise_job(job: Tuple[str, str, str]) -> Tuple[int, int, Optional[str]]:
+    """Process pool entry point for optimise_logo()."""
+    source, profile, dest = job
+    try:
+        original_size, optimised_size = optimise_logo(source, dest, profile)
+        return original_size, optimised_size, None
+    except Exception as e:
+        return 0, 0, str(e)
+
+
+def _optimise_raster(data: bytes, extension: str, box: Tuple[int, int]) -> bytes:
+    """Downscale a raster logo into its display box and re-encode it."""
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        image.thumbnail(box, Image.LANCZOS)
+
+        output = io.BytesIO()
+        if extension in ['.jpg', '.jpeg']:
+            image.convert('RGB').save(output, 'JPEG', quality=85, optimize=True, progressive=True)
+        elif extension == '.webp':
+            image.save(output, 'WEBP', quality=85, method=6)
+        elif extension == '.gif':
+            image.save(output, 'GIF', optimize=True)
+        else:
+            image.save(output, 'PNG', optimize=True)
+        return output.getvalue()
+
+
+def _is_logo_file(path: str) -> bool:
+    """Check whether a path is a logo the store can handle."""
+    extension = os.path.splitext(path)[1].lower()
+    return os.path.isfile(path) and (extension == '.svg' or extension in RASTER_EXTENSIONS)
+
+
+def _get_object_key(source_path: str, profile: str, index: Dict[str, Dict],
+                    master_dir: str, update: bool = True) -> str:
+    """Get the store key for a logo, reusing the indexed hash when unchanged."""
+    stat = os.stat(source_path)
+    relative_path = os.path.relpath(source_path, master_dir)
+    entry = index.get(relative_path)
+
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        source_hash = entry['sha256']
+    else:
+        source_hash = hash_file(source_path)
+        if update:
+            index[relative_path] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': source_hash
+            }
+
+    return hashlib.sha256(f"{source_hash}:{profile}:{STORE_VERSION}".encode()).hexdigest()
+
+
+def _get_object_path(store_dir: str, key: str, file_name: str) -> str:
+    """Get the path of a stored object."""
+    return os.path.join(store_dir, "objects", key[:2], key, file_name)
+
+
+def _load_index(store_dir: str) -> Dict[str, Dict]:
+    """Load the master path → source hash index."""
+    index_file = os.path.join(store_dir, "index.json")
+    if not os.path.exists(index_file):
+        return {}
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(store_dir: str, index: Dict[str, Dict]) -> None:
+    """Save the index atomically."""
+    write_atomic(os.path.join(store_dir, "index.json"),
+                 json.dumps(index, indent=2, sort_keys=True).encode('utf-8'))
+
+
+def _display_ingest_summary(stats: Dict[str, int]) -> None:
+    """Display logo ingest summary."""
+    print(f"\n{'='*50}")
+    print("LOGO STORE SUMMARY")
+    print(f"{'='*50}")
+    print(f"✅ Logos Optimised: {stats['optimised']}")
+    print(f"♻️  Already In Store: {stats['cached']}")
+    print(f"💾 Total Size Saved: {stats['bytes_saved']} bytes")
+    print(f"❌ Errors: {stats['failed']}")
+    if Image is None:
+        print("⚠️  Pillow is not installed - raster logos were stored unchanged")
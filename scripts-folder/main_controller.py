@@ -18,6 +18,11 @@ from component_importer import import_components
 from image_downloader import download_images
 from error_checker import error_checking
 from cleanup_manager import cleanup
+from logo_store import ingest_master_logos
+from link_checker import check_links
+from country_onboarding import onboard_countries
+from stock_packs import build_pack, get_stock_source
+from perceptual_hash import report_near_duplicates
 
 
 def main():
@@ -174,22 +179,142 @@ def show_module_info():
         "country_config.py": {
             "description": "Handles country selection and content copying",
             "main_function": "configure_template()",
-            "features": ["Country selection", "Footer content copying", "Offers content copying"]
+            "features": ["Country selection", "Footer content copying", "Offers content copying", "Number of offers"]
+        },
+        "country_onboarding.py": {
+            "description": "Bulk-adds markets to master/ from a CSV or JSON manifest",
+            "main_function": "onboard_countries()",
+            "features": ["Manifest validation", "Key normalisation", "Parallel logo optimisation", "Atomic country directories"]
+        },
+        "message_catalog.py": {
+            "description": "Compiled per-country message catalogs for localised pages",
+            "main_function": "load_catalog()",
+            "features": ["Binary memory-mapped catalogs", "Default-language fallback", "One-pass page localisation"]
+        },
+        "logo_store.py": {
+            "description": "Content-addressed store of optimised master logos",
+            "main_function": "ingest_master_logos()",
+            "features": ["SVG minification", "Raster downscaling", "Source-hash keyed cache", "Shared across builds"]
+        },
+        "sprite_builder.py": {
+            "description": "Packs country badges and offer logos into sprites",
+            "main_function": "build_sprites()",
+            "features": ["Shelf-packed PNG atlas", "SVG <symbol> sprite", "CSS sprite classes", "<use> references"]
+        },
+        "link_checker.py": {
+            "description": "Checks operator, regulator and page links",
+            "main_function": "check_links()",
+            "features": ["Pooled HTTP session", "Bounded concurrency", "Per-host rate limiting", "HEAD-then-GET", "TTL result cache"]
         },
         "component_importer.py": {
             "description": "Enhanced component system with JSON configuration and modular files",
             "main_function": "import_components()",
             "features": ["JSON-based component configuration", "Modular file structure", "Advanced theming system", "Real component files (not templates)"]
         },
+        "section_renderer.py": {
+            "description": "Renders country offers and regulator badges from master data",
+            "main_function": "render_country_sections()",
+            "features": ["Compiled section templates", "Offers data normalisation", "Top-N offer selection", "Batch rendering"]
+        },
         "image_downloader.py": {
             "description": "Downloads and manages website images",
             "main_function": "download_images()",
             "features": ["Unsplash API integration", "AI image generation", "Image organization"]
         },
+        "image_cache.py": {
+            "description": "Content-addressed cache of downloaded images shared across builds",
+            "main_function": "ImageCache",
+            "features": ["(query, params, remote ID) keys", "Deduplicated image objects", "Cached search results", "LRU disk-budget eviction"]
+        },
+        "ai_generator.py": {
+            "description": "Deduplicated, cached AI image generation queue",
+            "main_function": "GenerationQueue",
+            "features": ["Prompt/size normalisation", "Persistent result cache", "In-flight deduplication", "OpenAI and mock backends"]
+        },
+        "image_planner.py": {
+            "description": "Fills only the manifest images a site is missing",
+            "main_function": "fill_missing_images()",
+            "features": ["Single scandir snapshot", "Missing/undersized/wrong-format detection", "Parallel fetch", "Process-pool resize"]
+        },
+        "stock_packs.py": {
+            "description": "Versioned, hash-indexed stock image packs",
+            "main_function": "update_pack() / install_pack()",
+            "features": ["Local or mirrored pack sources", "Delta updates by content hash", "Hardlinked installs", "Offline builds"]
+        },
+        "image_metadata.py": {
+            "description": "Header-only metadata index for site images",
+            "main_function": "load_image_index() / get_image_metadata()",
+            "features": ["PNG, JPEG, WebP, GIF and SVG header parsing", "Content hash and dominant colour", "Incremental refresh by mtime"]
+        },
+        "image_resizer.py": {
+            "description": "Parallel reshaping to standard image aspect ratios",
+            "main_function": "resize_image_set()",
+            "features": ["Entropy and edge based crops for photos", "Scale-and-pad fit for logos and icons", "Source resolution kept for responsive variants", "JPEG draft decoding", "Process pool sized to the CPU count"]
+        },
+        "responsive_images.py": {
+            "description": "Single-decode resize pyramids and srcset rewriting",
+            "main_function": "build_responsive_sets() / rewrite_img_srcsets()",
+            "features": ["480/768/1200/2400 variants from one decode", "Each level resampled from the previous one", "srcset and sizes on matching img tags"]
+        },
+        "modern_formats.py": {
+            "description": "AVIF/WebP conversion at a fixed perceptual quality",
+            "main_function": "convert_to_modern_formats() / rewrite_picture_elements()",
+            "features": ["SSIM-guided quality binary search", "Process pool encoding", "<picture> elements with original fallback"]
+        },
+        "svg_optimizer.py": {
+            "description": "Streaming SVG optimisation",
+            "main_function": "optimize_svg() / optimize_svg_tree()",
+            "features": ["Incremental XML parsing", "Editor cruft and metadata removal", "Path precision rounding", "Embedded raster recompression, deduplication and extraction"]
+        },
+        "memory_budget.py": {
+            "description": "Memory-bounded image process pools",
+            "main_function": "bounded_map() / bounded_pipeline() / estimate_decoded_bytes()",
+            "features": ["Decoded size estimated from image headers", "JPEG draft() reduction taken into account", "Jobs admitted against a global budget (IMAGE_MEMORY_BUDGET_MB)"]
+        },
+        "shared_frames.py": {
+            "description": "Zero-copy frame passing between image pool stages",
+            "main_function": "share_image() / open_frame() / frame_array()",
+            "features": ["Decoded pixels in multiprocessing.shared_memory blocks", "Read-only Pillow and NumPy views without copies", "Frames released as soon as a stage drops them", "Inline fallback when /dev/shm is too small"]
+        },
+        "file_utils.py": {
+            "description": "File helpers shared by the build stages",
+            "main_function": "write_atomic() / hash_file()",
+            "features": ["Temporary file renamed into place", "Streaming SHA-256 of files"]
+        },
+        "build_manifest.py": {
+            "description": "Incremental image builds",
+            "main_function": "load_build_manifest() / BuildManifest.is_up_to_date()",
+            "features": ["Source hash, parameters and output hashes per operation", "Re-hashes only files whose size or mtime changed", "Shared by optimize, resize, responsive and convert stages"]
+        },
+        "image_placeholders.py": {
+            "description": "Inline low-quality image placeholders",
+            "main_function": "build_placeholders() / inject_placeholders()",
+            "features": ["16px premultiplied box average with numpy", "WebP or PNG data URIs, whichever is smaller", "Cached by content hash", "Background cleared when the image loads"]
+        },
+        "img_tag_rewriter.py": {
+            "description": "One-pass img tag fixer for generated pages",
+            "main_function": "rewrite_img_tags()",
+            "features": ["width/height from the image metadata index", "Lazy loading and async decoding below the fold", "fetchpriority on the hero image", "Each HTML file written at most once"]
+        },
+        "favicon_builder.py": {
+            "description": "Favicon and touch-icon set generation",
+            "main_function": "build_favicon_set() / insert_icon_links()",
+            "features": ["favicon.ico with 16/32/48px frames", "Apple touch icon and maskable PWA icons from one decode", "Square-viewBox favicon.svg for SVG logos", "Icon links replaced in every page head"]
+        },
+        "perceptual_hash.py": {
+            "description": "Near-duplicate image detection",
+            "main_function": "find_near_duplicates() / report_near_duplicates()",
+            "features": ["Vectorised dHash and pHash", "BK-tree Hamming distance search", "Cached hashes keyed by content", "Keeper chosen by format and size"]
+        },
+        "fetch_scheduler.py": {
+            "description": "Quota-aware scheduling of image API requests",
+            "main_function": "FetchScheduler.run()",
+            "features": ["Header-driven token bucket", "Required manifest images first", "Persisted queue for unfinished work"]
+        },
         "error_checker.py": {
             "description": "Validates generated websites for errors",
             "main_function": "error_checking()",
-            "features": ["Link validation", "HTML/CSS/JS syntax checking", "Casino compliance"]
+            "features": ["Link validation", "External link checking", "HTML/CSS/JS syntax checking", "Casino compliance"]
         },
         "cleanup_manager.py": {
             "description": "Optimizes and cleans up generated websites",
@@ -289,9 +414,30 @@ if __name__ == "__main__":
             quick_build()
         elif arg == "status":
             show_project_status()
+        elif arg == "logos":
+            ingest_master_logos()
+        elif arg == "onboard":
+            if len(sys.argv) < 3:
+                print("Usage: python main_controller.py onboard <manifest.csv|manifest.json> [--replace]")
+            else:
+                onboard_countries(sys.argv[2], replace="--replace" in sys.argv[3:])
+        elif arg == "stock-pack":
+            if len(sys.argv) < 5:
+                print("Usage: python main_controller.py stock-pack <name> <version> <images_dir> [source_dir]")
+            else:
+                pack_source = sys.argv[5] if len(sys.argv) > 5 else get_stock_source()
+                pack = build_pack(sys.argv[2], sys.argv[3], sys.argv[4], pack_source)
+                print(f"✅ Published {sys.argv[2]} {sys.argv[3]} ({len(pack['entries'])} entries) to {pack_source}")
+        elif arg == "links":
+            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            link_results = check_links(os.path.join(current_dir, "web-folder"))
+            for issue in link_results['issues']:
+                print(f"  ❌ {issue['url']} ({issue['status'] or issue['error']}) in {', '.join(issue['files'])}")
+        elif arg == "duplicates":
+            report_near_duplicates()
         else:
             print(f"Unknown command: {arg}")
-            print("Available commands: country, components, images, check, cleanup, workflow, quick, status")
+            print("Available commands: country, components, images, check, cleanup, workflow, quick, status, logos, links, onboard, stock-pack, duplicates")
     else:
         # Run interactive menu if no arguments
         interactive_menu() 
\ No newline at end of file
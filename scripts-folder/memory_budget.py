@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Memory Budget Module
+
+Memory-bounded process pools for the image pipeline of the Casino Website
+Generator.
+
+- The decoded size of an image is estimated from its header (via the
+  image metadata index), including the reduction a JPEG draft() decode
+  gets when only a smaller output is needed
+- Jobs are admitted to the pool only while the estimated working sets of
+  the jobs in flight fit a global budget; a job larger than the whole
+  budget runs on its own, so several 2400px+ sources are never decoded at
+  the same time on a small build worker
+- Multi-stage jobs (decode → resize → encode → hash) run each stage as a
+  separate pool task and hand decoded pixels on as shared memory frames,
+  so no pixel buffer is pickled between processes
+- The budget is IMAGE_MEMORY_BUDGET_MB when set, otherwise half of the
+  physical memory
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Tuple, Optional, Callable, Any
+
+from shared_frames import frames_in, release_frame, prepare_frame_sharing
+
+
+DEFAULT_BUDGET_FRACTION = 0.5
+FALLBACK_BUDGET = 1024 * 1024 * 1024
+
+# Bytes per pixel of Pillow's in-memory modes (RGB is stored 4 bytes wide)
+MODE_BYTES = {'1': 1, 'L': 1, 'P': 1, 'I;16': 2, 'LA': 4, 'RGB': 4, 'RGBA': 4, 'CMYK': 4, 'I': 4, 'F': 4}
+
+
+def memory_budget() -> int:
+    """
+    Get the memory budget for concurrent image jobs.
+
+    Returns:
+        int: Budget in bytes
+    """
+    configured = os.environ.get("IMAGE_MEMORY_BUDGET_MB")
+    if configured:
+        try:
+            return max(1, int(float(configured) * 1024 * 1024))
+        except ValueError:
+            pass
+    try:
+        return int(os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') * DEFAULT_BUDGET_FRACTION)
+    except (AttributeError, ValueError, OSError):
+        return FALLBACK_BUDGET
+
+
+def estimate_decoded_bytes(metadata: Dict[str, Any], target: Optional[Tuple[int, int]] = None) -> int:
+    """
+    Estimate the memory a decoded image takes, from header metadata alone.
+
+    Args:
+        metadata (dict): Image metadata index entry (format, width, height, mode)
+        target (tuple): Smallest (width, height) the caller needs; JPEGs are
+                        then assumed to be decoded with draft()
+
+    Returns:
+        int: Estimated bytes
+    """
+    width, height = int(metadata.get('width') or 0), int(metadata.get('height') or 0)
+    if metadata.get('format') == 'JPEG' and target:
+        scale = draft_scale((width, height), target)
+        width, height = -(-width // scale), -(-height // scale)
+    return width * height * MODE_BYTES.get(metadata.get('mode'), 4)
+
+
+def draft_scale(size: Tuple[int, int], target: Tuple[int, int]) -> int:
+    """
+    Get the DCT scale (1, 2, 4 or 8) a JPEG draft() decode uses for a target size.
+
+    Args:
+        size (tuple): Full (width, height)
+        target (tuple): Requested minimum (width, height)
+
+    Returns:
+        int: Reduction factor
+    """
+    scale = 1
+    while (scale < 8 and size[0] // (scale * 2) >= target[0]
+           and size[1] // (scale * 2) >= target[1]):
+        scale *= 2
+    return scale
+
+
+def bounded_map(function: Callable[[Any], Any], jobs: List[Any], costs: List[int],
+                workers: Optional[int] = None, budget: Optional[int] = None) -> List[Any]:
+    """
+    Run jobs in a process pool without exceeding a memory budget.
+
+    Jobs are submitted in order as long as their cost fits next to the jobs
+    in flight; a smaller job further down the list may start first when the
+    next one does not fit yet.
+
+    Args:
+        function (callable): Picklable process pool entry point
+        jobs (list): Job arguments
+        costs (list): Estimated peak bytes of each job
+        workers (int): Process count (defaults to the CPU count)
+        budget (int): Memory budget in bytes (defaults to memory_budget())
+
+    Returns:
+        list: Results in job order
+    """
+    if not jobs:
+        return []
+    workers = workers or os.cpu_count() or 1
+    budget = budget or memory_budget()
+    results: List[Any] = [None] * len(jobs)
+    pending = list(range(len(jobs)))
+    in_flight: Dict[Any, Tuple[int, int]] = {}
+    used = 0
+
+    with ProcessPoolExecutor(max_workers=min(workers, max(1, len(jobs)))) as pool:
+        while pending or in_flight:
+            for number in list(pending):
+                if len(in_flight) >= workers:
+                    break
+                cost = min(costs[number], budget)
+                if in_flight and used + cost > budget:
+                    continue
+                pending.remove(number)
+                in_flight[pool.submit(function, jobs[number])] = (number, cost)
+                used += cost
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                number, cost = in_flight.pop(future)
+                used -= cost
+                results[number] = future.result()
+
+    return results
+
+
+def bounded_pipeline(stages: List[Callable[[Any], Any]], jobs: List[Any], costs: List[int],
+                     workers: Optional[int] = None, budget: Optional[int] = None) -> List[Any]:
+    """
+    Run every job through a chain of stages in a process pool, within a memory budget.
+
+    Each stage is a separate pool task taking the job state the previous
+    stage returned, so the stages of different images interleave across
+    workers. Decoded pixels travel in the state as shared memory frames
+    (see shared_frames): a frame is released as soon as a stage drops it
+    from the state, and the rest when the job's last stage is done. A job's
+    cost is held from its first stage to its last, and a started job's next
+    stage always goes ahead of new jobs.
+
+    Args:
+        stages (list): Picklable process pool entry points, state -> state
+        jobs (list): Initial job states
+        costs (list): Estimated peak bytes of each job
+        workers (int): Process count (defaults to the CPU count)
+        budget (int): Memory budget in bytes (defaults to memory_budget())
+
+    Returns:
+        list: Final states in job order, with their frames released
+    """
+    if not jobs:
+        return []
+    workers = workers or os.cpu_count() or 1
+    budget = budget or memory_budget()
+    results: List[Any] = [None] * len(jobs)
+    pending = list(range(len(jobs)))
+    in_flight: Dict[Any, Tuple[int, int, int]] = {}
+    live_frames: Dict[int, List[Any]] = {}
+    used = 0
+
+    prepare_frame_sharing()
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, max(1, len(jobs)))) as pool:
+            while pending or in_flight:
+                for number in list(pending):
+                    if len(in_flight) >= workers:
+                        break
+                    cost = min(costs[number], budget)
+                    if in_flight and used + cost > budget:
+                        continue
+                    pending.remove(number)
+                    in_flight[pool.submit(stages[0], jobs[number])] = (number, 0, cost)
+                    used += cost
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    number, stage, cost = in_flight.pop(future)
+                    state = future.result()
+                    frames = frames_in(state)
+                    names = {frame.name for frame in frames}
+                    for frame in live_frames.pop(number, []):
+                        if frame.name not in names:
+                            release_frame(frame)
+
+                    if stage + 1 < len(stages):
+                        live_frames[number] = frames
+                        in_flight[pool.submit(stages[stage + 1], state)] = (number, stage + 1, cost)
+                    else:
+                        for frame in frames:
+                            release_frame(frame)
+                        results[number] = state
+                        used -= cost
+    finally:
+        for frames in live_frames.values():
+            for frame in frames:
+                release_frame(frame)
+
+    return results
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Message Catalog Module
+
+Per-country message catalogs for localised pages in the Casino Website
+Generator.
+
+Sources live in master/locales/: default.json holds the English messages and
+<Country>.json overrides them per market. Each country is compiled once into
+a binary catalog (.build-cache/locales/<Country>.mcat) that is memory-mapped
+and searched in place, so localising a page costs one regex pass over it.
+
+Binary layout (little-endian):
+    b"MCAT" | version u32 | count u32
+    count × (key_offset u32, key_length u32, value_offset u32, value_length u32)
+    UTF-8 string data (entries sorted by key)
+"""
+
+import os
+import re
+import mmap
+import json
+import html
+import struct
+from typing import Dict, Optional
+
+from file_utils import write_atomic
+
+
+CATALOG_MAGIC = b"MCAT"
+CATALOG_VERSION = 1
+HEADER_FORMAT = "<4sII"
+ENTRY_FORMAT = "<IIII"
+LOCALES_SOURCE_DIR = os.path.join("master", "locales")
+LOCALES_BUILD_DIR = os.path.join(".build-cache", "locales")
+DEFAULT_CATALOG = "default"
+MESSAGE_PATTERN = re.compile(r'\{MSG_([A-Z0-9_]+)\}')
+
+
+class MessageCatalog:
+    """Read-only, memory-mapped view of a compiled catalog."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.count = struct.unpack_from(HEADER_FORMAT, self._data, 0)
+        if magic != CATALOG_MAGIC or version != CATALOG_VERSION:
+            self._data.close()
+            raise ValueError(f"Not a version {CATALOG_VERSION} message catalog: {path}")
+
+        self._entries_offset = struct.calcsize(HEADER_FORMAT)
+        self._entry_size = struct.calcsize(ENTRY_FORMAT)
+        self._cache: Dict[str, Optional[str]] = {}
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Look a message up by binary search over the sorted key table."""
+        if key in self._cache:
+            value = self._cache[key]
+            return default if value is None else value
+
+        target = key.encode('utf-8')
+        low, high = 0, self.count - 1
+        value = None
+        while low <= high:
+            middle = (low + high) // 2
+            key_offset, key_length, value_offset, value_length = struct.unpack_from(
+                ENTRY_FORMAT, self._data, self._entries_offset + middle * self._entry_size)
+            candidate = self._data[key_offset:key_offset + key_length]
+            if candidate == target:
+                value = self._data[value_offset:value_offset + value_length].decode('utf-8')
+                break
+            if candidate < target:
+                low = middle + 1
+            else:
+                high = middle - 1
+
+        self._cache[key] = value
+        return default if value is None else value
+
+    def close(self) -> None:
+        """Unmap the catalog file."""
+        self._data.close()
+
+
+_open_catalogs: Dict[str, MessageCatalog] = {}
+
+
+def compile_catalog(messages: Dict[str, str], output_path: str) -> None:
+    """
+    Compile messages into the binary catalog format.
+
+    Args:
+        messages (dict): Message key mapped to text
+        output_path (str): Destination .mcat file (written atomically)
+    """
+    items = sorted((key.encode('utf-8'), str(value).encode('utf-8')) for key, value in messages.items())
+    data_offset = struct.calcsize(HEADER_FORMAT) + len(items) * struct.calcsize(ENTRY_FORMAT)
+
+    table = []
+    blob = bytearray()
+    for key, value in items:
+        key_offset = data_offset + len(blob)
+        blob += key
+        value_offset = data_offset + len(blob)
+        blob += value
+        table.append(struct.pack(ENTRY_FORMAT, key_offset, len(key), value_offset, len(value)))
+
+    payload = struct.pack(HEADER_FORMAT, CATALOG_MAGIC, CATALOG_VERSION, len(items)) + b"".join(table) + bytes(blob)
+
+    write_atomic(output_path, payload)
+
+
+def compile_all_catalogs(force: bool = False) -> int:
+    """
+    Compile every catalog in master/locales/ that is missing or stale.
+
+    Args:
+        force (bool): Recompile even if the compiled file is up to date
+
+    Returns:
+        int: Number of catalogs compiled
+    """
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    source_dir = os.path.join(current_dir, LOCALES_SOURCE_DIR)
+    if not os.path.isdir(source_dir):
+        return 0
+
+    compiled = 0
+    for name in sorted(os.listdir(source_dir)):
+        if name.endswith('.json'):
+            if _compile_if_stale(os.path.splitext(name)[0], force):
+                compiled += 1
+    return compiled
+
+
+def load_catalog(country: Optional[str] = None) -> Optional[MessageCatalog]:
+    """
+    Get the memory-mapped catalog for a country, compiling it if stale.
+
+    Open catalogs are reused for every page built in the same process.
+
+    Args:
+        country (str): Country name, or None for the default (English) catalog
+
+    Returns:
+        MessageCatalog or None: Catalog, or None if no source exists
+    """
+    name = country or DEFAULT_CATALOG
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if not os.path.exists(os.path.join(current_dir, LOCALES_SOURCE_DIR, f"{name}.json")):
+        name = DEFAULT_CATALOG
+
+    recompiled = _compile_if_stale(name)
+    if name in _open_catalogs and not recompiled:
+        return _open_catalogs[name]
+    if name in _open_catalogs:
+        _open_catalogs.pop(name).close()
+
+    catalog_path = os.path.join(current_dir, LOCALES_BUILD_DIR, f"{name}.mcat")
+    if not os.path.exists(catalog_path):
+        return None
+    _open_catalogs[name] = MessageCatalog(catalog_path)
+    return _open_catalogs[name]
+
+
+def localise(content: str, catalog: Optional[MessageCatalog]) -> str:
+    """
+    Replace every {MSG_KEY} placeholder in one pass.
+
+    Values are HTML-escaped; unknown keys are left in place so they show up
+    in review instead of silently disappearing.
+
+    Args:
+        content (str): Page content with {MSG_*} placeholders
+        catalog (MessageCatalog): Catalog to read messages from
+
+    Returns:
+        str: Localised content
+    """
+    if catalog is None:
+        return content
+
+    def replace(match: re.Match) -> str:
+        value = catalog.get(match.group(1))
+        return match.group(0) if value is None else html.escape(value)
+
+    return MESSAGE_PATTERN.sub(replace, content)
+
+
+# Private helper functions
+
+def _compile_if_stale(name: str, force: bool = False) -> bool:
+    """Compile a catalog when its source (or the default catalog) is newer."""
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    source_dir = os.path.join(current_dir, LOCALES_SOURCE_DIR)
+    source_file = os.path.join(source_dir, f"{name}.json")
+    default_file = os.path.join(source_dir, f"{DEFAULT_CATALOG}.json")
+    output_file = os.path.join(current_dir, LOCALES_BUILD_DIR, f"{name}.mcat")
+
+    if not os.path.exists(source_file):
+        return False
+
+    sources = [source_file] + ([default_file] if os.path.exists(default_file) else [])
+    if not force and os.path.exists(output_file):
+        if os.path.getmtime(output_file) >= max(os.path.getmtime(path) for path in sources):
+            return False
+
+    # Country catalogs inherit every message they do not override
+    messages = {}
+    for path in reversed(sources):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                messages.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read message catalog {path}: {e}")
+            return False
+
+    compile_catalog(messages, output_file)
+    return True
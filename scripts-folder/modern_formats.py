@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Modern Formats Module
+
+WebP/AVIF conversion at a fixed perceptual quality for the Casino Website
+Generator.
+
+- Every JPEG and PNG (responsive variants included) is encoded to WebP and
+  AVIF in a process pool, with jobs admitted against the memory budget
+- Each source is decoded once into a shared memory frame, together with
+  its SSIM reference luma; the AVIF and WebP encodes are separate pool
+  stages that map both frames instead of decoding again
+- The quality setting is binary-searched per image and format: the lowest
+  quality whose decoded result still reaches the SSIM target wins, so each
+  file is as small as it can be at the same visual quality
+- Outputs that are not smaller than the source are dropped; every result
+  (kept or dropped) goes into the build manifest, so nothing is encoded
+  again until the source, the SSIM target or the encoder settings change
+- <img> tags are wrapped in <picture> elements with AVIF and WebP <source>s
+  and the original image as fallback
+
+SSIM is computed in horizontal strips, so its float buffers stay small
+however large the image is. SSIM needs numpy; without it a fixed quality per format is used. AVIF needs
+a Pillow build with AVIF support and is skipped otherwise.
+"""
+
+import io
+import os
+import re
+from functools import partial
+from typing import List, Dict, Tuple, Optional, Any
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is required to convert
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:  # Without numpy a fixed quality is used
+    np = None
+
+from image_metadata import load_image_index
+from build_manifest import load_build_manifest
+from memory_budget import bounded_pipeline, estimate_decoded_bytes
+from shared_frames import share_image, open_frame, frame_array
+from file_utils import write_atomic
+
+
+SSIM_TARGET = 0.985
+SSIM_WINDOW = 8
+SSIM_STRIP_PIXELS = 512 * 1024
+WORKING_SET_FACTOR = 3  # shared source and luma frames, decoded candidate and encoder buffers
+SOURCE_FORMATS = ['JPEG', 'PNG']
+
+# Format → (extension, MIME type, quality search range, fallback quality, save options)
+MODERN_FORMATS = {
+    'AVIF': ('.avif', 'image/avif', (30, 90), 60, {'speed': 6}),
+    'WEBP': ('.webp', 'image/webp', (40, 95), 80, {'method': 4})
+}
+
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+SRC_PATTERN = re.compile(r'\bsrc\s*=\s*(["\'])([^"\']*)\1', re.IGNORECASE)
+SRCSET_PATTERN = re.compile(r'\bsrcset\s*=\s*(["\'])([^"\']*)\1', re.IGNORECASE)
+SIZES_PATTERN = re.compile(r'\bsizes\s*=\s*(["\'])([^"\']*)\1', re.IGNORECASE)
+
+
+def available_formats() -> List[str]:
+    """
+    Get the modern formats this Pillow build can encode, best first.
+
+    Returns:
+        list: Subset of ['AVIF', 'WEBP']
+    """
+    if Image is None:
+        return []
+    return [image_format for image_format in MODERN_FORMATS if features.check(image_format.lower())]
+
+
+def convert_to_modern_formats(images_dir: str, ssim_target: float = SSIM_TARGET,
+                              workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Encode every JPEG and PNG in a tree to the available modern formats.
+
+    Args:
+        images_dir (str): static/images directory
+        ssim_target (float): Minimum SSIM against the source
+        workers (int): Process count (defaults to the CPU count)
+
+    Returns:
+        dict: {'converted': {format: count}, 'bytes_saved': {format: bytes},
+               'up_to_date', 'not_smaller', 'errors': [...]}
+    """
+    formats = available_formats()
+    summary = {'converted': {f: 0 for f in formats}, 'bytes_saved': {f: 0 for f in formats},
+               'up_to_date': 0, 'not_smaller': 0, 'errors': []}
+    if not formats:
+        summary['errors'].append("Pillow is not installed or cannot encode WebP/AVIF")
+        return summary
+
+    index = load_image_index(images_dir)
+    manifest = load_build_manifest()
+    jobs = []
+    costs = []
+    for relative_path, metadata in sorted(index.entries.items()):
+        if metadata['format'] not in SOURCE_FORMATS:
+            continue
+        source = os.path.join(images_dir, *relative_path.split('/'))
+        pending = [image_format for image_format in formats
+                   if not manifest.is_up_to_date(f"convert-{image_format.lower()}", source,
+                                                 _conversion_params(image_format, ssim_target))]
+        if pending:
+            jobs.append({'source': source, 'formats': pending, 'ssim_target': ssim_target, 'results': {}})
+            costs.append(estimate_decoded_bytes(metadata) * WORKING_SET_FACTOR)
+        else:
+            summary['up_to_date'] += 1
+
+    stages = [_decode_stage] + [partial(_encode_stage, image_format) for image_format in formats]
+    for state in bounded_pipeline(stages, jobs, costs, workers):
+        source = state['source']
+        for image_format, result in state['results'].items():
+            if isinstance(result, str):
+                summary['errors'].append(f"{os.path.relpath(source, images_dir)} ({image_format}): {result}")
+                continue
+            dest = os.path.splitext(source)[0] + MODERN_FORMATS[image_format][0]
+            manifest.record(f"convert-{image_format.lower()}", source,
+                            _conversion_params(image_format, ssim_target), [] if result is None else [dest])
+            if result is None:
+                summary['not_smaller'] += 1
+            else:
+                summary['converted'][image_format] += 1
+                summary['bytes_saved'][image_format] += result
+
+    manifest.save()
+    return summary
+
+
+def rewrite_picture_elements(html_files: List[str]) -> Dict[str, int]:
+    """
+    Wrap <img> tags in <picture> elements with AVIF/WebP sources.
+
+    A <source> is only added when the modern file exists for the src and for
+    every srcset candidate; the <img> stays as the fallback. Tags already
+    inside a <picture> are left alone.
+
+    Args:
+        html_files (list): HTML files to rewrite
+
+    Returns:
+        dict: {'files_updated', 'tags_updated'}
+    """
+    stats = {'files_updated': 0, 'tags_updated': 0}
+
+    for html_file in html_files:
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        html_dir = os.path.dirname(os.path.abspath(html_file))
+        lowered = content.lower()
+        updated_tags = 0
+
+        def rewrite(match: re.Match) -> str:
+            nonlocal updated_tags
+            tag = match.group(0)
+            if lowered.rfind('<picture', 0, match.start()) > lowered.rfind('</picture', 0, match.start()):
+                return tag
+
+            src_match = SRC_PATTERN.search(tag)
+            if not src_match or re.match(r'^([a-z]+:|//)', src_match.group(2), re.IGNORECASE):
+                return tag
+            srcset_match = SRCSET_PATTERN.search(tag)
+            sizes_match = SIZES_PATTERN.search(tag)
+            candidates = _parse_srcset(srcset_match.group(2)) if srcset_match else [(src_match.group(2), '')]
+
+            sources = []
+            for image_format, (extension, mime_type, _, _, _) in MODERN_FORMATS.items():
+                converted = [(os.path.splitext(url)[0] + extension, descriptor) for url, descriptor in candidates]
+                if not all(os.path.exists(_local_path(html_dir, url)) for url, _ in converted):
+                    continue
+                srcset = ", ".join(f"{url} {descriptor}".strip() for url, descriptor in converted)
+                sizes = f' sizes="{sizes_match.group(2)}"' if sizes_match else ''
+                sources.append(f'<source type="{mime_type}" srcset="{srcset}"{sizes}>')
+
+            if not sources:
+                return tag
+            updated_tags += 1
+            return f"<picture>{''.join(sources)}{tag}</picture>"
+
+        new_content = IMG_TAG_PATTERN.sub(rewrite, content)
+        if updated_tags:
+            write_atomic(html_file, new_content.encode('utf-8'))
+            stats['files_updated'] += 1
+            stats['tags_updated'] += updated_tags
+
+    return stats
+
+
+def compute_ssim(reference: Any, candidate: Any) -> float:
+    """
+    Mean structural similarity of two greyscale arrays of the same shape.
+
+    Uses SSIM_WINDOW-square uniform windows computed from integral images,
+    one horizontal strip of about SSIM_STRIP_PIXELS at a time (strips
+    overlap by a window, so the result equals a whole-image computation).
+
+    Args:
+        reference (numpy.ndarray): Reference luma
+        candidate (numpy.ndarray): Luma to compare
+
+    Returns:
+        float: SSIM in [-1, 1], 1 meaning identical
+    """
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    window = min(SSIM_WINDOW, *reference.shape)
+    rows = reference.shape[0] - window + 1
+    strip_rows = max(1, SSIM_STRIP_PIXELS // reference.shape[1])
+    total = 0.0
+
+    for start in range(0, rows, strip_rows):
+        stop = min(rows, start + strip_rows) + window - 1
+        ref = reference[start:stop].astype(np.float64)
+        cand = candidate[start:stop].astype(np.float64)
+        mean_ref, mean_cand = _box_mean(ref, window), _box_mean(cand, window)
+        var_ref = _box_mean(ref * ref, window) - mean_ref ** 2
+        var_cand = _box_mean(cand * cand, window) - mean_cand ** 2
+        covariance = _box_mean(ref * cand, window) - mean_ref * mean_cand
+        ssim_map = (((2 * mean_ref * mean_cand + c1) * (2 * covariance + c2))
+                    / ((mean_ref ** 2 + mean_cand ** 2 + c1) * (var_ref + var_cand + c2)))
+        total += float(ssim_map.sum())
+
+    return total / (rows * (reference.shape[1] - window + 1))
+
+
+# Private helper functions
+
+def _decode_stage(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage: decode the source and its reference luma into shared frames."""
+    try:
+        with Image.open(state['source']) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+        state['frame'] = share_image(image)
+        if np is not None:
+            state['reference'] = share_image(_luma_image(image))
+        state['source_size'] = os.path.getsize(state['source'])
+    except Exception as e:
+        state['results'] = {image_format: str(e) for image_format in state['formats']}
+    return state
+
+
+def _encode_stage(image_format: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage: encode one format; the result is bytes saved, None if not smaller, or an error."""
+    if image_format not in state['formats'] or image_format in state['results']:
+        return state
+    extension, _, (low, high), fallback_quality, options = MODERN_FORMATS[image_format]
+    try:
+        # RGB frames map as RGBX, which the AVIF and WebP encoders take as is
+        with open_frame(state['frame']) as image:
+            if 'reference' not in state:
+                data = _encode(image, image_format, fallback_quality, options)
+            else:
+                with frame_array(state['reference']) as reference:
+                    data = _search_quality(image, reference, image_format, low, high, options,
+                                           state['ssim_target'])
+
+        dest = os.path.splitext(state['source'])[0] + extension
+        if len(data) >= state['source_size']:
+            if os.path.exists(dest):
+                os.remove(dest)
+            state['results'][image_format] = None
+        else:
+            write_atomic(dest, data)
+            state['results'][image_format] = state['source_size'] - len(data)
+    except Exception as e:
+        state['results'][image_format] = str(e)
+    return state
+
+
+def _search_quality(image: Any, reference: Any, image_format: str, low: int, high: int,
+                    options: Dict[str, Any], ssim_target: float) -> bytes:
+    """Binary-search the lowest quality whose decoded result meets the SSIM target."""
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        data = _encode(image, image_format, quality, options)
+        with Image.open(io.BytesIO(data)) as decoded:
+            score = compute_ssim(reference, _luma(decoded.convert(image.mode)))
+        if score >= ssim_target:
+            best = data
+            high = quality - 1
+        else:
+            low = quality + 1
+    return best if best is not None else _encode(image, image_format, MODERN_FORMATS[image_format][2][1], options)
+
+
+def _encode(image: Any, image_format: str, quality: int, options: Dict[str, Any]) -> bytes:
+    """Encode an image in memory."""
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, quality=quality, **options)
+    return buffer.getvalue()
+
+
+def _luma(image: Any) -> Any:
+    """8-bit greyscale array, with transparent areas composited over mid grey."""
+    return np.asarray(_luma_image(image))
+
+
+def _luma_image(image: Any) -> Any:
+    """Greyscale image, with transparent areas composited over mid grey."""
+    if image.mode == 'RGBA':
+        background = Image.new('RGBA', image.size, (128, 128, 128, 255))
+        image = Image.alpha_composite(background, image)
+    return image.convert('L')
+
+
+def _box_mean(values: Any, window: int) -> Any:
+    """Mean over every window-sized square, from an integral image."""
+    integral = np.pad(values, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    sums = (integral[window:, window:] - integral[:-window, window:]
+            - integral[window:, :-window] + integral[:-window, :-window])
+    return sums / (window * window)
+
+
+def _conversion_params(image_format: str, ssim_target: float) -> Dict[str, Any]:
+    """Build manifest parameters of one format's conversion."""
+    _, _, quality_range, fallback_quality, options = MODERN_FORMATS[image_format]
+    return {'ssim_target': ssim_target if np is not None else None, 'quality_range': quality_range,
+            'fallback_quality': fallback_quality, 'options': options}
+
+
+def _parse_srcset(srcset: str) -> List[Tuple[str, str]]:
+    """Split a srcset into (url, descriptor) pairs."""
+    candidates = []
+    for candidate in srcset.split(','):
+        parts = candidate.strip().split()
+        if parts:
+            candidates.append((parts[0], ' '.join(parts[1:])))
+    return candidates
+
+
+def _local_path(html_dir: str, url: str) -> str:
+    """Resolve a relative URL from an HTML file to a file path."""
+    return os.path.normpath(os.path.join(html_dir, url.split('?')[0].split('#')[0]))
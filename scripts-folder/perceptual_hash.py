@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Perceptual Hash Module
+
+Near-duplicate detection across master and site images for the Casino
+Website Generator.
+
+- Every raster (PNG, JPEG, WebP, GIF) under master/offers, master/footer and
+  web-folder/static/images gets a 64-bit dHash and pHash, computed for whole
+  batches at once with numpy (one matrix product per batch for the DCT)
+- Hashes are cached by content hash in .build-cache/perceptual-hashes.json,
+  so only new or changed files are decoded; image pipelines that already
+  hold a decoded frame add theirs with hash_image() and store_hashes()
+- A BK-tree over the pHashes finds every pair within a Hamming distance;
+  a dHash check confirms it, and pairs are merged into groups
+- SVGs are rasterised when cairosvg is installed; otherwise they are
+  grouped by their optimised markup, which still matches copies that only
+  differ in editor cruft or number formatting
+
+Each group suggests one copy to keep (vector first, then the largest
+image, then the smallest file), so the others can be standardised on it.
+"""
+
+import os
+import io
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Optional, Any
+
+try:
+    from PIL import Image, ImageChops, ImageOps, ImageStat
+except ImportError:  # Pillow is required to hash rasters
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:  # Without numpy only dHash is computed
+    np = None
+
+try:
+    import cairosvg
+except ImportError:  # Without cairosvg SVGs are compared by markup
+    cairosvg = None
+
+from image_metadata import load_image_index
+from svg_optimizer import optimize_svg_data
+from file_utils import write_atomic
+
+
+HASH_CACHE_FILE = os.path.join(".build-cache", "perceptual-hashes.json")
+HASH_VERSION = 2
+DEFAULT_MAX_DISTANCE = 10
+DHASH_CONFIRM_DISTANCE = 16
+MIN_DETAIL = 4.0  # standard deviation of the 32x32 thumbnail below which an image is blank
+BATCH_SIZE = 64
+HASHED_FORMATS = ['PNG', 'JPEG', 'WEBP', 'GIF']
+SCAN_ROOTS = [
+    os.path.join("master", "offers"),
+    os.path.join("master", "footer"),
+    os.path.join("web-folder", "static", "images")
+]
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes with Hamming distance."""
+
+    def __init__(self):
+        self.root: Optional[List[Any]] = None
+        self.size = 0
+
+    def add(self, value: int, item: Any) -> None:
+        """Add an item under its hash."""
+        self.size += 1
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming_distance(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """
+        Find items within max_distance of a hash.
+
+        Args:
+            value (int): Query hash
+            max_distance (int): Largest Hamming distance to return
+
+        Returns:
+            list: (distance, item) pairs
+        """
+        results = []
+        pending = [self.root] if self.root is not None else []
+        while pending:
+            node = pending.pop()
+            distance = hamming_distance(value, node[0])
+            if distance <= max_distance:
+                results.extend((distance, item) for item in node[1])
+            # Triangle inequality: only subtrees in this band can match
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    pending.append(child)
+        return results
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Count differing bits between two hashes."""
+    return bin(first ^ second).count('1')
+
+
+def hash_images(paths: List[str], workers: int = 8) -> Dict[str, Optional[Dict[str, int]]]:
+    """
+    Compute dHash and pHash for a list of raster files.
+
+    Args:
+        paths (list): Image files
+        workers (int): Threads used to decode thumbnails
+
+    Returns:
+        dict: Path mapped to {'dhash', 'phash'} (phash None without numpy),
+              or None for unreadable or blank images
+    """
+    results: Dict[str, Optional[Dict[str, int]]] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(paths), BATCH_SIZE):
+            batch = paths[start:start + BATCH_SIZE]
+            thumbnails = list(pool.map(_load_thumbnail, batch))
+            valid = [(path, thumbnail) for path, thumbnail in zip(batch, thumbnails) if thumbnail is not None]
+            results.update((path, None) for path, thumbnail in zip(batch, thumbnails) if thumbnail is None)
+            if valid:
+                results.update(zip([path for path, _ in valid], _hash_batch([t for _, t in valid])))
+    return results
+
+
+def hash_image(image: Any) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Compute dHash and pHash of an image that is already decoded.
+
+    Args:
+        image (PIL.Image.Image): Decoded image, upright; any size works, as
+                                 only a thumbnail is hashed
+
+    Returns:
+        dict or None: {'dhash', 'phash'} (phash None without numpy), or None if blank
+    """
+    thumbnail = _thumbnail(image)
+    return _hash_batch([thumbnail])[0] if thumbnail is not None else None
+
+
+def hashed_contents() -> set:
+    """
+    Get the content hashes whose perceptual hashes are cached.
+
+    Returns:
+        set: SHA-256 hex digests
+    """
+    return set(_load_cache())
+
+
+def store_hashes(hashes: Dict[str, Optional[Dict[str, Optional[str]]]]) -> None:
+    """
+    Add perceptual hashes computed elsewhere (such as an image pipeline stage) to the cache.
+
+    Args:
+        hashes (dict): Content SHA-256 mapped to hash_image() results
+    """
+    if not hashes:
+        return
+    cache = _load_cache()
+    cache.update(hashes)
+    _save_cache(cache)
+
+
+def find_near_duplicates(roots: Optional[List[str]] = None,
+                         max_distance: int = DEFAULT_MAX_DISTANCE) -> List[Dict[str, Any]]:
+    """
+    Group images that look the same, whatever their format or encoding.
+
+    Args:
+        roots (list): Directories to scan (defaults to SCAN_ROOTS under the project)
+        max_distance (int): Largest pHash Hamming distance counted as a match
+
+    Returns:
+        list: Groups as {'keep': entry, 'duplicates': [entry, ...], 'bytes': reclaimable bytes};
+              entries are {'path', 'format', 'width', 'height', 'size', 'distance'}
+    """
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if roots is None:
+        roots = [os.path.join(current_dir, root) for root in SCAN_ROOTS]
+
+    entries = []
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        index = load_image_index(root)
+        # Responsive variants and WebP/AVIF copies are build output, not duplicates
+        for relative_path, metadata in sorted(index.source_entries().items()):
+            if metadata['format'] in HASHED_FORMATS + ['SVG'] and not metadata.get('animated'):
+                entries.append(dict(metadata, path=os.path.join(root, *relative_path.split('/'))))
+
+    cache = _load_cache()
+    _update_cache(entries, cache)
+
+    tree = BKTree()
+    markup_groups: Dict[str, List[int]] = {}
+    for position, entry in enumerate(entries):
+        hashes = cache.get(entry['sha256'])
+        if not hashes:
+            continue
+        if 'markup' in hashes:
+            markup_groups.setdefault(hashes['markup'], []).append(position)
+        else:
+            tree.add(int(hashes['phash'] or hashes['dhash'], 16), position)
+
+    parent = list(range(len(entries)))
+
+    def find(position: int) -> int:
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    distances: Dict[int, int] = {}
+    for position, entry in enumerate(entries):
+        hashes = cache.get(entry['sha256'])
+        if not hashes or 'markup' in hashes:
+            continue
+        for distance, other in tree.search(int(hashes['phash'] or hashes['dhash'], 16), max_distance):
+            other_hashes = cache[entries[other]['sha256']]
+            if other == position or hamming_distance(int(hashes['dhash'], 16),
+                                                     int(other_hashes['dhash'], 16)) > DHASH_CONFIRM_DISTANCE:
+                continue
+            parent[find(other)] = find(position)
+            distances[other] = min(distances.get(other, distance), distance)
+
+    for positions in markup_groups.values():
+        for position in positions[1:]:
+            parent[find(position)] = find(positions[0])
+
+    clusters: Dict[int, List[int]] = {}
+    for position in range(len(entries)):
+        clusters.setdefault(find(position), []).append(position)
+
+    groups = []
+    for positions in clusters.values():
+        if len(positions) < 2:
+            continue
+        members = [{
+            'path': os.path.relpath(entries[p]['path'], current_dir),
+            'format': entries[p]['format'],
+            'width': entries[p].get('width'),
+            'height': entries[p].get('height'),
+            'size': entries[p]['size'],
+            'distance': distances.get(p, 0)
+        } for p in positions]
+        members.sort(key=lambda m: (m['format'] != 'SVG', -((m['width'] or 0) * (m['height'] or 0)), m['size']))
+        groups.append({'keep': members[0], 'duplicates': members[1:],
+                       'bytes': sum(member['size'] for member in members[1:])})
+
+    return sorted(groups, key=lambda group: -group['bytes'])
+
+
+def report_near_duplicates(max_distance: int = DEFAULT_MAX_DISTANCE) -> List[Dict[str, Any]]:
+    """
+    Print near-duplicate image groups across master and site images.
+
+    Args:
+        max_distance (int): Largest pHash Hamming distance counted as a match
+
+    Returns:
+        list: Output of find_near_duplicates()
+    """
+    groups = find_near_duplicates(max_distance=max_distance)
+    _display_duplicates_summary(groups)
+    return groups
+
+
+# Private helper functions
+
+def _load_thumbnail(path: str) -> Optional[Any]:
+    """Decode an image at reduced scale and get its thumbnail; None if blank or unreadable."""
+    try:
+        if path.lower().endswith('.svg'):
+            with open(path, 'rb') as f:
+                image = Image.open(io.BytesIO(cairosvg.svg2png(bytestring=f.read(), output_width=256)))
+        else:
+            image = Image.open(path)
+        with image:
+            image.draft('RGB', (64, 64))
+            return _thumbnail(ImageOps.exif_transpose(image))
+    except Exception:
+        return None
+
+
+def _thumbnail(image: Any) -> Optional[Any]:
+    """32x32 greyscale thumbnail of the trimmed content; None if blank.
+
+    Margins (transparent, or the corner colour) are cropped first, so a logo
+    padded to a square matches the same logo cropped tight.
+    """
+    image = image.convert('RGBA')
+    image.thumbnail((256, 256), Image.BILINEAR)
+    background = Image.new('RGBA', image.size, (128, 128, 128, 255))
+    grey = Image.alpha_composite(background, image).convert('L')
+    box = image.getchannel('A').point(lambda alpha: 255 if alpha > 16 else 0).getbbox()
+    if box == (0, 0) + image.size:
+        corner = Image.new('L', grey.size, grey.getpixel((0, 0)))
+        box = ImageChops.difference(grey, corner).point(lambda value: 255 if value > 16 else 0).getbbox()
+    if box:
+        grey = grey.crop(box)
+
+    thumbnail = grey.resize((32, 32), Image.LANCZOS)
+    if ImageStat.Stat(thumbnail).stddev[0] < MIN_DETAIL:
+        return None
+    return thumbnail
+
+
+def _hash_batch(thumbnails: List[Any]) -> List[Dict[str, Optional[str]]]:
+    """Hash a batch of 32x32 thumbnails (dHash from a 9x8 reduction, pHash from the DCT)."""
+    small = [thumbnail.resize((9, 8), Image.LANCZOS) for thumbnail in thumbnails]
+    if np is None:
+        results = []
+        for image in small:
+            pixels = list(image.getdata())
+            bits = [pixels[row * 9 + col] < pixels[row * 9 + col + 1] for row in range(8) for col in range(8)]
+            results.append({'dhash': _bits_to_hex(bits), 'phash': None})
+        return results
+
+    reduced = np.stack([np.asarray(image, dtype=np.float32) for image in small])
+    dhash_bits = (reduced[:, :, :-1] < reduced[:, :, 1:]).reshape(len(small), 64)
+
+    pixels = np.stack([np.asarray(thumbnail, dtype=np.float32) for thumbnail in thumbnails])
+    dct = _dct_matrix(32)
+    coefficients = np.einsum('ij,njk,lk->nil', dct, pixels, dct)[:, :8, :8].reshape(len(thumbnails), 64)
+    # Skip the DC term when taking the median
+    medians = np.median(coefficients[:, 1:], axis=1, keepdims=True)
+    phash_bits = coefficients > medians
+
+    return [{'dhash': _bits_to_hex(d), 'phash': _bits_to_hex(p)} for d, p in zip(dhash_bits, phash_bits)]
+
+
+def _dct_matrix(size: int) -> Any:
+    """Orthonormal DCT-II matrix."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2.0 / size)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+def _bits_to_hex(bits: Any) -> str:
+    """Pack 64 booleans into a 16-digit hex string."""
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bool(bit))
+    return f"{value:016x}"
+
+
+def _update_cache(entries: List[Dict[str, Any]], cache: Dict[str, Any]) -> None:
+    """Hash every entry whose content is not cached yet, then save the cache."""
+    missing = {entry['sha256']: entry for entry in entries if entry['sha256'] not in cache}
+    if not missing:
+        return
+
+    rasters = [entry['path'] for entry in missing.values()
+               if entry['format'] != 'SVG' or cairosvg is not None]
+    if rasters and Image is not None:
+        hashes = hash_images(rasters)
+        for entry in missing.values():
+            if entry['path'] in hashes:
+                cache[entry['sha256']] = hashes[entry['path']]
+
+    for entry in missing.values():
+        if entry['format'] == 'SVG' and cairosvg is None:
+            try:
+                with open(entry['path'], 'rb') as f:
+                    markup = optimize_svg_data(f.read())
+                cache[entry['sha256']] = {'markup': hashlib.sha256(markup).hexdigest()}
+            except Exception:
+                cache[entry['sha256']] = None
+
+    _save_cache(cache)
+
+
+def _cache_path() -> str:
+    """Get the perceptual hash cache path."""
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(current_dir, HASH_CACHE_FILE)
+
+
+def _load_cache() -> Dict[str, Any]:
+    """Load content hash → perceptual hashes."""
+    try:
+        with open(_cache_path(), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get("hashes", {}) if data.get("version") == HASH_VERSION else {}
+
+
+def _save_cache(cache: Dict[str, Any]) -> None:
+    """Save the cache atomically."""
+    write_atomic(_cache_path(), json.dumps({"version": HASH_VERSION, "hashes": cache},
+                                           indent=1, sort_keys=True).encode('utf-8'))
+
+
+def _display_duplicates_summary(groups: List[Dict[str, Any]]) -> None:
+    """Display near-duplicate image summary."""
+    print(f"\n{'='*50}")
+    print("NEAR-DUPLICATE IMAGES")
+    print(f"{'='*50}")
+    for group in groups:
+        keep = group['keep']
+        print(f"✅ Keep {keep['path']} ({keep['format']}, {keep['width']}x{keep['height']}, {keep['size']} bytes)")
+        for duplicate in group['duplicates']:
+            print(f"   ♻️  {duplicate['path']} ({duplicate['format']}, {duplicate['width']}x{duplicate['height']}, "
+                  f"{duplicate['size']} bytes, distance {duplicate['distance']})")
+    print(f"📊 Groups: {len(groups)}")
+    print(f"💾 Reclaimable: {sum(group['bytes'] for group in groups)} bytes")
+    if cairosvg is None:
+        print("⚠️  cairosvg is not installed - SVGs were only compared with each other by markup")
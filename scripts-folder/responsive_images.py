@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Responsive Images Module
+
+Single-decode resize pyramids and srcset rewriting for the Casino Website
+Generator.
+
+- Each source image is decoded once (JPEGs at reduced scale with draft())
+  and walked down the breakpoint widths, every level resampled from the
+  previous one rather than from the full-size original
+- Decode, resize and encode run as separate process pool stages that hand
+  the pixels on as shared memory frames; sources without a cached
+  perceptual hash are hashed from the same decoded frame
+- Variants are written next to the source as <name>_<width>w<ext> and are
+  only rebuilt when the build manifest shows the source, the widths or the
+  encoder settings changed, or a variant was modified or removed
+- <img> tags pointing at a source get srcset and sizes attributes, so a
+  phone downloads the 480px hero instead of the full-size one
+"""
+
+import os
+import re
+import tempfile
+from typing import List, Dict, Tuple, Optional, Any
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is required to build variants
+    Image = None
+
+from image_metadata import load_image_index
+from build_manifest import load_build_manifest
+from memory_budget import bounded_pipeline, estimate_decoded_bytes
+from shared_frames import share_image, open_frame
+from perceptual_hash import hash_image, hashed_contents, store_hashes
+from file_utils import write_atomic
+
+
+RESPONSIVE_WIDTHS = [480, 768, 1200, 2400]
+PYRAMID_FORMATS = ['JPEG', 'PNG', 'WEBP']
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 82, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 82, 'method': 6}
+}
+
+WORKING_SET_FACTOR = 3  # decoded source, its shared frame and the levels
+
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+SRC_PATTERN = re.compile(r'\bsrc\s*=\s*(["\'])([^"\']*)\1', re.IGNORECASE)
+WIDTH_PATTERN = re.compile(r'\bwidth\s*=\s*["\']?(\d+)', re.IGNORECASE)
+
+
+def variant_path(path: str, width: int) -> str:
+    """Get the <name>_<width>w<ext> variant path for a source path or URL."""
+    base_name, extension = os.path.splitext(path)
+    return f"{base_name}_{width}w{extension}"
+
+
+def build_responsive_sets(images_dir: str, widths: Optional[List[int]] = None,
+                          workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Build resize pyramids for every raster image wider than the smallest breakpoint.
+
+    Args:
+        images_dir (str): static/images directory
+        widths (list): Breakpoint widths (defaults to RESPONSIVE_WIDTHS)
+        workers (int): Process count (defaults to the CPU count)
+
+    Returns:
+        dict: {'variants': {source path: [(width, path)]}, 'built', 'up_to_date', 'errors': [...]};
+              each variant list ends with the source itself at its own width
+    """
+    widths = sorted(widths or RESPONSIVE_WIDTHS)
+    index = load_image_index(images_dir)
+    manifest = load_build_manifest()
+    summary = {'variants': {}, 'built': 0, 'up_to_date': 0, 'errors': []}
+
+    hashed = hashed_contents()
+    jobs = []
+    costs = []
+    params = {}
+    for relative_path, metadata in sorted(index.source_entries().items()):
+        if metadata['format'] not in PYRAMID_FORMATS or metadata.get('animated'):
+            continue
+        levels = [width for width in widths if width < metadata['width']]
+        if not levels:
+            continue
+        source = os.path.join(images_dir, *relative_path.split('/'))
+        summary['variants'][source] = ([(width, variant_path(source, width)) for width in levels]
+                                       + [(metadata['width'], source)])
+        params[source] = _pyramid_params(metadata['format'], levels)
+        if manifest.is_up_to_date('responsive', source, params[source]):
+            summary['up_to_date'] += 1
+        else:
+            jobs.append({'source': source, 'levels': levels,
+                         'sha256': None if metadata['sha256'] in hashed else metadata['sha256']})
+            draft_target = (levels[-1], metadata['height'] * levels[-1] // metadata['width'] + 1)
+            costs.append(estimate_decoded_bytes(metadata, draft_target) * WORKING_SET_FACTOR)
+
+    if jobs and Image is None:
+        summary['errors'].append("Pillow is not installed - responsive images could not be built")
+    elif jobs:
+        stages = [_decode_stage, _hash_stage, _resize_stage, _encode_stage]
+        hashes = {}
+        for state in bounded_pipeline(stages, jobs, costs, workers):
+            source = state['source']
+            if 'hashes' in state:
+                hashes[state['sha256']] = state['hashes']
+            if state.get('error'):
+                summary['errors'].append(f"{os.path.relpath(source, images_dir)}: {state['error']}")
+                del summary['variants'][source]
+            else:
+                manifest.record('responsive', source, params[source],
+                                [variant_path(source, width) for width in state['levels']])
+                summary['built'] += 1
+        store_hashes(hashes)
+
+    manifest.save()
+    return summary
+
+
+def rewrite_img_srcsets(html_files: List[str], variants: Dict[str, List[Tuple[int, str]]]) -> Dict[str, int]:
+    """
+    Add srcset and sizes to <img> tags whose src has responsive variants.
+
+    Tags that already have a srcset are left alone. sizes is taken from the
+    tag's width attribute when it has one, otherwise 100vw.
+
+    Args:
+        html_files (list): HTML files to rewrite
+        variants (dict): 'variants' from build_responsive_sets()
+
+    Returns:
+        dict: {'files_updated', 'tags_updated'}
+    """
+    stats = {'files_updated': 0, 'tags_updated': 0}
+
+    for html_file in html_files:
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        html_dir = os.path.dirname(os.path.abspath(html_file))
+        updated_tags = 0
+
+        def rewrite(match: re.Match) -> str:
+            nonlocal updated_tags
+            tag = match.group(0)
+            src_match = SRC_PATTERN.search(tag)
+            if not src_match or re.search(r'\bsrcset\s*=', tag, re.IGNORECASE):
+                return tag
+            src = src_match.group(2)
+            if re.match(r'^([a-z]+:|//)', src, re.IGNORECASE):
+                return tag
+            source = os.path.normpath(os.path.join(html_dir, src.split('?')[0].split('#')[0]))
+            levels = variants.get(source)
+            if not levels:
+                return tag
+
+            candidates = [f"{src if path == source else variant_path(src, width)} {width}w"
+                          for width, path in levels]
+
+            width_match = WIDTH_PATTERN.search(tag)
+            sizes = f"(max-width: {width_match.group(1)}px) 100vw, {width_match.group(1)}px" if width_match else "100vw"
+
+            updated_tags += 1
+            closing = ' />' if tag.endswith('/>') else '>'
+            return f'{tag[:-len(closing.strip())].rstrip()} srcset="{", ".join(candidates)}" sizes="{sizes}"{closing}'
+
+        new_content = IMG_TAG_PATTERN.sub(rewrite, content)
+        if updated_tags:
+            write_atomic(html_file, new_content.encode('utf-8'))
+            stats['files_updated'] += 1
+            stats['tags_updated'] += updated_tags
+
+    return stats
+
+
+# Private helper functions
+
+def _pyramid_params(image_format: str, levels: List[int]) -> Dict[str, Any]:
+    """Build manifest parameters of one pyramid."""
+    return {'widths': levels, 'format': image_format, 'save': SAVE_OPTIONS[image_format]}
+
+
+def _decode_stage(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage: decode the source once, at reduced scale where possible, into a shared frame."""
+    source, levels = state['source'], state['levels']
+    try:
+        with Image.open(source) as image:
+            state['format'] = image.format
+            image.draft(image.mode, (levels[-1], image.height * levels[-1] // image.width + 1))
+            frame = ImageOps.exif_transpose(image)
+            frame.load()
+
+        if state['format'] == 'JPEG' and frame.mode not in ('RGB', 'L'):
+            frame = frame.convert('RGB')
+        elif frame.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            frame = frame.convert('RGBA')
+        state['frame'] = share_image(frame)
+    except Exception as e:
+        state['error'] = str(e)
+    return state
+
+
+def _hash_stage(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage: perceptual hashes of the decoded source, if not cached yet."""
+    if state.get('error') or not state['sha256']:
+        return state
+    try:
+        with open_frame(state['frame']) as image:
+            state['hashes'] = hash_image(image)
+    except Exception:
+        pass  # the duplicates report hashes the file itself
+    return state
+
+
+def _resize_stage(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage: walk the frame down the widths, largest first, sharing every level."""
+    if state.get('error'):
+        return state
+    frame = state.pop('frame')
+    state['level_frames'] = []
+    try:
+        with open_frame(frame) as level:
+            for width in sorted(state['levels'], reverse=True):
+                height = max(1, round(level.height * width / level.width))
+                level = level.resize((width, height), Image.LANCZOS, reducing_gap=2.0)
+                state['level_frames'].append((width, share_image(level, frame.mode)))
+    except Exception as e:
+        state['error'] = str(e)
+    return state
+
+
+def _encode_stage(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage: encode every level and write it atomically."""
+    if state.get('error'):
+        return state
+    source, image_format = state['source'], state['format']
+    written = []
+    try:
+        for width, frame in state['level_frames']:
+            dest = variant_path(source, width)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(dest), prefix=".tmp-")
+            os.close(fd)
+            written.append(temp_path)
+            with open_frame(frame) as level:
+                if level.mode != frame.mode:
+                    level = level.convert(frame.mode)
+                level.save(temp_path, image_format, **SAVE_OPTIONS[image_format])
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, dest)
+            written.pop()
+        state['level_frames'] = []
+    except Exception as e:
+        for temp_path in written:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        state['error'] = str(e)
+    return state
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Section Renderer Module
+
+Renders country-specific offers cards and regulator badges into HTML blocks
+for the Casino Website Generator.
+
+Templates live in base/templates/sections/ and use the same {PLACEHOLDER}
+syntax as base/css/theme-variables.css. Each template is compiled once into
+a list of literal and field parts and reused for every site and country
+rendered in the same process.
+"""
+
+import os
+import re
+import json
+import html
+from typing import List, Dict, Optional, Tuple, Any
+
+from sprite_builder import render_sprite_image
+
+
+SECTION_TEMPLATES_DIR = os.path.join("base", "templates", "sections")
+DEFAULT_OFFERS_COUNT = 5
+PLACEHOLDER_PATTERN = re.compile(r'\{([A-Z][A-Z0-9_]*)\}')
+
+# Key spellings found in master/offers/*/*.json mapped to normalised keys
+OFFER_KEY_ALIASES = {
+    "img": "image",
+    "image": "image",
+    "logo": "image",
+    "url": "url",
+    "link": "url",
+    "offer": "offer",
+    "bonus": "offer",
+    "name": "name",
+}
+
+BADGE_KEY_ALIASES = {
+    "image": "image",
+    "img": "image",
+    "logo": "image",
+    "url": "url",
+    "link": "url",
+    "name": "name",
+}
+
+
+class CompiledTemplate:
+    """A {PLACEHOLDER} template pre-split into literal and field parts."""
+
+    def __init__(self, source: str, name: str = "<string>"):
+        self.name = name
+        self.parts: List[Tuple[bool, str]] = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            if match.start() > position:
+                self.parts.append((False, source[position:match.start()]))
+            self.parts.append((True, match.group(1)))
+            position = match.end()
+        if position < len(source):
+            self.parts.append((False, source[position:]))
+        self.fields = {value for is_field, value in self.parts if is_field}
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """Render the template, leaving unknown placeholders untouched."""
+        output = []
+        for is_field, value in self.parts:
+            if is_field:
+                output.append(str(values[value]) if value in values else f"{{{value}}}")
+            else:
+                output.append(value)
+        return "".join(output)
+
+
+_template_cache: Dict[str, CompiledTemplate] = {}
+
+_OFFER_LOGO_IMG = CompiledTemplate('<img src="{IMAGE}" alt="{NAME}" loading="lazy">', "offer-logo-img")
+_OFFER_LOGO_TEXT = CompiledTemplate('<span class="offer-name">{NAME}</span>', "offer-logo-text")
+_BADGE_IMG = CompiledTemplate('<img src="{IMAGE}" alt="{NAME}">', "badge-img")
+
+
+def get_compiled_template(template_name: str) -> CompiledTemplate:
+    """
+    Get a compiled section template, compiling it on first use only.
+
+    Args:
+        template_name (str): File name inside base/templates/sections/
+
+    Returns:
+        CompiledTemplate: Cached compiled template
+    """
+    compiled = _template_cache.get(template_name)
+    if compiled is None:
+        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        template_path = os.path.join(current_dir, SECTION_TEMPLATES_DIR, template_name)
+        with open(template_path, 'r', encoding='utf-8') as f:
+            compiled = CompiledTemplate(f.read().rstrip('\n'), template_name)
+        _template_cache[template_name] = compiled
+    return compiled
+
+
+def clear_template_cache() -> None:
+    """Forget compiled templates so edited template files are re-read."""
+    _template_cache.clear()
+
+
+def normalise_offers(raw_offers: Dict[str, Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Normalise an offers JSON mapping into an ordered list of offers.
+
+    The master data mixes key styles ("img"/"URL"/"Offer" and
+    "img"/"url"/"offer") and some URLs carry trailing whitespace.
+
+    Args:
+        raw_offers (dict): Operator name mapped to its offer fields
+
+    Returns:
+        list: Offers as dicts with name, image, url and offer keys,
+              in the order they appear in the source file
+    """
+    offers = []
+    for operator, fields in raw_offers.items():
+        offer = {"name": operator.strip(), "image": "", "url": "", "offer": ""}
+        for key, value in (fields or {}).items():
+            normalised_key = OFFER_KEY_ALIASES.get(key.strip().lower())
+            if normalised_key and isinstance(value, str):
+                offer[normalised_key] = value.strip()
+        offers.append(offer)
+    return offers
+
+
+def normalise_badges(raw_badges: Dict[str, Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Normalise a footer info.json mapping into an ordered list of badges.
+
+    Args:
+        raw_badges (dict): Regulator key mapped to its image and url
+
+    Returns:
+        list: Badges as dicts with name, image and url keys
+    """
+    badges = []
+    for regulator, fields in raw_badges.items():
+        badge = {"name": regulator.strip(), "image": "", "url": ""}
+        for key, value in (fields or {}).items():
+            normalised_key = BADGE_KEY_ALIASES.get(key.strip().lower())
+            if normalised_key and isinstance(value, str):
+                badge[normalised_key] = value.strip()
+        badges.append(badge)
+    return badges
+
+
+def select_top_offers(offers: List[Dict[str, str]], count: int) -> List[Dict[str, str]]:
+    """
+    Select the first N offers, skipping entries without a usable URL.
+
+    Args:
+        offers (list): Normalised offers in ranking order
+        count (int): Number of offers to keep
+
+    Returns:
+        list: At most `count` offers
+    """
+    return [offer for offer in offers if offer["url"]][:max(count, 0)]
+
+
+def load_country_offers(country: str, master_dir: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Load and normalise the offers JSON for a country from master/offers/.
+
+    Args:
+        country (str): Country folder name (e.g. "Denmark")
+        master_dir (str): Optional master directory override
+
+    Returns:
+        list: Normalised offers, empty if no offers file exists
+    """
+    offers_dir = os.path.join(master_dir or _get_master_dir(), "offers", country)
+    offers_file = _find_json_file(offers_dir)
+    if not offers_file:
+        return []
+    with open(offers_file, 'r', encoding='utf-8') as f:
+        return normalise_offers(json.load(f))
+
+
+def load_country_badges(country: str, master_dir: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Load and normalise footer/<country>/info.json from master/.
+
+    Args:
+        country (str): Country folder name (e.g. "Denmark")
+        master_dir (str): Optional master directory override
+
+    Returns:
+        list: Normalised badges, empty if no info.json exists
+    """
+    info_file = os.path.join(master_dir or _get_master_dir(), "footer", country, "info.json")
+    if not os.path.exists(info_file):
+        return []
+    with open(info_file, 'r', encoding='utf-8') as f:
+        return normalise_badges(json.load(f))
+
+
+def render_offers_section(offers: List[Dict[str, str]], country: str,
+                          static_prefix: str = "static/offers",
+                          sprites: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Render offers as an ordered list of offer cards.
+
+    Args:
+        offers (list): Normalised offers already reduced to the top N
+        country (str): Country name written to the data-country attribute
+        static_prefix (str): URL prefix of the copied offer logos
+        sprites (dict): Optional sprite manifest from sprite_builder
+
+    Returns:
+        str: Offers section HTML, empty if there are no offers
+    """
+    if not offers:
+        return ""
+
+    card_template = get_compiled_template("offer-card.html")
+    cards = []
+    for rank, offer in enumerate(offers, 1):
+        name = html.escape(offer["name"])
+        sprite_entry = (sprites or {}).get("entries", {}).get(offer["image"])
+        if sprite_entry:
+            logo = render_sprite_image(sprite_entry, name, static_prefix)
+        elif offer["image"]:
+            logo = _OFFER_LOGO_IMG.render({
+                "IMAGE": html.escape(f"{static_prefix}/{offer['image']}"),
+                "NAME": name
+            })
+        else:
+            logo = _OFFER_LOGO_TEXT.render({"NAME": name})
+        cards.append(card_template.render({
+            "RANK": rank,
+            "LOGO": logo,
+            "OFFER": html.escape(offer["offer"]),
+            "URL": html.escape(offer["url"])
+        }))
+
+    return get_compiled_template("offers.html").render({
+        "COUNTRY": html.escape(country),
+        "OFFER_COUNT": len(offers),
+        "OFFER_CARDS": "\n".join(cards)
+    })
+
+
+def render_badges_section(badges: List[Dict[str, str]], country: str,
+                          static_prefix: str = "static/footer",
+                          sprites: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Render regulator badges, linking those that have a URL.
+
+    Args:
+        badges (list): Normalised badges
+        country (str): Country name written to the data-country attribute
+        static_prefix (str): URL prefix of the copied footer images
+        sprites (dict): Optional sprite manifest from sprite_builder
+
+    Returns:
+        str: Badge strip HTML, empty if there are no badges
+    """
+    badges = [badge for badge in badges if badge["image"]]
+    if not badges:
+        return ""
+
+    linked_template = get_compiled_template("badge.html")
+    static_template = get_compiled_template("badge-static.html")
+    rendered = []
+    for badge in badges:
+        name = html.escape(badge["name"])
+        sprite_entry = (sprites or {}).get("entries", {}).get(badge["image"])
+        if sprite_entry:
+            image_html = render_sprite_image(sprite_entry, name, static_prefix)
+        else:
+            image_html = _BADGE_IMG.render({
+                "IMAGE": html.escape(f"{static_prefix}/{badge['image']}"),
+                "NAME": name
+            })
+        values = {"NAME": name, "IMAGE_HTML": image_html, "URL": html.escape(badge["url"])}
+        template = linked_template if badge["url"] else static_template
+        rendered.append(template.render(values))
+
+    return get_compiled_template("footer-badges.html").render({
+        "COUNTRY": html.escape(country),
+        "BADGES": "\n".join(rendered)
+    })
+
+
+def render_country_sections(country: str, offers_count: int = DEFAULT_OFFERS_COUNT,
+                            master_dir: Optional[str] = None,
+                            sprites: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, str]:
+    """
+    Render the offers and badge sections for one country.
+
+    Args:
+        country (str): Country folder name
+        offers_count (int): Number of top offers to render
+        master_dir (str): Optional master directory override
+        sprites (dict): Optional sprite manifests keyed by "offers" and "footer"
+
+    Returns:
+        dict: {"offers": html, "badges": html}
+    """
+    offers = select_top_offers(load_country_offers(country, master_dir), offers_count)
+    badges = load_country_badges(country, master_dir)
+    sprites = sprites or {}
+    return {
+        "offers": render_offers_section(offers, country, sprites=sprites.get("offers")),
+        "badges": render_badges_section(badges, country, sprites=sprites.get("footer"))
+    }
+
+
+def render_batch(countries: List[str], offers_count: int = DEFAULT_OFFERS_COUNT,
+                 master_dir: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Render sections for many countries, sharing the compiled templates.
+
+    Args:
+        countries (list): Country folder names
+        offers_count (int): Number of top offers per country
+        master_dir (str): Optional master directory override
+
+    Returns:
+        dict: Country mapped to its rendered sections
+    """
+    return {
+        country: render_country_sections(country, offers_count, master_dir)
+        for country in countries
+    }
+
+
+def ask_offers_count(available: int) -> int:
+    """
+    Ask the user how many offers to show.
+
+    Args:
+        available (int): Number of offers with a usable URL
+
+    Returns:
+        int: Chosen number of offers (1..available), or 0 if none are available
+    """
+    if available == 0:
+        return 0
+
+    default = min(DEFAULT_OFFERS_COUNT, available)
+    while True:
+        answer = input(f"\nNumber of offers to show (1-{available}, default={default}): ").strip()
+        if answer == "":
+            return default
+        try:
+            count = int(answer)
+            if 1 <= count <= available:
+                return count
+            print(f"Please enter a number between 1 and {available}.")
+        except ValueError:
+            print("Please enter a valid number.")
+
+
+# Private helper functions
+
+def _get_master_dir() -> str:
+    """Get the master content directory."""
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(current_dir, "master")
+
+
+def _find_json_file(directory: str) -> Optional[str]:
+    """Find the data file in a country folder (named per country or info.json)."""
+    if not os.path.isdir(directory):
+        return None
+    json_files = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+    if not json_files:
+        return None
+    return os.path.join(directory, json_files[0])
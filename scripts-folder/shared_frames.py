@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Shared Frames Module
+
+Zero-copy passing of decoded images between process pool stages of the
+Casino Website Generator.
+
+- A decoded image is copied once into a multiprocessing.shared_memory
+  block; pool tasks receive a small FrameHandle (block name, size, mode)
+  instead of a pickled pixel buffer
+- Any worker maps the block back as a read-only Pillow image or NumPy
+  array without copying the pixels
+- RGB is stored as RGBX and LA as RGBA, the layouts Pillow can map
+  directly; the handle keeps the original mode for encoders that need it
+- When /dev/shm is too small for a frame (as in some containers), the
+  pixels travel inside the handle instead, which is slower but still works
+
+The process that runs the pipeline owns the frames and releases them
+(see memory_budget.bounded_pipeline); workers only create and attach.
+"""
+
+import os
+import shutil
+from contextlib import contextmanager
+from multiprocessing import shared_memory, resource_tracker
+from typing import List, Tuple, Optional, Iterator, NamedTuple, Any
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is required to share images
+    Image = None
+
+try:
+    import numpy as np
+except ImportError:  # Without numpy frames are only opened as images
+    np = None
+
+
+# Logical mode → (storage mode, bytes per pixel)
+STORAGE_MODES = {'L': ('L', 1), 'LA': ('RGBA', 4), 'RGB': ('RGBX', 4), 'RGBA': ('RGBA', 4)}
+SHM_DIR = "/dev/shm"
+SHM_HEADROOM = 64 * 1024 * 1024
+COPY_STRIP_BYTES = 4 * 1024 * 1024
+
+
+class FrameHandle(NamedTuple):
+    """Picklable reference to a decoded frame."""
+    name: Optional[str]
+    size: Tuple[int, int]
+    mode: str
+    data: Optional[bytes] = None
+
+
+def share_image(image: Any, mode: Optional[str] = None) -> FrameHandle:
+    """
+    Copy an image into a new shared memory block.
+
+    Args:
+        image (PIL.Image.Image): Image in L, LA, RGB or RGBA mode (other
+                                 modes are converted to RGBA); RGBX counts as RGB
+        mode (str): Logical mode of an image already in storage layout, e.g.
+                    'LA' for an RGBA image resized from an LA frame
+
+    Returns:
+        FrameHandle: Handle to pass to other processes
+    """
+    if mode is None:
+        mode = 'RGB' if image.mode == 'RGBX' else image.mode
+    if mode not in STORAGE_MODES:
+        image = image.convert('RGBA')
+        mode = 'RGBA'
+    storage_mode, pixel_bytes = STORAGE_MODES[mode]
+    if image.mode != storage_mode:
+        image = image.convert(storage_mode)
+
+    width, height = image.size
+    nbytes = width * height * pixel_bytes
+    if not _shared_memory_fits(nbytes):
+        return FrameHandle(None, image.size, mode, image.tobytes())
+
+    block = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+    try:
+        # Copy in strips so no second full-size buffer is built on the way
+        strip_rows = max(1, COPY_STRIP_BYTES // max(1, width * pixel_bytes))
+        offset = 0
+        for top in range(0, height, strip_rows):
+            strip = image.crop((0, top, width, min(height, top + strip_rows))).tobytes()
+            block.buf[offset:offset + len(strip)] = strip
+            offset += len(strip)
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    return FrameHandle(block.name, image.size, mode)
+
+
+@contextmanager
+def open_frame(handle: FrameHandle) -> Iterator[Any]:
+    """
+    Map a frame as a read-only Pillow image, without copying its pixels.
+
+    The image is in the storage mode (RGBX for RGB frames); convert it to
+    handle.mode for encoders that do not accept RGBX, such as PNG. Images
+    derived from it (resize, convert) are independent copies and may be
+    kept after the block is closed.
+
+    Args:
+        handle (FrameHandle): Frame to open
+
+    Yields:
+        PIL.Image.Image: The frame
+    """
+    storage_mode = STORAGE_MODES[handle.mode][0]
+    if handle.name is None:
+        image = Image.frombytes(storage_mode, handle.size, handle.data)
+        try:
+            yield image
+        finally:
+            image.close()
+        return
+
+    block = shared_memory.SharedMemory(name=handle.name)
+    image = Image.frombuffer(storage_mode, handle.size, block.buf, 'raw', storage_mode, 0, 1)
+    try:
+        yield image
+    finally:
+        image.close()
+        _close_block(block)
+
+
+@contextmanager
+def frame_array(handle: FrameHandle) -> Iterator[Any]:
+    """
+    Map a frame as a read-only NumPy array (height x width, or height x width x 4).
+
+    Args:
+        handle (FrameHandle): Frame to open
+
+    Yields:
+        numpy.ndarray: View of the frame's pixels
+    """
+    pixel_bytes = STORAGE_MODES[handle.mode][1]
+    width, height = handle.size
+    shape = (height, width) if pixel_bytes == 1 else (height, width, pixel_bytes)
+    if handle.name is None:
+        yield np.frombuffer(handle.data, dtype=np.uint8).reshape(shape)
+        return
+
+    block = shared_memory.SharedMemory(name=handle.name)
+    array = np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+    array.flags.writeable = False
+    try:
+        yield array
+    finally:
+        del array
+        _close_block(block)
+
+
+def release_frame(handle: FrameHandle) -> None:
+    """Free a frame's shared memory block; frames already released are ignored."""
+    if handle.name is None:
+        return
+    try:
+        block = shared_memory.SharedMemory(name=handle.name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def frames_in(value: Any) -> List[FrameHandle]:
+    """
+    Find the frame handles held in a job state (nested dicts, lists and tuples).
+
+    Args:
+        value: Job state
+
+    Returns:
+        list: Every FrameHandle found
+    """
+    if isinstance(value, FrameHandle):
+        return [value]
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return [handle for item in value for handle in frames_in(item)]
+    return []
+
+
+def prepare_frame_sharing() -> None:
+    """
+    Start the shared memory tracker before a process pool is created.
+
+    Forked workers then report the blocks they create to the parent's
+    tracker, so releasing a frame in the parent is final, and blocks a
+    crashed worker left behind are still removed when the build exits.
+    """
+    resource_tracker.ensure_running()
+
+
+# Private helper functions
+
+def _shared_memory_fits(nbytes: int) -> bool:
+    """Check that /dev/shm (where it exists) has room for a frame."""
+    if not os.path.isdir(SHM_DIR):
+        return True
+    try:
+        return shutil.disk_usage(SHM_DIR).free >= nbytes + SHM_HEADROOM
+    except OSError:
+        return True
+
+
+def _close_block(block: shared_memory.SharedMemory) -> None:
+    """Unmap a block, leaving it to the garbage collector if views are still alive."""
+    try:
+        block.close()
+    except BufferError:
+        pass
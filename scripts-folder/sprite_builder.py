@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Sprite Builder Module
+
+Packs a country's regulator badges and offer logos into sprites for the
+Casino Website Generator, replacing one request per image with one per group.
+
+- Raster images are shown at their size in the 1x display box (half the
+  logo store's 2x box, never enlarged) and packed into a single PNG atlas
+  (shelf packing, tallest first) with matching CSS classes. Only sources
+  with twice those pixels are packed at 2x; the rest are packed at 1x and
+  get their own background-size.
+- SVG images are merged into one <symbol> sprite referenced with <use>.
+
+Each build writes sprites.json next to the images so the section renderer
+knows which files can be served from a sprite.
+"""
+
+import os
+import re
+import json
+import math
+import xml.etree.ElementTree as ET
+from typing import List, Dict, Tuple, Optional, Any
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for raster atlases
+    Image = None
+
+from logo_store import LOGO_PROFILES, RASTER_EXTENSIONS
+
+
+SPRITE_MANIFEST_FILE = "sprites.json"
+ATLAS_PADDING = 2
+# SVGs above this size (usually embedded rasters) stay separate files
+MAX_SPRITE_SVG_BYTES = 100 * 1024
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+ET.register_namespace('', SVG_NS)
+ET.register_namespace('xlink', XLINK_NS)
+
+
+def build_sprites(image_dir: str, group: str, css_url_prefix: Optional[str] = None,
+                  include: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Build the raster atlas, SVG symbol sprite and manifest for a directory.
+
+    Args:
+        image_dir (str): Directory holding the images (e.g. web-folder/static/footer)
+        group (str): Sprite group name, "offers" or "footer"
+        css_url_prefix (str): URL of image_dir as seen from the stylesheet
+                              (defaults to "../static/<group>")
+        include (list): Only pack these file names (defaults to all images)
+
+    Returns:
+        dict: Sprite manifest (also written to image_dir/sprites.json)
+    """
+    css_url_prefix = css_url_prefix or f"../static/{group}"
+    box = LOGO_PROFILES.get(group, LOGO_PROFILES["offers"])
+    manifest = {"group": group, "raster": None, "svg": None, "entries": {}}
+
+    raster_files = []
+    svg_files = []
+    for name in sorted(os.listdir(image_dir)):
+        if name.startswith(f"sprite-{group}") or (include is not None and name not in include):
+            continue
+        extension = os.path.splitext(name)[1].lower()
+        if extension == '.svg':
+            if os.path.getsize(os.path.join(image_dir, name)) <= MAX_SPRITE_SVG_BYTES:
+                svg_files.append(name)
+        elif extension in RASTER_EXTENSIONS:
+            raster_files.append(name)
+
+    if raster_files:
+        if Image is None:
+            print("⚠️  Pillow is not installed - skipping raster atlas")
+        else:
+            _build_raster_atlas(image_dir, group, raster_files, box, css_url_prefix, manifest)
+
+    if svg_files:
+        _build_svg_sprite(image_dir, group, svg_files, manifest)
+
+    with open(os.path.join(image_dir, SPRITE_MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    packed = len(manifest["entries"])
+    print(f"🧩 {group.capitalize()} sprites: {packed} image(s) packed into "
+          f"{int(bool(manifest['raster'])) + int(bool(manifest['svg']))} file(s)")
+    return manifest
+
+
+def load_sprite_manifest(image_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the sprite manifest written by build_sprites().
+
+    Args:
+        image_dir (str): Directory holding sprites.json
+
+    Returns:
+        dict or None: Sprite manifest, or None if the directory has no sprites
+    """
+    manifest_file = os.path.join(image_dir, SPRITE_MANIFEST_FILE)
+    if not os.path.exists(manifest_file):
+        return None
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not read sprite manifest {manifest_file}: {e}")
+        return None
+
+
+def pack_shelves(sizes: List[Tuple[int, int]], padding: int = ATLAS_PADDING) -> Tuple[List[Tuple[int, int]], int, int]:
+    """
+    Pack rectangles into shelves, tallest first.
+
+    The atlas width is the larger of the widest rectangle and the square root
+    of the total area, which keeps atlases close to square.
+
+    Args:
+        sizes (list): (width, height) of each rectangle
+        padding (int): Gap kept around every rectangle
+
+    Returns:
+        tuple: (positions in input order, atlas width, atlas height)
+    """
+    if not sizes:
+        return [], 0, 0
+
+    padded = [(w + padding, h + padding) for w, h in sizes]
+    total_area = sum(w * h for w, h in padded)
+    atlas_width = max(max(w for w, _ in padded), int(math.ceil(math.sqrt(total_area))))
+
+    order = sorted(range(len(sizes)), key=lambda i: (padded[i][1], padded[i][0]), reverse=True)
+    positions = [(0, 0)] * len(sizes)
+    shelf_x = shelf_y = shelf_height = 0
+
+    for i in order:
+        w, h = padded[i]
+        if shelf_x + w > atlas_width:
+            shelf_y += shelf_height
+            shelf_x = shelf_height = 0
+        positions[i] = (shelf_x, shelf_y)
+        shelf_x += w
+        shelf_height = max(shelf_height, h)
+
+    return positions, atlas_width, shelf_y + shelf_height
+
+
+def render_sprite_image(entry: Dict[str, Any], alt: str, static_prefix: str) -> str:
+    """
+    Render the HTML that shows one sprite entry.
+
+    Args:
+        entry (dict): Manifest entry for the image
+        alt (str): Escaped accessible name
+        static_prefix (str): URL prefix of the sprite directory
+
+    Returns:
+        str: <span> with sprite classes or inline <svg><use>
+    """
+    if entry["type"] == "raster":
+        return f'<span class="sprite {entry["class"]}" role="img" aria-label="{alt}"></span>'
+    return (f'<svg class="sprite-svg" viewBox="{entry["viewBox"]}" width="{entry["width"]}" '
+            f'height="{entry["height"]}" role="img" aria-label="{alt}">'
+            f'<use href="{static_prefix}/{entry["file"]}#{entry["symbol"]}"></use></svg>')
+
+
+# Private helper functions
+
+def _build_raster_atlas(image_dir: str, group: str, names: List[str], box: Tuple[int, int],
+                        css_url_prefix: str, manifest: Dict[str, Any]) -> None:
+    """Scale raster images to their display size and pack them into one PNG."""
+    images = []
+    for name in names:
+        try:
+            with Image.open(os.path.join(image_dir, name)) as source:
+                image = source.convert('RGBA')
+            display_size = _display_size(image.size, box)
+            density = 2 if (image.size[0] >= 2 * display_size[0] and image.size[1] >= 2 * display_size[1]) else 1
+            packed_size = (display_size[0] * density, display_size[1] * density)
+            if image.size != packed_size:
+                image = image.resize(packed_size, Image.LANCZOS)
+            # Even sizes (and even padding) keep 1x CSS coordinates of 2x images whole pixels
+            images.append((name, _pad_to_even(image), display_size, density))
+        except Exception as e:
+            print(f"⚠️  Skipping {name} in {group} atlas: {e}")
+
+    if not images:
+        return
+
+    positions, atlas_width, atlas_height = pack_shelves([image.size for _, image, _, _ in images])
+    atlas_width += atlas_width % 2
+    atlas_height += atlas_height % 2
+    atlas = Image.new('RGBA', (atlas_width, atlas_height), (0, 0, 0, 0))
+
+    atlas_file = f"sprite-{group}.png"
+    css_file = f"sprite-{group}.css"
+    css_rules = [
+        f".sprite-{group} {{ display: inline-block; background-image: url(\"{css_url_prefix}/{atlas_file}\"); "
+        f"background-repeat: no-repeat; background-size: {atlas_width // 2}px {atlas_height // 2}px; }}"
+    ]
+
+    for (name, image, (width, height), density), (x, y) in zip(images, positions):
+        atlas.paste(image, (x, y))
+        class_name = f"sprite-{group}-{_slugify(name)}"
+        # 1x images are shown from the atlas at its full size
+        background_size = "" if density == 2 else f"background-size: {atlas_width}px {atlas_height}px; "
+        css_rules.append(f".{class_name} {{ width: {width}px; height: {height}px; {background_size}"
+                         f"background-position: {-(x // density)}px {-(y // density)}px; }}")
+        manifest["entries"][name] = {
+            "type": "raster",
+            "class": f"sprite-{group} {class_name}",
+            "width": width,
+            "height": height,
+            "density": density
+        }
+
+    atlas.save(os.path.join(image_dir, atlas_file), 'PNG', optimize=True)
+    with open(os.path.join(image_dir, css_file), 'w', encoding='utf-8') as f:
+        f.write("\n".join(css_rules) + "\n")
+
+    manifest["raster"] = {"file": atlas_file, "css": css_file, "width": atlas_width, "height": atlas_height}
+
+
+def _display_size(size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+    """Fit an image into the 1x half of a 2x display box, without enlarging it."""
+    width, height = size
+    scale = min(1.0, box[0] / 2 / width, box[1] / 2 / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _pad_to_even(image: "Image.Image") -> "Image.Image":
+    """Pad an image with transparency to even width and height."""
+    width, height = image.size
+    if width % 2 == 0 and height % 2 == 0:
+        return image
+    padded = Image.new('RGBA', (width + width % 2, height + height % 2), (0, 0, 0, 0))
+    padded.paste(image, (0, 0))
+    return padded
+
+
+def _build_svg_sprite(image_dir: str, group: str, names: List[str], manifest: Dict[str, Any]) -> None:
+    """Merge SVG files into one sprite of <symbol> elements."""
+    sprite = ET.Element(f"{{{SVG_NS}}}svg")
+    sprite.set("style", "display:none")
+    sprite_file = f"sprite-{group}.svg"
+    display_height = LOGO_PROFILES.get(group, LOGO_PROFILES["offers"])[1] // 2
+
+    for name in names:
+        try:
+            root = ET.parse(os.path.join(image_dir, name)).getroot()
+        except ET.ParseError as e:
+            print(f"⚠️  Skipping {name} in {group} SVG sprite: {e}")
+            continue
+
+        symbol_id = f"{group}-{_slugify(name)}"
+        view_box = _get_view_box(root)
+        if not view_box:
+            print(f"⚠️  Skipping {name} in {group} SVG sprite: no viewBox or size")
+            continue
+
+        symbol = ET.SubElement(sprite, f"{{{SVG_NS}}}symbol")
+        symbol.set("id", symbol_id)
+        symbol.set("viewBox", view_box)
+        for child in list(root):
+            if _is_svg_element(child):
+                symbol.append(child)
+        _scope_symbol(symbol, symbol_id)
+
+        _, _, box_width, box_height = [float(v) for v in view_box.split()]
+        manifest["entries"][name] = {
+            "type": "svg",
+            "file": sprite_file,
+            "symbol": symbol_id,
+            "viewBox": view_box,
+            "width": max(1, round(display_height * box_width / box_height)),
+            "height": display_height
+        }
+
+    if len(sprite):
+        ET.ElementTree(sprite).write(os.path.join(image_dir, sprite_file), encoding='utf-8', xml_declaration=False)
+        manifest["svg"] = {"file": sprite_file}
+
+
+def _get_view_box(root: ET.Element) -> Optional[str]:
+    """Get an SVG's viewBox, deriving it from width/height if missing."""
+    view_box = root.get("viewBox")
+    if view_box:
+        values = view_box.replace(',', ' ').split()
+        if len(values) == 4 and float(values[3]) > 0:
+            return " ".join(values)
+    try:
+        width = float(re.sub(r'[a-z%]+$', '', root.get("width", "")))
+        height = float(re.sub(r'[a-z%]+$', '', root.get("height", "")))
+    except ValueError:
+        return None
+    return f"0 0 {width:g} {height:g}" if height > 0 else None
+
+
+def _is_svg_element(element: ET.Element) -> bool:
+    """Check that an element is in the SVG namespace (drops editor metadata)."""
+    return isinstance(element.tag, str) and element.tag.startswith(f"{{{SVG_NS}}}") \
+        and element.tag != f"{{{SVG_NS}}}metadata"
+
+
+def _scope_symbol(symbol: ET.Element, prefix: str) -> None:
+    """Prefix ids and class names inside a symbol so merged files cannot clash."""
+    ids = {}
+    classes = set()
+    for element in symbol.iter():
+        for attribute in list(element.attrib):
+            if not attribute.startswith(f"{{{SVG_NS}}}") and attribute.startswith("{") \
+                    and not attribute.startswith(f"{{{XLINK_NS}}}"):
+                del element.attrib[attribute]
+        if element is not symbol and element.get("id"):
+            ids[element.get("id")] = f"{prefix}-{element.get('id')}"
+            element.set("id", ids[element.get("id")])
+        if element.get("class"):
+            names = element.get("class").split()
+            classes.update(names)
+            element.set("class", " ".join(f"{prefix}-{n}" for n in names))
+
+    def rewrite(text: str) -> str:
+        text = re.sub(r'url\(\s*#([^)\s]+)\s*\)', lambda m: f"url(#{ids.get(m.group(1), m.group(1))})", text)
+        for class_name in classes:
+            text = re.sub(rf'\.{re.escape(class_name)}(?![\w-])', f".{prefix}-{class_name}", text)
+        return text
+
+    for element in symbol.iter():
+        for attribute, value in list(element.attrib.items()):
+            if attribute in ("href", f"{{{XLINK_NS}}}href") and value.startswith("#"):
+                element.set(attribute, f"#{ids.get(value[1:], value[1:])}")
+            elif "url(" in value:
+                element.set(attribute, rewrite(value))
+        if element.tag == f"{{{SVG_NS}}}style" and element.text:
+            element.text = rewrite(element.text)
+
+
+def _slugify(file_name: str) -> str:
+    """Turn a file name into a CSS-safe identifier."""
+    stem = os.path.splitext(file_name)[0].lower()
+    slug = re.sub(r'[^a-z0-9]+', '-', stem).strip('-')
+    if not slug or slug[0].isdigit():
+        slug = f"i{slug}"
+    return slug
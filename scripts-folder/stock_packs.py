@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Stock Packs Module
+
+Versioned, hash-indexed packs of curated casino stock images for the Casino
+Website Generator.
+
+Pack source (a local directory, a mirror of one, or its http(s) URL):
+    index.json                        {"packs": {"<name>": {"version", "description"}}}
+    <name>/pack.json                  {"name", "version", "entries": {"<path>": {"sha256", "size"}}}
+    <name>/versions/<version>.json    Earlier pack.json files
+    objects/<sha[:2]>/<sha>           Image data, shared by every pack and version
+
+Local store (.build-cache/stock-packs/):
+    objects/<sha[:2]>/<sha>           Objects fetched so far
+    packs/<name>.json                 Installed pack.json
+
+Updating a pack only transfers objects the store does not have yet, so a new
+version costs as much as the entries that changed. Installing hardlinks the
+objects into a site's static/images, so every site shares one copy on disk
+and offline builds need no network access.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any
+from urllib.parse import urljoin
+
+import requests
+
+from file_utils import write_atomic, hash_file
+
+
+STOCK_STORE_DIR = os.path.join(".build-cache", "stock-packs")
+DEFAULT_STOCK_SOURCE = os.path.join("master", "stock-packs")
+DEFAULT_FETCH_WORKERS = 8
+REQUEST_TIMEOUT = 30
+CHUNK_SIZE = 64 * 1024
+
+
+def get_stock_source() -> str:
+    """
+    Get the pack source: STOCK_PACK_SOURCE, or master/stock-packs.
+
+    Returns:
+        str: Directory path or http(s) base URL
+    """
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.environ.get("STOCK_PACK_SOURCE") or os.path.join(current_dir, DEFAULT_STOCK_SOURCE)
+
+
+def list_packs(source: str) -> Dict[str, Dict[str, str]]:
+    """
+    List the packs a source offers.
+
+    Args:
+        source (str): Pack source
+
+    Returns:
+        dict: Pack name mapped to {'version', 'description'}
+    """
+    return json.loads(_read_source(source, "index.json")).get("packs", {})
+
+
+def update_pack(name: str, source: str, store_dir: Optional[str] = None,
+                workers: int = DEFAULT_FETCH_WORKERS) -> Dict[str, Any]:
+    """
+    Bring the local copy of a pack up to the source's version.
+
+    Only objects missing from the store are transferred; each is verified
+    against its hash before it is stored.
+
+    Args:
+        name (str): Pack name
+        source (str): Pack source
+        store_dir (str): Local store (defaults to .build-cache/stock-packs)
+        workers (int): Parallel transfers
+
+    Returns:
+        dict: {'name', 'version', 'previous_version', 'transferred', 'bytes', 'reused'}
+    """
+    store_dir = store_dir or get_store_dir()
+    pack = json.loads(_read_source(source, f"{name}/pack.json"))
+    installed = load_installed_pack(name, store_dir)
+
+    wanted = {entry["sha256"]: entry["size"] for entry in pack["entries"].values()}
+    missing = [sha256 for sha256 in wanted if not os.path.exists(_object_path(store_dir, sha256))]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda sha256: _fetch_object(source, store_dir, sha256, wanted[sha256]), missing))
+
+    write_atomic(os.path.join(store_dir, "packs", f"{name}.json"),
+                 json.dumps(pack, indent=2, sort_keys=True).encode('utf-8'))
+
+    return {
+        'name': name,
+        'version': pack["version"],
+        'previous_version': installed["version"] if installed else None,
+        'transferred': len(missing),
+        'bytes': sum(wanted[sha256] for sha256 in missing),
+        'reused': len(wanted) - len(missing)
+    }
+
+
+def install_pack(name: str, images_dir: str, store_dir: Optional[str] = None) -> Dict[str, int]:
+    """
+    Hardlink an updated pack into a site's static/images.
+
+    Files that already link to the right object are left alone; files from
+    the pack's previous version that are no longer in it are removed.
+
+    Args:
+        name (str): Pack name
+        images_dir (str): Site's static/images directory
+        store_dir (str): Local store
+
+    Returns:
+        dict: {'linked', 'unchanged', 'removed'}
+    """
+    store_dir = store_dir or get_store_dir()
+    pack = load_installed_pack(name, store_dir)
+    if pack is None:
+        raise FileNotFoundError(f"Stock pack '{name}' has not been downloaded")
+
+    stats = {'linked': 0, 'unchanged': 0, 'removed': 0}
+    record_path = os.path.join(images_dir, f".stock-{name}.json")
+    previous = _load_json(record_path).get("entries", {})
+
+    for relative_path, entry in pack["entries"].items():
+        if relative_path.startswith('/') or '..' in relative_path.split('/'):
+            raise ValueError(f"Stock pack '{name}' has an unsafe entry path: {relative_path}")
+        dest = os.path.join(images_dir, *relative_path.split('/'))
+        object_path = _object_path(store_dir, entry["sha256"])
+        if os.path.exists(dest) and (os.path.samefile(dest, object_path)
+                                     or (previous.get(relative_path, {}).get("sha256") == entry["sha256"]
+                                         and os.path.getsize(dest) == entry["size"])):
+            stats['unchanged'] += 1
+            continue
+        _link_file(object_path, dest)
+        stats['linked'] += 1
+
+    for relative_path in set(previous) - set(pack["entries"]):
+        stale = os.path.join(images_dir, *relative_path.split('/'))
+        if os.path.exists(stale):
+            os.remove(stale)
+            stats['removed'] += 1
+
+    write_atomic(record_path, json.dumps({"version": pack["version"], "entries": pack["entries"]},
+                                         indent=2, sort_keys=True).encode('utf-8'))
+    return stats
+
+
+def build_pack(name: str, version: str, images_dir: str, source: str, description: str = "") -> Dict[str, Any]:
+    """
+    Publish a directory of images as a new pack version in a local source.
+
+    Only objects the source does not have yet are copied in.
+
+    Args:
+        name (str): Pack name
+        version (str): New version label
+        images_dir (str): Directory whose images become the pack
+        source (str): Local pack source directory (created if needed)
+        description (str): Pack description for index.json
+
+    Returns:
+        dict: The new pack.json contents
+    """
+    entries = {}
+    for root, dirs, files in os.walk(images_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for file in sorted(files):
+            if file.startswith('.'):
+                continue
+            path = os.path.join(root, file)
+            sha256 = hash_file(path)
+            entries[os.path.relpath(path, images_dir).replace(os.sep, '/')] = {
+                "sha256": sha256,
+                "size": os.path.getsize(path)
+            }
+            object_path = _object_path(source, sha256)
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                shutil.copyfile(path, object_path)
+
+    pack_file = os.path.join(source, name, "pack.json")
+    current = _load_json(pack_file)
+    if current:
+        write_atomic(os.path.join(source, name, "versions", f"{current['version']}.json"),
+                     json.dumps(current, indent=2, sort_keys=True).encode('utf-8'))
+
+    pack = {"name": name, "version": version, "entries": entries}
+    write_atomic(pack_file, json.dumps(pack, indent=2, sort_keys=True).encode('utf-8'))
+
+    index_file = os.path.join(source, "index.json")
+    index = _load_json(index_file) or {"packs": {}}
+    previous_description = index["packs"].get(name, {}).get("description", "")
+    index["packs"][name] = {"version": version, "description": description or previous_description}
+    write_atomic(index_file, json.dumps(index, indent=2, sort_keys=True).encode('utf-8'))
+    return pack
+
+
+def load_installed_pack(name: str, store_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Get the locally stored pack.json, or None if the pack was never downloaded."""
+    return _load_json(os.path.join(store_dir or get_store_dir(), "packs", f"{name}.json")) or None
+
+
+def get_store_dir() -> str:
+    """Get the local stock pack store, creating it if needed."""
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    store_dir = os.path.join(current_dir, STOCK_STORE_DIR)
+    os.makedirs(store_dir, exist_ok=True)
+    return store_dir
+
+
+# Private helper functions
+
+def _is_url(source: str) -> bool:
+    """Check whether a source is an http(s) mirror."""
+    return source.startswith(("http://", "https://"))
+
+
+def _read_source(source: str, relative_path: str) -> bytes:
+    """Read a small file (index or pack manifest) from a source."""
+    if _is_url(source):
+        response = requests.get(urljoin(source.rstrip('/') + '/', relative_path), timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.content
+    with open(os.path.join(source, *relative_path.split('/')), 'rb') as f:
+        return f.read()
+
+
+def _fetch_object(source: str, store_dir: str, sha256: str, size: int) -> None:
+    """Transfer one object into the store, verifying size and hash."""
+    object_path = _object_path(store_dir, sha256)
+    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(object_path), prefix=".tmp-")
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            relative_path = f"objects/{sha256[:2]}/{sha256}"
+            if _is_url(source):
+                url = urljoin(source.rstrip('/') + '/', relative_path)
+                with requests.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        digest.update(chunk)
+                        f.write(chunk)
+            else:
+                with open(os.path.join(source, *relative_path.split('/')), 'rb') as src:
+                    for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                        f.write(chunk)
+        if digest.hexdigest() != sha256 or os.path.getsize(temp_path) != size:
+            raise ValueError(f"Stock object {sha256[:12]} failed its integrity check")
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, object_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _link_file(object_path: str, dest: str) -> None:
+    """Hardlink an object into place atomically, copying across filesystems."""
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    temp_path = f"{dest}.tmp-link"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    try:
+        os.link(object_path, temp_path)
+    except OSError:
+        shutil.copyfile(object_path, temp_path)
+    os.replace(temp_path, dest)
+
+
+def _object_path(root: str, sha256: str) -> str:
+    """Get the path of an object in a source or store."""
+    return os.path.join(root, "objects", sha256[:2], sha256)
+
+
+def _load_json(path: str) -> Dict[str, Any]:
+    """Load a JSON file, or an empty dict if it is missing or invalid."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+SVG Optimizer Module
+
+Streaming SVG optimisation for logos, badges and site images in the Casino
+Website Generator.
+
+SVGs are parsed in chunks with an incremental XML parser and cleaned up as
+each element closes:
+- Comments, processing instructions, <metadata> and editor namespaces
+  (Inkscape, Sodipodi, Sketch, Illustrator, Serif, RDF/Dublin Core) are
+  dropped
+- Path data, points, transforms and numeric attributes are rounded
+- Attribute-less groups are unwrapped and empty groups removed
+- Embedded base64 rasters are recompressed. Repeats of the same raster
+  become <use> references to the first copy. With an asset directory,
+  oversized rasters are written out as external image files instead.
+
+Extraction is opt-in because SVGs shown through <img> (every offer logo)
+never load external resources; embedded rasters keep working there.
+"""
+
+import io
+import os
+import re
+import math
+import base64
+import hashlib
+import xml.etree.ElementTree as ET
+from typing import List, Dict, Tuple, Optional, Any, Iterable
+from xml.sax.saxutils import escape
+
+try:
+    from PIL import Image
+except ImportError:  # Without Pillow rasters are kept as they are
+    Image = None
+
+from file_utils import write_atomic
+
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+EDITOR_NAMESPACES = {
+    "http://www.inkscape.org/namespaces/inkscape",
+    "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+    "http://www.bohemiancoding.com/sketch/ns",
+    "http://ns.adobe.com/AdobeIllustrator/10.0/",
+    "http://ns.adobe.com/AdobeSVGViewerExtensions/3.0/",
+    "http://ns.adobe.com/Extensibility/1.0/",
+    "http://ns.adobe.com/Graphs/1.0/",
+    "http://ns.adobe.com/SaveForWeb/1.0/",
+    "http://ns.adobe.com/Variables/1.0/",
+    "http://www.serif.com/",
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "http://purl.org/dc/elements/1.1/",
+    "http://creativecommons.org/ns#"
+}
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_PRECISION = 3
+EXTRACT_THRESHOLD = 8 * 1024  # decoded bytes
+
+PATH_ATTRIBUTES = {'d', 'points'}
+TRANSFORM_ATTRIBUTES = {'transform', 'gradientTransform', 'patternTransform'}
+NUMERIC_ATTRIBUTES = {'x', 'y', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'r', 'rx', 'ry', 'fx', 'fy',
+                      'width', 'height', 'stroke-width', 'viewBox', 'offset', 'opacity',
+                      'fill-opacity', 'stroke-opacity', 'stop-opacity', 'font-size'}
+TEXT_ELEMENTS = {'text', 'tspan', 'textPath', 'style', 'script', 'title', 'desc'}
+RASTER_TYPES = {'image/png': '.png', 'image/jpeg': '.jpg', 'image/jpg': '.jpg',
+                'image/gif': '.gif', 'image/webp': '.webp'}
+
+PATH_COMMANDS = 'MmZzLlHhVvCcSsQqTtAa'
+ARC_PARAMETERS = 7  # rx ry rotation large-arc-flag sweep-flag x y
+ARC_FLAG_POSITIONS = (3, 4)
+NUMBER_PATTERN = re.compile(r'[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?')
+DATA_URI_PATTERN = re.compile(r'^\s*data:(image/[\w.+-]+);base64,(.*)$', re.DOTALL)
+
+
+def optimize_svg(source_path: str, dest_path: Optional[str] = None, asset_dir: Optional[str] = None,
+                 precision: int = DEFAULT_PRECISION) -> Dict[str, Any]:
+    """
+    Optimise an SVG file, streaming it through the parser in chunks.
+
+    The result is written atomically, and only when it is smaller than the
+    source.
+
+    Args:
+        source_path (str): SVG to optimise
+        dest_path (str): Output file (defaults to replacing the source)
+        asset_dir (str): Where to extract oversized rasters; None keeps them embedded
+        precision (int): Decimal places kept in path data (more for viewBoxes under 100 units)
+
+    Returns:
+        dict: {'original_size', 'optimized_size', 'elements_removed', 'groups_collapsed',
+               'rasters_recompressed', 'rasters_deduplicated', 'rasters_extracted'}
+    """
+    dest_path = dest_path or source_path
+
+    def chunks() -> Iterable[bytes]:
+        with open(source_path, 'rb') as f:
+            yield from iter(lambda: f.read(CHUNK_SIZE), b'')
+
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    optimizer = _SvgOptimizer(precision, asset_dir, os.path.dirname(os.path.abspath(dest_path)), stem)
+    data = optimizer.run(chunks())
+
+    stats = dict(optimizer.stats, original_size=os.path.getsize(source_path))
+    if len(data) < stats['original_size']:
+        write_atomic(dest_path, data)
+        stats['optimized_size'] = len(data)
+    else:
+        if dest_path != source_path:
+            with open(source_path, 'rb') as f:
+                write_atomic(dest_path, f.read())
+        stats['optimized_size'] = stats['original_size']
+    return stats
+
+
+def optimize_svg_data(data: bytes, precision: int = DEFAULT_PRECISION) -> bytes:
+    """
+    Optimise SVG bytes in memory, keeping rasters embedded.
+
+    Args:
+        data (bytes): SVG document
+        precision (int): Decimal places kept in path data
+
+    Returns:
+        bytes: Optimised SVG document
+    """
+    optimizer = _SvgOptimizer(precision, None, None, "")
+    return optimizer.run(data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+
+
+def optimize_svg_tree(directory: str, extract_rasters: bool = False,
+                      precision: int = DEFAULT_PRECISION) -> Dict[str, Dict[str, Any]]:
+    """
+    Optimise every SVG under a directory in place.
+
+    Args:
+        directory (str): Directory to walk
+        extract_rasters (bool): Write oversized rasters next to each SVG
+        precision (int): Decimal places kept in path data
+
+    Returns:
+        dict: Path relative to directory mapped to optimize_svg() stats, or {'error': message}
+    """
+    results = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for file in sorted(files):
+            if not file.lower().endswith('.svg'):
+                continue
+            path = os.path.join(root, file)
+            relative_path = os.path.relpath(path, directory).replace(os.sep, '/')
+            try:
+                results[relative_path] = optimize_svg(path, asset_dir=root if extract_rasters else None,
+                                                      precision=precision)
+            except (ET.ParseError, OSError, ValueError) as e:
+                results[relative_path] = {'error': str(e)}
+    return results
+
+
+# Private helper functions
+
+class _SvgOptimizer:
+    """Cleans an SVG up element by element as the pull parser closes them."""
+
+    def __init__(self, precision: int, asset_dir: Optional[str], output_dir: Optional[str], stem: str):
+        self.precision = precision
+        self.asset_dir = asset_dir
+        self.output_dir = output_dir
+        self.stem = stem
+        self.prefixes: Dict[str, str] = {}
+        self.rasters: Dict[str, Tuple[ET.Element, Tuple]] = {}
+        self.stack: List[ET.Element] = []
+        self.root: Optional[ET.Element] = None
+        self.stats = {'elements_removed': 0, 'groups_collapsed': 0, 'rasters_recompressed': 0,
+                      'rasters_deduplicated': 0, 'rasters_extracted': 0}
+
+    def run(self, chunks: Iterable[bytes]) -> bytes:
+        """Parse and clean the document, returning the serialised result."""
+        parser = ET.XMLPullParser(events=('start', 'end', 'start-ns'))
+        for chunk in chunks:
+            parser.feed(chunk)
+            self._handle_events(parser)
+        parser.close()
+        self._handle_events(parser)
+        root = self.root
+        if root is None or _local_name(root.tag) != 'svg':
+            raise ValueError("Not an SVG document")
+
+        for name in ('version', 'baseProfile'):
+            root.attrib.pop(name, None)
+        return _serialize(root, self.prefixes).encode('utf-8')
+
+    def _handle_events(self, parser: ET.XMLPullParser) -> None:
+        """Process pending parser events; the root is kept once it closes."""
+        for event, item in parser.read_events():
+            if event == 'start-ns':
+                prefix, uri = item
+                self.prefixes.setdefault(uri, prefix)
+            elif event == 'start':
+                if not self.stack:
+                    self._set_precision(item)
+                self.stack.append(item)
+            else:
+                self.stack.pop()
+                if self.stack:
+                    self._clean(item, self.stack[-1])
+                else:
+                    self._clean_attributes(item)
+                    self.root = item
+
+    def _set_precision(self, root: ET.Element) -> None:
+        """Keep extra decimals for drawings with a small viewBox."""
+        numbers = [float(n) for n in NUMBER_PATTERN.findall(root.get('viewBox', ''))]
+        extent = max(numbers[2:4], default=0)
+        if extent > 0:
+            self.precision += max(0, 2 - math.floor(math.log10(extent)))
+
+    def _clean(self, element: ET.Element, parent: ET.Element) -> None:
+        """Clean a closed element and its place in the parent."""
+        namespace, name = _split_tag(element.tag)
+        if namespace in EDITOR_NAMESPACES or (namespace == SVG_NS and name == 'metadata') or not isinstance(element.tag, str):
+            self._remove(element, parent)
+            return
+
+        self._clean_attributes(element)
+        if name not in TEXT_ELEMENTS:
+            if element.text and not element.text.strip():
+                element.text = None
+            if element.tail and not element.tail.strip() and _local_name(parent.tag) not in TEXT_ELEMENTS:
+                element.tail = None
+
+        if namespace == SVG_NS and name == 'image':
+            self._handle_raster(element)
+        elif namespace == SVG_NS and name in ('g', 'defs'):
+            if len(element) == 0 and not element.text and 'id' not in element.attrib:
+                self._remove(element, parent)
+            elif name == 'g' and not element.attrib and not element.text and _local_name(parent.tag) != 'switch':
+                position = list(parent).index(element)
+                parent[position:position + 1] = list(element)
+                self.stats['groups_collapsed'] += 1
+
+    def _remove(self, element: ET.Element, parent: ET.Element) -> None:
+        """Drop an element, keeping its tail text."""
+        if element.tail and element.tail.strip():
+            position = list(parent).index(element)
+            if position:
+                previous = parent[position - 1]
+                previous.tail = (previous.tail or '') + element.tail
+            else:
+                parent.text = (parent.text or '') + element.tail
+        parent.remove(element)
+        self.stats['elements_removed'] += 1
+
+    def _clean_attributes(self, element: ET.Element) -> None:
+        """Drop editor attributes and round numeric values."""
+        for key in list(element.attrib):
+            namespace, name = _split_tag(key)
+            if namespace in EDITOR_NAMESPACES:
+                del element.attrib[key]
+            elif namespace is None and name == 'd':
+                element.attrib[key] = _round_path_data(element.attrib[key], self.precision)
+            elif namespace is None and name in PATH_ATTRIBUTES:
+                element.attrib[key] = _round_numbers(element.attrib[key], self.precision, compact=True)
+            elif namespace is None and name in TRANSFORM_ATTRIBUTES:
+                element.attrib[key] = _round_numbers(element.attrib[key], self.precision + 2)
+            elif namespace is None and name in NUMERIC_ATTRIBUTES and re.fullmatch(r'[\d\s.,eE+-]*(px)?', element.attrib[key]):
+                element.attrib[key] = _round_numbers(element.attrib[key], self.precision + 1)
+
+    def _handle_raster(self, element: ET.Element) -> None:
+        """Recompress, deduplicate or extract an embedded raster."""
+        href_key = f"{{{XLINK_NS}}}href" if f"{{{XLINK_NS}}}href" in element.attrib else 'href'
+        match = DATA_URI_PATTERN.match(element.attrib.get(href_key, ''))
+        if not match or match.group(1) not in RASTER_TYPES:
+            return
+        try:
+            original = base64.b64decode(re.sub(r'\s+', '', match.group(2)), validate=True)
+        except ValueError:
+            return
+
+        digest = hashlib.sha256(original).hexdigest()
+        geometry = tuple(sorted((k, v) for k, v in element.attrib.items() if k not in ('id', href_key)))
+        known = self.rasters.get(digest)
+
+        if known and self.asset_dir is None and known[1] == geometry:
+            # Same raster drawn the same way: reference the first copy
+            first_id = known[0].attrib.setdefault('id', f"img-{digest[:10]}")
+            element_id = element.attrib.get('id')
+            element.tag = f"{{{SVG_NS}}}use"
+            element.attrib.clear()
+            element.attrib[href_key] = f"#{first_id}"
+            if element_id:
+                element.attrib['id'] = element_id
+            self.stats['rasters_deduplicated'] += 1
+            return
+
+        mime_type = match.group(1)
+        data = _recompress_raster(original, mime_type)
+        if len(data) < len(original):
+            self.stats['rasters_recompressed'] += 1
+
+        if self.asset_dir is not None and len(data) >= EXTRACT_THRESHOLD:
+            asset_path = os.path.join(self.asset_dir, f"{self.stem}-{digest[:12]}{RASTER_TYPES[mime_type]}")
+            if not os.path.exists(asset_path):
+                os.makedirs(self.asset_dir, exist_ok=True)
+                write_atomic(asset_path, data)
+            element.attrib[href_key] = os.path.relpath(asset_path, self.output_dir).replace(os.sep, '/')
+            self.stats['rasters_extracted'] += 1
+            return
+
+        element.attrib[href_key] = f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}"
+        if known is None:
+            self.rasters[digest] = (element, geometry)
+
+
+def _recompress_raster(data: bytes, mime_type: str) -> bytes:
+    """Re-encode PNG losslessly (and JPEG at quality 85), keeping whichever is smaller."""
+    if Image is None or mime_type not in ('image/png', 'image/jpeg', 'image/jpg'):
+        return data
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            output = io.BytesIO()
+            if image.format == 'PNG':
+                image.save(output, 'PNG', optimize=True)
+            elif image.format == 'JPEG':
+                image.save(output, 'JPEG', quality=85, optimize=True, progressive=True)
+            else:
+                return data
+    except (OSError, ValueError):
+        return data
+    return output.getvalue() if output.tell() < len(data) else data
+
+
+def _round_numbers(value: str, decimals: int, compact: bool = False) -> str:
+    """Round every number in an attribute value; compact drops leading zeros."""
+    return NUMBER_PATTERN.sub(lambda match: _format_number(match.group(0), decimals, compact), value)
+
+
+def _round_path_data(value: str, decimals: int) -> str:
+    """
+    Round the numbers of path data command by command.
+
+    Arc flags are single characters ("a5 5 0 01.5.5" has flags 0 and 1 and
+    ends at .5,.5), so they are read one character at a time and never
+    rounded or merged with a neighbouring number. Data that does not parse
+    is returned unchanged.
+    """
+    tokens = []
+    command = None
+    argument = 0
+    position = 0
+    while position < len(value):
+        char = value[position]
+        if char in ' \t\r\n,':
+            position += 1
+        elif char.isalpha():
+            if char not in PATH_COMMANDS:
+                return value
+            command, argument = char, 0
+            tokens.append(char)
+            position += 1
+        elif command in ('A', 'a') and argument % ARC_PARAMETERS in ARC_FLAG_POSITIONS:
+            if char not in '01':
+                return value
+            tokens.append(char)
+            argument += 1
+            position += 1
+        else:
+            match = NUMBER_PATTERN.match(value, position)
+            if not match or command is None:
+                return value
+            tokens.append(_format_number(match.group(0), decimals, compact=True))
+            argument += 1
+            position = match.end()
+
+    output = []
+    for previous, token in zip([None] + tokens, tokens):
+        # A separator is only needed where the next number would otherwise run into the previous one
+        if (previous is not None and not previous.isalpha() and not token.isalpha()
+                and not token.startswith('-')
+                and not (token.startswith('.') and '.' in previous and 'e' not in previous.lower())):
+            output.append(' ')
+        output.append(token)
+    return ''.join(output)
+
+
+def _format_number(text: str, decimals: int, compact: bool = False) -> str:
+    """Round one number; integers are kept as written."""
+    if '.' not in text and 'e' not in text.lower():
+        return text
+    number = f"{round(float(text), decimals):.{decimals}f}".rstrip('0').rstrip('.')
+    if number in ('-0', ''):
+        number = '0'
+    if compact:
+        number = re.sub(r'^(-?)0\.', r'\1.', number)
+    return number
+
+
+def _serialize(root: ET.Element, prefixes: Dict[str, str]) -> str:
+    """Serialise a cleaned tree, declaring only the namespaces still in use."""
+    used = set()
+    for element in root.iter():
+        for name in [element.tag] + list(element.attrib):
+            namespace, _ = _split_tag(name)
+            if namespace:
+                used.add(namespace)
+
+    prefix_map = {SVG_NS: '', XML_NS: 'xml'}
+    for namespace in sorted(used - {SVG_NS, XML_NS}):
+        prefix = prefixes.get(namespace) or ('xlink' if namespace == XLINK_NS else f"ns{len(prefix_map)}")
+        prefix_map[namespace] = prefix
+
+    declarations = {f"xmlns:{prefix}" if prefix else "xmlns": namespace
+                    for namespace, prefix in prefix_map.items()
+                    if namespace in used | {SVG_NS} and namespace != XML_NS}
+
+    parts: List[str] = []
+    _write_element(root, prefix_map, parts, declarations)
+    return ''.join(parts)
+
+
+def _write_element(element: ET.Element, prefix_map: Dict[str, str], parts: List[str],
+                   declarations: Optional[Dict[str, str]] = None) -> None:
+    """Append one element and its subtree to parts."""
+    tag = _qualified_name(element.tag, prefix_map)
+    attributes = dict(declarations or {})
+    attributes.update((_qualified_name(key, prefix_map, attribute=True), value)
+                      for key, value in element.attrib.items())
+    parts.append(f"<{tag}")
+    for key, value in attributes.items():
+        parts.append(f' {key}="{escape(value, {chr(34): "&quot;", chr(10): "&#10;"})}"')
+
+    if len(element) == 0 and not element.text:
+        parts.append("/>")
+    else:
+        parts.append(">")
+        if element.text:
+            parts.append(escape(element.text))
+        for child in element:
+            _write_element(child, prefix_map, parts)
+        parts.append(f"</{tag}>")
+    if element.tail:
+        parts.append(escape(element.tail))
+
+
+def _qualified_name(name: str, prefix_map: Dict[str, str], attribute: bool = False) -> str:
+    """Turn an ElementTree {namespace}name into prefix:name."""
+    namespace, local = _split_tag(name)
+    if namespace is None or (attribute and namespace == SVG_NS):
+        return local
+    prefix = prefix_map.get(namespace, '')
+    return f"{prefix}:{local}" if prefix else local
+
+
+def _split_tag(name: str) -> Tuple[Optional[str], str]:
+    """Split an ElementTree name into (namespace, local name)."""
+    if isinstance(name, str) and name.startswith('{'):
+        namespace, _, local = name[1:].partition('}')
+        return namespace, local
+    return None, name
+
+
+def _local_name(name: str) -> str:
+    """Get the local part of an ElementTree name."""
+    return _split_tag(name)[1] if isinstance(name, str) else ''